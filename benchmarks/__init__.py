@@ -0,0 +1 @@
+"""Sentinel performance benchmarks"""
@@ -0,0 +1,151 @@
+"""Hot path benchmark for the Sentinel parser, verifier and report writer
+
+each stage runs on seeded synthetic scenarios of growing size and is timed
+(best of N runs) and memory profiled (tracemalloc peak, in a separate run so
+tracing does not skew the timings). results can be written as JSON to track
+them across releases.
+
+usage: python -m benchmarks.hotpaths [--sizes N [N ...]] [--repeat N]
+                                     [--seed S] [--json FILE]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src import __version__
+from src.core import (
+    CoordinateParser,
+    FailureLog,
+    ResultsBucket,
+    TracerSentinel,
+    WorkArea,
+)
+from src.generator import generate_scenario
+from src.helpers import ResultsWriter
+
+DEFAULT_SIZES = (10, 1_000, 100_000, 1_000_000)
+STAGES = ("parse_points", "run_verification", "write_results")
+
+
+def _measure(stage: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """best wall time over repeat runs and the peak traced allocation of one run"""
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": min(timings),
+        "peak_mib": round(peak / 2**20, 3),
+    }
+
+
+def bench_scenario(scenario_path: Path, repeat: int = 3) -> List[Dict[str, Any]]:
+    """times the three hot paths on one scenario folder"""
+
+    parser = CoordinateParser(
+        input_file=scenario_path / "system_input_file.txt",
+        output_file=scenario_path / "system_output_file.txt",
+    )
+    rectangle_coords, expected_points, _ = parser.get_parsed_arrays()
+    content = parser.output_file.read_text(encoding="utf-8")
+
+    def parse_points():
+        parser.actual_points_failures = FailureLog()
+        return parser._parse_points(  # pylint: disable=protected-access
+            content, is_expected=False
+        )
+
+    actual_points = np.asarray(parse_points())
+    work_area = WorkArea(rectangle_coords, expected_points)
+
+    def run_verification():
+        return TracerSentinel(work_area, actual_points).run_verification()
+
+    results = ResultsBucket(
+        expected_points=expected_points,
+        actual_points=actual_points,
+        rectangle_failures=[],
+        expected_points_failures=[],
+        actual_points_failures=[],
+        verifier_failures=run_verification(),
+    )
+    writer = ResultsWriter(scenario_path, rectangle_coords)
+
+    def write_results():
+        writer.write_results(results)
+
+    stages = dict(zip(STAGES, (parse_points, run_verification, write_results)))
+    return [
+        {"stage": name, "points": len(expected_points), **_measure(stage, repeat)}
+        for name, stage in stages.items()
+    ]
+
+
+def run_benchmarks(
+    sizes=DEFAULT_SIZES, repeat: int = 3, seed: int = 0
+) -> Dict[str, Any]:
+    """benchmarks every stage at every size, returns a JSON-ready report"""
+
+    measurements: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="sentinel-bench-") as tmp_dir:
+        for size in sizes:
+            scenario_path = generate_scenario(Path(tmp_dir) / str(size), size, seed)
+            measurements.extend(bench_scenario(scenario_path, repeat))
+
+    return {
+        "sentinel_version": __version__,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": measurements,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """command line entry point"""
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--json", type=Path, help="also write results here")
+    args = arg_parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.repeat, args.seed)
+    for result in report["results"]:
+        print(
+            f"{result['stage']:<18} {result['points']:>10} points "
+            f"{result['seconds'] * 1000:>10.2f} ms {result['peak_mib']:>10.2f} MiB"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Startup-time benchmark for the Sentinel entry points
+
+each module is imported in a fresh interpreter, as a post-job check would
+be. reports the median wall time and whether matplotlib got loaded.
+
+usage: python -m benchmarks.startup [--repeat N] [--json FILE]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# entry points that must start without the plotting stack
+VERIFICATION_MODULES = ("src.core", "src.helpers", "src.cache", "src.runner")
+
+# prints whether matplotlib was loaded by the import under test
+_PROBE = "import sys, {module}; print('matplotlib' in sys.modules)"
+
+
+def measure_import(module: str, repeat: int = 5) -> Dict[str, Any]:
+    """median wall time of importing a module in a fresh interpreter"""
+
+    timings: List[float] = []
+    loads_matplotlib = False
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+        loads_matplotlib = completed.stdout.strip() == "True"
+
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(timings) * 1000, 1),
+        "min_ms": round(min(timings) * 1000, 1),
+        "loads_matplotlib": loads_matplotlib,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """runs the benchmark, the exit code is non-zero if matplotlib leaks in"""
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--json", type=Path, help="also write results here")
+    args = arg_parser.parse_args(argv)
+
+    # baseline: the interpreter itself and the plotting stack on its own
+    results = [
+        measure_import(module, args.repeat)
+        for module in ("sys", *VERIFICATION_MODULES, "matplotlib.figure")
+    ]
+    for result in results:
+        print(
+            f"{result['module']:<20} {result['median_ms']:>8.1f} ms"
+            f"{'  (loads matplotlib)' if result['loads_matplotlib'] else ''}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    leaks = [
+        r["module"]
+        for r in results
+        if r["module"] in VERIFICATION_MODULES and r["loads_matplotlib"]
+    ]
+    return 1 if leaks else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ set -euo pipefail
 
 echo "--- Running Code Quality Checks ---"
 
-src_dirs=("src" "tests")
+src_dirs=("src" "tests" "benchmarks")
 
 echo "1. Formatting checks..."
 black --check --diff "${src_dirs[@]}"
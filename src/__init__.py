@@ -1 +1,3 @@
 """Tracer Sentinel source package."""
+
+__version__ = "1.0.0"
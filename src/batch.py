@@ -0,0 +1,295 @@
+"""Batch verification of many TraceR replays against one shared input file
+
+in production one system_input_file.txt is replayed many times and each
+replay writes its own output file. the input is parsed and its work area,
+expected point array and match index are prepared once, each output file
+then only pays for parsing and verifying its own points. the outcome of
+all replays is written to one combined batch_results.txt.
+
+usage: python -m src.batch INPUT_FILE OUTPUT_FILE [OUTPUT_FILE ...]
+                           [--workers N] [--atol ATOL] [--rtol RTOL]
+                           [--match-mode MODE] [--report FILE]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from math import isnan
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.cli import add_match_arguments
+from src.core import CoordinateParser, TracerSentinel, WorkArea
+from src.metrics import PathMetrics
+
+REPORT_FILE_NAME = "batch_results.txt"
+
+# per-process state of pool workers
+_WORKER_STATE: Dict[str, "ReferenceInput"] = {}
+
+
+@dataclass
+class TraceResult:
+    """outcome of verifying one output file, small enough to send back from a worker"""
+
+    output_file: Path
+    overall_status: str
+    failures: List[str] = field(default_factory=list)
+    actual_count: int = 0
+    elapsed_seconds: float = 0.0
+    metrics: Optional[PathMetrics] = None
+
+
+class ReferenceInput:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """an input file parsed and prepared once, to verify many output files against
+
+    the work area, the expected point array, the expected points outside the
+    work area and, for visited matching, the grid index of the expected
+    points are all built here and shared by every verified trace.
+    """
+
+    def __init__(
+        self,
+        input_file: Path,
+        atol: float = 0.0,
+        rtol: float = 0.0,
+        match_mode: str = "sequence",
+    ):
+
+        start = time.perf_counter()
+        self.input_file = input_file
+        self.atol = atol
+        self.rtol = rtol
+        self.match_mode = match_mode
+
+        # only the input file is read here
+        parser = CoordinateParser(input_file, output_file=Path(os.devnull))
+        rectangle_coords, self.expected_points = parser.get_parsed_input_arrays()
+        self.input_failures = (
+            parser.rectangle_failures + parser.expected_points_failures
+        )
+
+        self.work_area: Optional[WorkArea] = None
+        if not self.input_failures:
+            # the work area caches are filled before it is shared with workers
+            self.work_area = WorkArea(rectangle_coords, self.expected_points)
+            _ = self.work_area.expected_outside
+            if match_mode == "visited":
+                self.work_area.expected_grid_index(atol, rtol)
+
+        self.prepare_seconds = time.perf_counter() - start
+
+    def verify(self, output_file: Path) -> TraceResult:
+        """parses one output file and verifies it against the prepared input"""
+
+        start = time.perf_counter()
+        parser = CoordinateParser(self.input_file, output_file)
+        actual_points = parser.get_parsed_output_array()
+        actual_points_failures = list(parser.actual_points_failures)
+
+        verifier_failures: List[str] = []
+        metrics = None
+        if self.work_area is not None and not actual_points_failures:
+            verifier = TracerSentinel(
+                self.work_area,
+                actual_points,
+                atol=self.atol,
+                rtol=self.rtol,
+                match_mode=self.match_mode,
+            )
+            verifier_failures = verifier.run_verification()
+            metrics = verifier.metrics
+
+        failures = self.input_failures + actual_points_failures + verifier_failures
+        return TraceResult(
+            output_file=output_file,
+            overall_status="FAIL" if failures else "PASS",
+            failures=failures,
+            actual_count=len(actual_points),
+            elapsed_seconds=time.perf_counter() - start,
+            metrics=metrics,
+        )
+
+
+@dataclass
+class BatchSummary:
+    """aggregated results of verifying a batch of output files"""
+
+    input_file: Path
+    expected_count: int
+    results: List[TraceResult]
+    prepare_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def failed(self) -> List[TraceResult]:
+        """traces that did not pass"""
+
+        return [r for r in self.results if r.overall_status != "PASS"]
+
+    def count(self, status: str) -> int:
+        """number of traces that ended with the given overall status"""
+
+        return sum(1 for r in self.results if r.overall_status == status)
+
+
+def _init_worker(reference: ReferenceInput):
+    """keeps the prepared input in each pool worker, sent once per worker"""
+
+    _WORKER_STATE["reference"] = reference
+
+
+def _verify_trace_safely(
+    output_file: Path, reference: Optional[ReferenceInput] = None
+) -> TraceResult:
+    """verifies one output file, turning unexpected exceptions into an ERROR result"""
+
+    start = time.perf_counter()
+    reference = reference or _WORKER_STATE["reference"]
+    try:
+        return reference.verify(output_file)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return TraceResult(
+            output_file=output_file,
+            overall_status="ERROR",
+            failures=[f"{type(e).__name__}: {e}"],
+            elapsed_seconds=time.perf_counter() - start,
+        )
+
+
+def run_batch(
+    reference: ReferenceInput,
+    output_files: Iterable[Path],
+    workers: Optional[int] = None,
+) -> Iterator[TraceResult]:
+    """verifies output files against one prepared input, yields results as they finish
+
+    workers defaults to the number of CPUs, workers=1 runs in-process. the
+    prepared input is handed to each pool worker once, not once per file.
+    """
+
+    output_files = list(output_files)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(output_files) <= 1:
+        for output_file in output_files:
+            yield _verify_trace_safely(output_file, reference)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(reference,)
+    ) as executor:
+        futures = [
+            executor.submit(_verify_trace_safely, output_file)
+            for output_file in output_files
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def write_batch_report(summary: BatchSummary, report_file: Path) -> Path:
+    """write the combined batch report, in the style of test_results.txt"""
+
+    results = sorted(summary.results, key=lambda r: str(r.output_file))
+    failed = summary.failed
+    trace_seconds = sum(r.elapsed_seconds for r in results)
+
+    with open(report_file, "w", encoding="utf-8") as f:
+        f.write("=" * 70 + "\n")
+        f.write(
+            f"BATCH STATUS: {'PASS' if not failed else 'FAIL'} "
+            f"({len(results) - len(failed)}/{len(results)} traces passed)\n"
+        )
+        f.write("=" * 70 + "\n\n")
+
+        f.write(f"Input file: {summary.input_file}\n")
+        f.write(f"Expected points: {summary.expected_count}\n")
+        f.write(f"Traces: {len(results)}\n")
+        for status in ("PASS", "FAIL", "ERROR"):
+            f.write(f"{status:<10} {summary.count(status)}\n")
+        f.write(f"Input preparation: {summary.prepare_seconds:.3f} s\n")
+        f.write(f"Wall clock: {summary.elapsed_seconds:.3f} s\n")
+        f.write(
+            f"Trace time: {trace_seconds:.3f} s "
+            f"({trace_seconds / max(len(results), 1):.3f} s per trace)\n\n"
+        )
+
+        if failed:
+            f.write("FAILED TRACES:\n")
+            f.write("-" * 70 + "\n")
+            for result in failed:
+                f.write(f"  {result.output_file}: {result.overall_status}\n")
+                for failure_msg in result.failures:
+                    f.write(f"    {failure_msg}\n")
+            f.write("\n")
+
+        # per-trace status, size, deviation and timing
+        f.write("PER-TRACE RESULTS:\n")
+        f.write("-" * 70 + "\n")
+        f.write(
+            f"{'Output file':<40} {'Status':<8} {'Points':>8} "
+            f"{'Max dev':>10} {'Time (s)':>10}\n"
+        )
+        f.write("-" * 70 + "\n")
+        for result in results:
+            deviation = result.metrics.deviation_max if result.metrics else float("nan")
+            f.write(
+                f"{str(result.output_file):<40} {result.overall_status:<8} "
+                f"{result.actual_count:>8} "
+                f"{'-' if isnan(deviation) else f'{deviation:.6g}':>10} "
+                f"{result.elapsed_seconds:>10.3f}\n"
+            )
+
+    return report_file
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """command line entry point, returns non-zero if any trace did not pass"""
+
+    arg_parser = argparse.ArgumentParser(
+        description="Verify many TraceR output files against one input file."
+    )
+    arg_parser.add_argument("input_file", type=Path, help="shared input file")
+    arg_parser.add_argument(
+        "output_files", type=Path, nargs="+", help="output files to verify"
+    )
+    arg_parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    add_match_arguments(arg_parser)
+    arg_parser.add_argument(
+        "--report", type=Path, default=None, help="combined report file path"
+    )
+    args = arg_parser.parse_args(argv)
+
+    start = time.perf_counter()
+    reference = ReferenceInput(args.input_file, args.atol, args.rtol, args.match_mode)
+
+    results = []
+    for result in run_batch(reference, args.output_files, args.workers):
+        print(
+            f"{str(result.output_file):<50} {result.overall_status:<6} "
+            f"{result.elapsed_seconds:.3f}s"
+        )
+        results.append(result)
+    summary = BatchSummary(
+        args.input_file,
+        len(reference.expected_points),
+        results,
+        prepare_seconds=reference.prepare_seconds,
+        elapsed_seconds=time.perf_counter() - start,
+    )
+
+    report_file = write_batch_report(
+        summary, args.report or args.input_file.parent / REPORT_FILE_NAME
+    )
+    print(f"Report written to {report_file}")
+
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Incremental result cache for Sentinel scenario runs"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src import __version__
+from src.core import ResultsBucket
+from src.helpers import REPORT_FORMAT_VERSION
+from src.metrics import PathMetrics
+from src.tracefile import TRACE_FILE_NAME
+
+CACHE_DIR_NAME = ".sentinel_cache"
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(path: Path) -> str:
+    """sha256 of a file's content read in blocks, 'missing' if it does not exist"""
+
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+    except FileNotFoundError:
+        return "missing"
+
+    return digest.hexdigest()
+
+
+def scenario_digests(scenario_path: Path) -> Dict[str, str]:
+    """content digests of the files a scenario is verified from"""
+
+    return {
+        "input": file_digest(scenario_path / "system_input_file.txt"),
+        "output": file_digest(scenario_path / "system_output_file.txt"),
+        "trace": file_digest(scenario_path / TRACE_FILE_NAME),
+    }
+
+
+class ResultCache:
+    """on-disk cache of scenario results keyed by input/output content hashes
+
+    there is one entry per scenario folder. it is reused only if both input
+    files, the Sentinel version, the report format and the run settings are
+    unchanged and the artifacts it lists (report, plot) still exist.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_file(self, scenario_path: Path) -> Path:
+        return self.cache_dir / f"{scenario_path.name}.json"
+
+    def _points_file(self, scenario_path: Path) -> Path:
+        return self.cache_dir / f"{scenario_path.name}.npz"
+
+    @staticmethod
+    def scenario_key(scenario_path: Path, settings: Dict[str, Any]) -> str:
+        """cache key of a scenario from its file contents, versions and settings"""
+
+        key_data = {
+            "version": __version__,
+            "report_format": REPORT_FORMAT_VERSION,
+            "scenario": str(scenario_path.resolve()),
+            "settings": settings,
+            **scenario_digests(scenario_path),
+        }
+        return hashlib.sha256(
+            json.dumps(key_data, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def lookup(self, scenario_path: Path, key: str) -> Optional[Dict[str, Any]]:
+        """returns the stored result fields if the entry is still valid, else None"""
+
+        try:
+            with open(self._entry_file(scenario_path), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if entry.get("key") != key:
+            return None
+        if not all(Path(p).exists() for p in entry.get("artifacts", [])):
+            return None
+
+        return entry["result"]
+
+    def store(
+        self,
+        scenario_path: Path,
+        key: str,
+        result: Dict[str, Any],
+        bucket: ResultsBucket,
+        artifacts: List[Path],
+    ) -> None:
+        """stores a scenario result, its results bucket and artifact paths"""
+
+        points_file = self._points_file(scenario_path)
+        with open(points_file, "wb") as f:
+            np.savez(
+                f,
+                expected_points=np.asarray(bucket.expected_points),
+                actual_points=np.asarray(bucket.actual_points),
+            )
+
+        # failure logs are stored as their rendered (capped) messages
+        bucket_fields: Dict[str, Any] = {
+            name: list(getattr(bucket, name))
+            for name in (
+                "rectangle_failures",
+                "expected_points_failures",
+                "actual_points_failures",
+                "verifier_failures",
+            )
+        }
+        bucket_fields["overall_status"] = bucket.overall_status
+        bucket_fields["metrics"] = asdict(bucket.metrics) if bucket.metrics else None
+
+        entry = {
+            "key": key,
+            "version": __version__,
+            "result": result,
+            "bucket": bucket_fields,
+            "artifacts": [str(p) for p in artifacts],
+        }
+
+        # write then rename, so a concurrent reader never sees a partial entry
+        entry_file = self._entry_file(scenario_path)
+        tmp_file = entry_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp_file, entry_file)
+
+    def load_bucket(self, scenario_path: Path) -> Optional[ResultsBucket]:
+        """returns the cached results bucket of a scenario, None if not cached"""
+
+        try:
+            with open(self._entry_file(scenario_path), "r", encoding="utf-8") as f:
+                bucket_fields = json.load(f)["bucket"]
+            if bucket_fields.get("metrics") is not None:
+                bucket_fields["metrics"] = PathMetrics(**bucket_fields["metrics"])
+            with np.load(self._points_file(scenario_path)) as points:
+                return ResultsBucket(
+                    expected_points=points["expected_points"],
+                    actual_points=points["actual_points"],
+                    **bucket_fields,
+                )
+        except (FileNotFoundError, KeyError, json.JSONDecodeError):
+            return None
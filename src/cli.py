@@ -0,0 +1,26 @@
+"""Command line options shared by the Sentinel tools
+
+kept apart from the runner, so that tools such as batch and delta
+verification do not import the runner (and its plotting) for them.
+"""
+
+import argparse
+
+from src.core import TracerSentinel
+
+
+def add_match_arguments(arg_parser: argparse.ArgumentParser) -> None:
+    """adds the point match options shared by the command line tools"""
+
+    arg_parser.add_argument(
+        "--atol", type=float, default=0.0, help="absolute point match tolerance"
+    )
+    arg_parser.add_argument(
+        "--rtol", type=float, default=0.0, help="relative point match tolerance"
+    )
+    arg_parser.add_argument(
+        "--match-mode",
+        choices=TracerSentinel.MATCH_MODES,
+        default="sequence",
+        help="strict sequence or order-insensitive 'all points visited' matching",
+    )
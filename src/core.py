@@ -0,0 +1,939 @@
+"""Sentinel verification core: parsing, work areas and point verification
+
+imports no plotting libraries, so short-lived verification-only processes
+start fast. plotting and report writing live in src.helpers.
+"""
+
+import io
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import chain, zip_longest
+from math import isnan
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+from src.failures import FailureLog
+from src.metrics import PathMetrics, compute_path_metrics
+from src.points import (
+    PointArray,
+    PointGridIndex,
+    as_point_array,
+    compare_point_arrays,
+    match_visited,
+    order_convex_quadrilateral,
+    tolerance_grid_index,
+)
+
+# byte classes of the bulk coordinate scanner, other bytes are irregular
+_NEWLINE, _OPEN, _COMMA, _CLOSE, _DIGIT, _DOT, _SIGN, _BLANK = range(8)
+_BYTE_CLASSES = np.full(256, -1, dtype=np.int8)
+for _chars, _byte_class in (
+    (b"\n", _NEWLINE),
+    (b"(", _OPEN),
+    (b",", _COMMA),
+    (b")", _CLOSE),
+    (b"0123456789", _DIGIT),
+    (b".", _DOT),
+    (b"+-", _SIGN),
+    (b" \t", _BLANK),
+):
+    _BYTE_CLASSES[list(_chars)] = _byte_class
+
+# byte class pairs that may follow each other once blanks are dropped,
+# indexed by previous class * _BLANK + next class
+_ALLOWED_PAIRS = np.zeros(_BLANK * _BLANK, dtype=bool)
+for _previous, _next in (
+    (_NEWLINE, _NEWLINE),
+    (_NEWLINE, _OPEN),
+    (_OPEN, _DIGIT),
+    (_OPEN, _SIGN),
+    (_SIGN, _DIGIT),
+    (_DIGIT, _DIGIT),
+    (_DIGIT, _DOT),
+    (_DIGIT, _COMMA),
+    (_DIGIT, _CLOSE),
+    (_DOT, _DIGIT),
+    (_COMMA, _DIGIT),
+    (_COMMA, _SIGN),
+    (_CLOSE, _NEWLINE),
+):
+    _ALLOWED_PAIRS[_previous * _BLANK + _next] = True
+
+
+def _is_regular_point_block(raw: npt.NDArray[np.uint8]) -> bool:
+    """whether every line of raw bytes is blank or a plain ASCII (x, y)
+
+    this is a strict subset of what _SINGLE_COORD_REGEX accepts, i.e. lines
+    of [ \\t]*([ \\t]*NUM[ \\t]*,[ \\t]*NUM[ \\t]*)[ \\t]* with NUM being
+    [+-]?[0-9]+(.[0-9]+)?, checked with whole-array operations.
+    """
+
+    classes = np.take(_BYTE_CLASSES, raw)
+    if len(classes) and classes.min() < 0:
+        return False
+
+    # drop blanks, the block is framed by newlines on both ends
+    kept = np.concatenate(([True], classes != _BLANK, [True]))
+    after_blank = np.concatenate(([False, False], ~kept[1:-1]))[kept]
+    compact = np.concatenate(([_NEWLINE], classes, [_NEWLINE]))[kept]
+
+    if not _ALLOWED_PAIRS[compact[:-1] * _BLANK + compact[1:]].all():
+        return False
+
+    # no blank inside a number
+    in_number = compact >= _DIGIT
+    if np.any(after_blank[1:] & in_number[1:] & in_number[:-1]):
+        return False
+
+    # the pairs above allow one (...) per line, holding exactly one comma, and
+    # one dot per number. signs and digits never separate two dots of a number
+    marks = compact[(compact != _DIGIT) & (compact != _SIGN)]
+    if np.any((marks[1:] == _DOT) & (marks[:-1] == _DOT)):
+        return False
+    delimiters = marks[(marks >= _OPEN) & (marks <= _CLOSE)]
+    return len(delimiters) % 3 == 0 and bool(
+        np.all(delimiters[0::3] == _OPEN)
+        and np.all(delimiters[1::3] == _COMMA)
+        and np.all(delimiters[2::3] == _CLOSE)
+    )
+
+
+class CoordinateParser:
+    """read and parse coordinates input/output files."""
+
+    def __init__(self, input_file: Path, output_file: Path):
+        self.input_file = input_file
+        self.output_file = output_file
+        self.rectangle_failures = FailureLog()
+        self.expected_points_failures = FailureLog()
+        self.actual_points_failures = FailureLog()
+
+    # compiled regex for rectangle parsing (class-level for efficiency)
+    _RECTANGLE_REGEX = re.compile(
+        r"^\s*\(\s*(?P<x1>[+\-]?\d+(?:\.\d+)?)\s*,\s*(?P<y1>[+\-]?\d+(?:\.\d+)?)\s*\)\s*,\s*"
+        r"\(\s*(?P<x2>[+\-]?\d+(?:\.\d+)?)\s*,\s*(?P<y2>[+\-]?\d+(?:\.\d+)?)\s*\)\s*,\s*"
+        r"\(\s*(?P<x3>[+\-]?\d+(?:\.\d+)?)\s*,\s*(?P<y3>[+\-]?\d+(?:\.\d+)?)\s*\)\s*,\s*"
+        r"\(\s*(?P<x4>[+\-]?\d+(?:\.\d+)?)\s*,\s*(?P<y4>[+\-]?\d+(?:\.\d+)?)\s*\)\s*$"
+    )
+
+    # compiled regex to match a single coordinate (x, y)
+    _SINGLE_COORD_REGEX = re.compile(
+        r"^\s*\(\s*(?P<x>[+\-]?\d+(?:\.\d+)?)\s*,\s*(?P<y>[+\-]?\d+(?:\.\d+)?)\s*\)\s*$"
+    )
+
+    # bulk parsed blocks only need the parentheses and commas blanked out
+    _COORD_SEPARATORS = bytes.maketrans(b"(),", b"   ")
+
+    # point files are parsed in windows of about this many bytes
+    _BLOCK_SIZE = 1024 * 1024
+
+    # section keywords of the input file
+    _RECTANGLE_SECTION_REGEX = re.compile(r"Rectangle:\s*([\s\S]*?)(?=Points:|\Z)")
+    _POINTS_KEYWORD = "Points:"
+
+    def _parse_rectangle(self, data) -> List[Tuple[float, float]]:
+        """parse coordinates after the Rectangle keyword"""
+
+        if data is None:
+            self.rectangle_failures.append("No 'Rectangle:' keyword found.")
+            return []
+        data_str = data.group(1).strip()
+
+        if not data_str:
+            self.rectangle_failures.append(
+                "No coordinates found between Rectangle and Points keywords."
+            )
+            return []
+
+        if "\n" in data_str:
+            self.rectangle_failures.append(
+                "Rectangle coordinates must be on a single line."
+            )
+            return []
+
+        match = self._RECTANGLE_REGEX.match(data_str)
+        if not match:
+            self.rectangle_failures.append("Work area is not valid/quadrilateral")
+            return []
+
+        # extract all 4 coordinates in one pass
+        try:
+            points = [
+                (float(match.group(f"x{i}")), float(match.group(f"y{i}")))
+                for i in range(1, 5)
+            ]
+        except (ValueError, AttributeError) as e:
+            self.rectangle_failures.append(
+                f"Could not convert coordinates to float in rectangle data '{data_str}': {e}"
+            )
+            return []
+
+        if order_convex_quadrilateral(as_point_array(points)) is None:
+            self.rectangle_failures.append("Work area is not valid/quadrilateral")
+            points = []
+
+        return points
+
+    def _parse_points(
+        self, data, is_expected: bool = True
+    ) -> List[Tuple[float, float]]:
+        """parse points from a raw string or regex match (for output file)"""
+
+        # select the appropriate failures dictionary
+        failures_dict = (
+            self.expected_points_failures
+            if is_expected
+            else self.actual_points_failures
+        )
+
+        # handle both re.Match object and string, counting the lines before
+        # the points so failures carry their line number in the file
+        if data is None or (isinstance(data, re.Match) and data is None):
+            failures_dict.append("No 'Points:' keyword found.")
+            return []
+        if isinstance(data, re.Match):
+            first_line = data.string.count("\n", 0, data.start(1)) + 1
+            data = data.group(1)
+        elif isinstance(data, str):
+            first_line = 1
+        else:
+            failures_dict.append("Data cannot be parsed")
+            return []
+        first_line += data.count("\n", 0, len(data) - len(data.lstrip()))
+        data = data.strip()
+
+        encoded = data.encode("utf-8")
+        block_points = self._parse_point_block(encoded, 0, len(encoded))
+        if block_points is not None:
+            return list(map(tuple, block_points.tolist()))
+
+        points = []
+        for line_number, line in enumerate(data.split("\n"), first_line):
+            point = self._parse_point_line(line, failures_dict, line_number)
+            if point is not None:
+                points.append(point)
+
+        return points
+
+    def _parse_point_line(
+        self, line: str, failures_dict: FailureLog, line_number: int = 0
+    ) -> Optional[Tuple[float, float]]:
+        """parse a single coordinate line, returns None for lines that are skipped"""
+
+        line = line.strip()
+
+        # skip empty lines
+        if not line:
+            return None
+
+        # check for multiple coordinates on one line
+        if line.count("(") != 1:
+            failures_dict.add(FailureLog.MULTIPLE_COORDINATES, line_number)
+            return None
+
+        single_match = self._SINGLE_COORD_REGEX.match(line)
+        if not single_match:
+            failures_dict.add(FailureLog.INVALID_FORMAT, line_number, line)
+            return (float("nan"), float("nan"))  # invalid entry marker
+
+        try:
+            return (float(single_match.group("x")), float(single_match.group("y")))
+        except (ValueError, AttributeError) as e:
+            failures_dict.add(
+                FailureLog.INVALID_FLOAT,
+                line_number,
+                f"'{single_match.group(0)}' - {e}",
+            )
+            return (float("nan"), float("nan"))  # invalid entry marker
+
+    @classmethod
+    def _parse_point_block(
+        cls, buffer: Union[mmap.mmap, bytes], start: int, end: int
+    ) -> Optional[PointArray]:
+        """bulk parse the coordinate lines in buffer[start:end]
+
+        returns None if any line is irregular, the caller then parses the
+        block line by line to report the failures. the lines are checked in
+        place, only the bytes handed to the number conversion are copied.
+        """
+
+        raw = np.frombuffer(buffer, dtype=np.uint8, count=end - start, offset=start)
+        is_regular = _is_regular_point_block(raw)
+        has_points = is_regular and bool(np.any(raw == ord("(")))
+        del raw  # a live view would keep a memory map from being closed
+
+        if not is_regular:
+            return None
+        if not has_points:
+            return as_point_array([])
+
+        return np.fromstring(
+            buffer[start:end].translate(cls._COORD_SEPARATORS), sep=" "
+        ).reshape(-1, 2)
+
+    def _iter_windows(
+        self, buffer: Union[mmap.mmap, bytes], start: int, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, int]]:
+        """(start, end) byte ranges of about _BLOCK_SIZE up to stop, ending on whole lines"""
+
+        stop = len(buffer) if stop is None else stop
+        while start < stop:
+            newline = buffer.find(b"\n", start + self._BLOCK_SIZE - 1, stop)
+            end = stop if newline == -1 else newline + 1
+            yield start, end
+            start = end
+
+    @staticmethod
+    def _release_pages(buffer: Union[mmap.mmap, bytes], start: int, end: int):
+        """drops the pages of a parsed window of a file mapping from memory"""
+
+        if isinstance(buffer, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED"):
+            page_start = start - start % mmap.PAGESIZE
+            buffer.madvise(mmap.MADV_DONTNEED, page_start, end - page_start)
+
+    def _read_mapped_points(  # pylint: disable=too-many-locals
+        self,
+        buffer: Union[mmap.mmap, bytes],
+        start: int,
+        failures_dict: FailureLog,
+        first_line: int = 1,
+        stop: Optional[int] = None,
+    ) -> PointArray:
+        """parses the coordinate lines from byte offset start into a point array
+
+        windows of whole lines are bulk parsed straight from the buffer, a
+        window with an irregular line is decoded and parsed line by line.
+        mapped pages are released once parsed, so resident memory stays at
+        about the point array itself. first_line is the line number at start,
+        stop (a line start) ends the lines parsed before the end of the buffer.
+        """
+
+        # a line yields at most one point and only if it holds a "(", so the
+        # array is allocated once instead of concatenating the windows
+        capacity = 0
+        window_newlines = []
+        for window_start, window_end in self._iter_windows(buffer, start, stop):
+            raw = np.frombuffer(
+                buffer,
+                dtype=np.uint8,
+                count=window_end - window_start,
+                offset=window_start,
+            )
+            capacity += int(np.count_nonzero(raw == ord("(")))
+            window_newlines.append(int(np.count_nonzero(raw == ord("\n"))))
+            del raw  # a live view would keep the mapping from being closed
+            self._release_pages(buffer, window_start, window_end)
+
+        points = np.empty((capacity, 2), dtype=np.float64)
+        count = 0
+        line_number = first_line
+        for (window_start, window_end), newlines in zip(
+            self._iter_windows(buffer, start, stop), window_newlines
+        ):
+            window_points = self._parse_point_block(buffer, window_start, window_end)
+            if window_points is None:
+                # decoded like a file opened in text mode (universal newlines)
+                with io.TextIOWrapper(
+                    io.BytesIO(buffer[window_start:window_end]), encoding="utf-8"
+                ) as lines:
+                    window_points = as_point_array(
+                        point
+                        for point in (
+                            self._parse_point_line(line, failures_dict, number)
+                            for number, line in enumerate(lines, line_number)
+                        )
+                        if point is not None
+                    )
+            line_number += newlines
+            points[count : count + len(window_points)] = window_points
+            count += len(window_points)
+            self._release_pages(buffer, window_start, window_end)
+
+        # irregular lines may yield no point, do not keep the spare rows
+        return points if count == capacity else points[:count].copy()
+
+    @staticmethod
+    @contextmanager
+    def _map_file(path: Path) -> Iterator[Union[mmap.mmap, bytes]]:
+        """read-only memory map of a file, empty bytes for an empty file"""
+
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b""
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def _parse_input(
+        self, content: str
+    ) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        """reads the input file and returns workarea points and expected points"""
+
+        workarea_points: List[Tuple[float, float]] = []
+        expected_points: List[Tuple[float, float]] = []
+
+        # extract workarea_points (between Rectangle and Points)
+        rect_match = self._RECTANGLE_SECTION_REGEX.search(content)
+        workarea_points = self._parse_rectangle(rect_match)
+
+        # extract expected_points (after Points)
+        # note: if the Points keyword is not found or invalid,
+        # the coordinates will be considered part of the Rectangle section
+        # which then fails the multiple line check in _parse_rectangle
+        points_match = re.search(r"Points:\s*([\s\S]*)", content)
+        expected_points = self._parse_points(points_match, is_expected=True)
+
+        return workarea_points, expected_points
+
+    def _parse_output(self, content: str) -> List[Tuple[float, float]]:
+        """reads the actual visited points from the output file"""
+
+        # no keywords, only points and potential errors/invalid entries
+        return self._parse_points(content, is_expected=False)
+
+    def get_parsed_data(
+        self,
+    ) -> Tuple[
+        List[Tuple[float, float]], List[Tuple[float, float]], List[Tuple[float, float]]
+    ]:
+        """reads and parses all necessary data from both files"""
+
+        rectangle_coords: List[Tuple[float, float]] = []
+        expected_points: List[Tuple[float, float]] = []
+        actual_points: List[Tuple[float, float]] = []
+
+        try:
+            with open(self.input_file, "r", encoding="utf-8") as f:
+                input_content = f.read()
+            rectangle_coords, expected_points = self._parse_input(input_content)
+        except FileNotFoundError as e:
+            self.rectangle_failures.append(f"File not found: {e.filename}")
+
+        try:
+            with open(self.output_file, "r", encoding="utf-8") as f:
+                output_content = f.read()
+            actual_points = self._parse_output(output_content)
+        except FileNotFoundError as e:
+            self.actual_points_failures.append(f"File not found: {e.filename}")
+
+        return rectangle_coords, expected_points, actual_points
+
+    def parse_contents(
+        self, input_content: str, output_content: str
+    ) -> Tuple[
+        List[Tuple[float, float]], List[Tuple[float, float]], List[Tuple[float, float]]
+    ]:
+        """parses file contents that were received rather than read, e.g. over a socket"""
+
+        rectangle_coords, expected_points = self._parse_input(input_content)
+        return rectangle_coords, expected_points, self._parse_output(output_content)
+
+    def _read_input_header(self, f) -> Tuple[str, Optional[str]]:
+        """reads input lines up to the Points keyword
+
+        returns the header text and the remainder of the keyword line,
+        the remainder is None if the keyword was never found
+        """
+
+        header_lines = []
+        for line in f:
+            idx = line.find(self._POINTS_KEYWORD)
+            if idx != -1:
+                header_lines.append(line[:idx])
+                return "".join(header_lines), line[idx + len(self._POINTS_KEYWORD) :]
+            header_lines.append(line)
+
+        return "".join(header_lines), None
+
+    def _iter_input_points(self) -> Iterator[Tuple[float, float]]:
+        """lazily yields expected points from the input file, line by line"""
+
+        with open(self.input_file, "r", encoding="utf-8") as f:
+            header, remainder = self._read_input_header(f)
+            if remainder is None:
+                self.expected_points_failures.append("No 'Points:' keyword found.")
+                return
+
+            # the remainder is on the keyword line, following the header
+            keyword_line = header.count("\n") + 1
+            lines = chain([remainder], f)
+            for line_number, line in enumerate(lines, keyword_line):
+                point = self._parse_point_line(
+                    line, self.expected_points_failures, line_number
+                )
+                if point is not None:
+                    yield point
+
+    def _iter_output_points(self) -> Iterator[Tuple[float, float]]:
+        """lazily yields actual points from the output file, line by line"""
+
+        try:
+            with open(self.output_file, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    point = self._parse_point_line(
+                        line, self.actual_points_failures, line_number
+                    )
+                    if point is not None:
+                        yield point
+        except FileNotFoundError as e:
+            self.actual_points_failures.append(f"File not found: {e.filename}")
+
+    def stream_parsed_data(
+        self,
+    ) -> Tuple[
+        List[Tuple[float, float]],
+        Iterator[Tuple[float, float]],
+        Iterator[Tuple[float, float]],
+    ]:
+        """parses the rectangle and returns lazy iterators over expected and actual points
+
+        files are read line by line so memory stays bounded regardless of
+        file size. the *_failures lists are complete once both iterators
+        have been exhausted.
+        """
+
+        rectangle_coords: List[Tuple[float, float]] = []
+        expected_points: Iterator[Tuple[float, float]] = iter(())
+
+        try:
+            with open(self.input_file, "r", encoding="utf-8") as f:
+                header, _ = self._read_input_header(f)
+            rectangle_coords = self._parse_rectangle(
+                self._RECTANGLE_SECTION_REGEX.search(header)
+            )
+            expected_points = self._iter_input_points()
+        except FileNotFoundError as e:
+            self.rectangle_failures.append(f"File not found: {e.filename}")
+
+        return rectangle_coords, expected_points, self._iter_output_points()
+
+    def get_parsed_input_arrays(self) -> Tuple[PointArray, PointArray]:
+        """reads and parses the input file into rectangle and expected point arrays"""
+
+        rectangle_coords: List[Tuple[float, float]] = []
+        expected_points = as_point_array([])
+        keyword = self._POINTS_KEYWORD.encode("ascii")
+
+        try:
+            with self._map_file(self.input_file) as buffer:
+                idx = buffer.find(keyword)
+                header_end = len(buffer) if idx == -1 else idx
+                with io.TextIOWrapper(
+                    io.BytesIO(buffer[:header_end]), encoding="utf-8"
+                ) as header:
+                    header_text = header.read()
+                rectangle_coords = self._parse_rectangle(
+                    self._RECTANGLE_SECTION_REGEX.search(header_text)
+                )
+                if idx == -1:
+                    self.expected_points_failures.append("No 'Points:' keyword found.")
+                else:
+                    expected_points = self._read_mapped_points(
+                        buffer,
+                        idx + len(keyword),
+                        self.expected_points_failures,
+                        header_text.count("\n") + 1,
+                    )
+        except FileNotFoundError as e:
+            self.rectangle_failures.append(f"File not found: {e.filename}")
+
+        return as_point_array(rectangle_coords), expected_points
+
+    def get_parsed_output_array(self) -> PointArray:
+        """reads and parses the output file into an actual point array"""
+
+        try:
+            with self._map_file(self.output_file) as buffer:
+                return self._read_mapped_points(buffer, 0, self.actual_points_failures)
+        except FileNotFoundError as e:
+            self.actual_points_failures.append(f"File not found: {e.filename}")
+
+        return as_point_array([])
+
+    def get_parsed_output_spans(
+        self, spans: Iterable[Tuple[int, int, int]]
+    ) -> List[Tuple[PointArray, int]]:
+        """parses (start, end, first line) byte spans of whole lines of the output file
+
+        returns the point array and failure count of each span, failures carry
+        their line number in the whole file. the file is mapped once for all spans.
+        """
+
+        parsed = []
+        try:
+            with self._map_file(self.output_file) as buffer:
+                for start, end, first_line in spans:
+                    failure_count = len(self.actual_points_failures)
+                    points = self._read_mapped_points(
+                        buffer, start, self.actual_points_failures, first_line, end
+                    )
+                    parsed.append(
+                        (points, len(self.actual_points_failures) - failure_count)
+                    )
+        except FileNotFoundError as e:
+            self.actual_points_failures.append(f"File not found: {e.filename}")
+
+        return parsed
+
+    def get_parsed_arrays(self) -> Tuple[PointArray, PointArray, PointArray]:
+        """reads and parses both files straight into (N, 2) float64 arrays
+
+        reports the same points and failures as stream_parsed_data. the files
+        are memory-mapped and well-formed windows of lines are parsed in bulk
+        from the raw bytes, so no copy of a whole file is ever held.
+        """
+
+        rectangle_coords, expected_points = self.get_parsed_input_arrays()
+        return rectangle_coords, expected_points, self.get_parsed_output_array()
+
+    def get_failures(self) -> Tuple[FailureLog, FailureLog, FailureLog]:
+        """returns 3 lists of failures: rectangle, expected points, and actual points"""
+
+        return (
+            self.rectangle_failures,
+            self.expected_points_failures,
+            self.actual_points_failures,
+        )
+
+
+class WorkArea:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """models the robot arm's work environment and expected path"""
+
+    # distance a point may lie outside a rotated edge and still count as on it
+    _BOUNDARY_TOLERANCE = 1e-9
+
+    def __init__(
+        self,
+        rectangle_coords: Union[PointArray, List[Tuple[float, float]]],
+        expected_points: Union[PointArray, Iterable[Tuple[float, float]]],
+    ):
+
+        corners = order_convex_quadrilateral(as_point_array(rectangle_coords))
+        if corners is None:
+            raise ValueError("Work area is not a convex quadrilateral")
+        self.corners = corners
+
+        # determine the work area bounding box (x_min, y_min, x_max, y_max),
+        # used as a cheap rejection pre-filter before the exact edge test
+        self.x_min, self.y_min = (float(v) for v in corners.min(axis=0))
+        self.x_max, self.y_max = (float(v) for v in corners.max(axis=0))
+        self.bounding_box = (self.x_min, self.y_min, self.x_max, self.y_max)
+
+        # precompute edge half-planes a*x + b*y + c >= 0 (inside, counter-clockwise)
+        # with unit normals (a, b), so the left side is the signed edge distance
+        starts = corners
+        deltas = np.roll(corners, -1, axis=0) - starts
+        normals = np.column_stack([-deltas[:, 1], deltas[:, 0]])
+        normals /= np.hypot(normals[:, 0], normals[:, 1])[:, np.newaxis]
+        offsets = -(normals * starts).sum(axis=1)
+        self.edge_normals = normals
+        self.edge_offsets = offsets
+
+        # an axis-aligned rectangle is its own bounding box, no edge test needed
+        self.axis_aligned = bool((deltas == 0).any(axis=1).all())
+
+        self.expected_sequence = expected_points
+        self._expected_indexes: Dict[Tuple[float, float], PointGridIndex] = {}
+
+    @cached_property
+    def expected_array(self) -> PointArray:
+        """expected points packed into a point array, once per work area"""
+
+        return as_point_array(self.expected_sequence)
+
+    @cached_property
+    def expected_outside(self) -> PointArray:
+        """expected points that lie outside the work area"""
+
+        return self.expected_array[~self.points_in_bounds(self.expected_array)]
+
+    def expected_grid_index(self, atol: float, rtol: float) -> PointGridIndex:
+        """grid index over the expected points for the given match tolerances
+
+        built once per tolerance pair and reused by every verifier that
+        shares this work area.
+        """
+
+        key = (atol, rtol)
+        if key not in self._expected_indexes:
+            self._expected_indexes[key] = tolerance_grid_index(
+                self.expected_array, atol, rtol
+            )
+        return self._expected_indexes[key]
+
+    def point_in_bounds(self, point: Tuple[float, float]) -> bool:
+        """checks if a point is within the closed quadrilateral work area (including boundary)"""
+
+        x, y = point
+        x_min, y_min, x_max, y_max = self.bounding_box
+
+        if not ((x_min <= x <= x_max) and (y_min <= y <= y_max)):
+            return False
+        if self.axis_aligned:
+            return True
+
+        return all(
+            a * x + b * y + c >= -self._BOUNDARY_TOLERANCE
+            for (a, b), c in zip(self.edge_normals.tolist(), self.edge_offsets.tolist())
+        )
+
+    def points_in_bounds(self, points: PointArray) -> npt.NDArray:
+        """vectorized point_in_bounds over an (N, 2) array, returns a boolean mask"""
+
+        xs, ys = points[:, 0], points[:, 1]
+
+        # NaN (invalid) points compare False and are therefore out of bounds
+        inside = (xs >= self.x_min) & (xs <= self.x_max)
+        inside &= (ys >= self.y_min) & (ys <= self.y_max)
+        if self.axis_aligned:
+            return inside
+
+        # exact edge test only for the points that survived the pre-filter,
+        # one fused multiply-add per edge keeps temporaries to a single column
+        candidates = np.flatnonzero(inside)
+        cand_xs, cand_ys = xs[candidates], ys[candidates]
+        on_inner_side = np.ones(len(candidates), dtype=bool)
+        for (a, b), c in zip(self.edge_normals.tolist(), self.edge_offsets.tolist()):
+            on_inner_side &= a * cand_xs + b * cand_ys >= -c - self._BOUNDARY_TOLERANCE
+        inside[candidates] = on_inner_side
+        return inside
+
+
+class PointVerdict(NamedTuple):
+    """comparison result of one index of the expected and actual sequences"""
+
+    position: int
+    expected: Optional[Tuple[float, float]]  # None when the sequence ran out
+    actual: Optional[Tuple[float, float]]  # None when the sequence ran out
+    status: str
+
+
+def iter_point_verdicts(
+    expected_points: Iterable[Tuple[float, float]],
+    actual_points: Iterable[Tuple[float, float]],
+    atol: float = 0.0,
+    rtol: float = 0.0,
+) -> Iterator[PointVerdict]:
+    """walks expected and actual points in lockstep and yields a verdict per index"""
+
+    exact = atol == 0.0 and rtol == 0.0
+
+    for index, (expected, actual) in enumerate(
+        zip_longest(expected_points, actual_points)
+    ):
+        if expected is None or actual is None:
+            status = "FAIL"
+        elif isnan(expected[0]) or isnan(actual[0]):
+            status = "FAIL"
+        elif exact and expected == actual:
+            status = "PASS"
+        elif not exact and all(
+            abs(a - e) <= atol + rtol * abs(e) for e, a in zip(expected, actual)
+        ):
+            status = "PASS"
+        else:
+            status = "FAIL"
+
+        yield PointVerdict(index, expected, actual, status)
+
+
+class TracerSentinel:  # pylint: disable=too-many-instance-attributes
+    """performs sequence and geometric validation
+
+    match_mode "sequence" (default) requires the actual points to follow the
+    expected points index by index, "visited" only requires every expected
+    point to be visited (in any order) and every actual point to be expected.
+    points match when each coordinate is within atol + rtol * |expected|.
+    """
+
+    MATCH_MODES = ("sequence", "visited")
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        work_area: WorkArea,
+        actual_points: Iterable[Tuple[float, float]],
+        atol: float = 0.0,
+        rtol: float = 0.0,
+        match_mode: str = "sequence",
+    ):
+
+        if match_mode not in self.MATCH_MODES:
+            raise ValueError(
+                f"Unknown match mode '{match_mode}', expected one of {self.MATCH_MODES}"
+            )
+        if atol < 0.0 or rtol < 0.0:
+            raise ValueError("Match tolerances must not be negative")
+
+        self.work_area = work_area
+        self.actual_sequence = actual_points
+        self.atol = atol
+        self.rtol = rtol
+        self.match_mode = match_mode
+        self.failures: List[str] = []
+        self.expected_count = 0
+        self.actual_count = 0
+        self.first_divergence_index: Optional[int] = None
+        self.nearest_expected_index: Optional[npt.NDArray] = None
+        self.metrics: Optional[PathMetrics] = None
+
+    def _check_geometric_validity(self, point: Tuple[float, float]):
+        """expected points must be within the work area bounds"""
+
+        if not self.work_area.point_in_bounds(point):
+            self.failures.append(
+                f"Geometric FAIL: Expected point ({point}) is outside the closed work area."
+            )
+
+    def _check_geometric_validity_array(self):
+        """geometric check of all expected points at once, cached by the work area"""
+
+        for point in self.work_area.expected_outside.tolist():
+            self._check_geometric_validity(tuple(point))
+
+    def _check_sequence_sameness(self):
+        """actual sequence must match expected sequence exactly"""
+
+        if self.expected_count != self.actual_count:
+            self.failures.append(
+                f"Sequence FAIL: Length mismatch. Expected {self.expected_count} "
+                f"versus {self.actual_count}"
+            )
+        elif self.first_divergence_index is not None:
+            self.failures.append(
+                "Sequence FAIL: Sequence mismatch between expected and actual points "
+                f"(first divergence at index {self.first_divergence_index})."
+            )
+
+    def iter_verification(self) -> Iterator[PointVerdict]:
+        """walks expected and actual points once in lockstep, yielding per-point verdicts
+
+        failures are collected as the walk goes and are complete once the
+        iterator is exhausted. the first divergence index is available as
+        soon as it has been yielded.
+        """
+
+        if self.match_mode != "sequence":
+            raise ValueError("Lockstep verification needs the 'sequence' match mode")
+
+        self.failures = []
+        self.expected_count = 0
+        self.actual_count = 0
+        self.first_divergence_index = None
+        self.metrics = None
+
+        for verdict in iter_point_verdicts(
+            self.work_area.expected_sequence, self.actual_sequence, self.atol, self.rtol
+        ):
+            if verdict.expected is not None:
+                self.expected_count += 1
+                self._check_geometric_validity(verdict.expected)
+            if verdict.actual is not None:
+                self.actual_count += 1
+            if verdict.status == "FAIL" and self.first_divergence_index is None:
+                self.first_divergence_index = verdict.position
+            yield verdict
+
+        self._check_sequence_sameness()
+
+    def run_verification(self, passed: Optional[npt.NDArray] = None) -> List[str]:
+        """runs checks on parsed data and returns list of failures
+
+        both sequences are packed into point arrays and checked with
+        whole-array operations, use iter_verification for streamed input.
+        the path metrics are kept in metrics. passed is an optional PASS
+        mask of the sequence comparison computed beforehand (as returned by
+        compare_point_arrays), e.g. by delta re-verification.
+        """
+
+        self.failures = []
+        self.nearest_expected_index = None
+        expected = self.work_area.expected_array
+        actual = as_point_array(self.actual_sequence)
+        self.expected_count, self.actual_count = len(expected), len(actual)
+
+        self._check_geometric_validity_array()
+
+        if self.match_mode == "visited":
+            self._check_points_visited(expected, actual)
+        else:
+            if passed is None:
+                passed = compare_point_arrays(expected, actual, self.atol, self.rtol)
+            diverged = np.flatnonzero(~passed)
+            self.first_divergence_index = int(diverged[0]) if len(diverged) else None
+            self._check_sequence_sameness()
+
+        self.metrics = compute_path_metrics(
+            expected,
+            actual,
+            self.work_area.points_in_bounds(actual),
+            self.nearest_expected_index,
+        )
+        return self.failures
+
+    def _check_points_visited(self, expected: PointArray, actual: PointArray):
+        """every expected point must be visited and every actual point expected
+
+        the nearest matching expected point of each actual point is kept in
+        nearest_expected_index (-1 if none).
+        """
+
+        match = match_visited(
+            expected,
+            actual,
+            self.atol,
+            self.rtol,
+            self.work_area.expected_grid_index(self.atol, self.rtol),
+        )
+        self.nearest_expected_index = match.nearest_expected
+
+        unvisited = np.flatnonzero(~match.visited)
+        if len(unvisited):
+            self.failures.append(
+                f"Visit FAIL: {len(unvisited)} expected point(s) never visited, "
+                f"first at index {unvisited[0]} ({tuple(expected[unvisited[0]].tolist())})."
+            )
+
+        unexpected = np.flatnonzero(self.nearest_expected_index < 0)
+        if len(unexpected):
+            self.first_divergence_index = int(unexpected[0])
+            self.failures.append(
+                f"Visit FAIL: {len(unexpected)} actual point(s) match no expected point, "
+                f"first at index {unexpected[0]} ({tuple(actual[unexpected[0]].tolist())})."
+            )
+
+
+@dataclass(slots=True)
+class ResultsBucket:  # pylint: disable=too-many-instance-attributes
+    """container for test results data
+
+    points given as lists are packed into (N, 2) float64 arrays.
+    """
+
+    expected_points: Union[PointArray, List[Tuple[float, float]]]
+    actual_points: Union[PointArray, List[Tuple[float, float]]]
+    rectangle_failures: Union[FailureLog, List[str]]
+    expected_points_failures: Union[FailureLog, List[str]]
+    actual_points_failures: Union[FailureLog, List[str]]
+    verifier_failures: List[str]
+    overall_status: str = "UNKNOWN"
+    metrics: Optional[PathMetrics] = None
+
+    def __post_init__(self):
+        self.expected_points = as_point_array(self.expected_points)
+        self.actual_points = as_point_array(self.actual_points)
@@ -0,0 +1,542 @@
+"""Delta re-verification of a TraceR output against the previous run's output
+
+the output file is split into content-defined chunks of whole lines: a
+chunk ends after a line whose rolling hash over the preceding bytes hits a
+mask, so an edit only moves the chunk boundaries around it. the chunk
+hashes, per-chunk point counts, the parsed points and the sequence PASS
+mask of a run are stored in a delta index next to the output file. the
+next run on the same input aligns its chunk hashes with the stored ones,
+re-parses only the chunks that changed (through CoordinateParser) and
+re-compares only the points whose position moved, before TracerSentinel
+checks the whole sequence. without a usable index the output is verified
+in full and the index is written for the next run.
+
+usage: python -m src.delta INPUT_FILE OUTPUT_FILE [--index FILE] [--no-update]
+                           [--atol ATOL] [--rtol RTOL] [--match-mode MODE]
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from src import __version__
+from src.cache import file_digest
+from src.cli import add_match_arguments
+from src.core import CoordinateParser, TracerSentinel, WorkArea
+from src.metrics import PathMetrics
+from src.points import PointArray, as_point_array, compare_point_arrays
+
+DELTA_INDEX_SUFFIX = ".delta.npz"
+
+# chunk boundaries are line ends whose hash over the last _HASH_WINDOW bytes
+# has the _BOUNDARY_MASK bits clear, i.e. about every 1024 lines
+_HASH_WINDOW = 32
+_BOUNDARY_MASK = (1 << 10) - 1
+_GEAR = np.random.default_rng(0x5E471E1).integers(0, 1 << 32, 256, dtype=np.uint32)
+
+# chunks are kept between these sizes, whatever the content
+MIN_CHUNK_BYTES = 4 * 1024
+MAX_CHUNK_BYTES = 256 * 1024
+
+# the output file is scanned for boundaries in blocks of this many bytes
+_SCAN_BLOCK_SIZE = 1024 * 1024
+
+
+class ChunkTable(NamedTuple):
+    """content-defined chunks of a file: byte ranges, hashes and newline counts"""
+
+    starts: npt.NDArray[np.int64]
+    ends: npt.NDArray[np.int64]
+    hashes: npt.NDArray[np.uint64]
+    newlines: npt.NDArray[np.int64]
+
+
+class DeltaIndex(NamedTuple):
+    """what a verified run leaves for delta re-verification of the next one"""
+
+    settings: Dict[str, Any]
+    rectangle: PointArray
+    expected_points: PointArray
+    chunks: ChunkTable
+    point_counts: npt.NDArray[np.int64]  # points parsed per chunk
+    clean: npt.NDArray[np.bool_]  # chunk parsed without failures
+    actual_points: PointArray
+    passed: npt.NDArray[np.bool_]  # sequence PASS mask, empty for visited
+
+
+class ChangedRange(NamedTuple):
+    """points (and the lines they start at) that differ from the previous run"""
+
+    start: int
+    end: int
+    previous_start: int
+    previous_end: int
+    first_line: int
+
+
+@dataclass
+class DeltaResult:  # pylint: disable=too-many-instance-attributes
+    """outcome of a delta re-verification"""
+
+    output_file: Path
+    overall_status: str
+    failures: List[str] = field(default_factory=list)
+    changed: List[ChangedRange] = field(default_factory=list)
+    baseline: bool = False  # a previous index was used
+    chunks: int = 0
+    reparsed_chunks: int = 0
+    reparsed_bytes: int = 0
+    compared_points: int = 0
+    actual_count: int = 0
+    elapsed_seconds: float = 0.0
+    metrics: Optional[PathMetrics] = None
+
+
+def _candidate_boundaries(buffer: Union[mmap.mmap, bytes]) -> npt.NDArray[np.int64]:
+    """offsets after the line ends whose rolling hash hits the boundary mask
+
+    the hash is a sum of per-byte random values over the last _HASH_WINDOW
+    bytes, so it only depends on the content around the line end.
+    """
+
+    candidates = [np.empty(0, dtype=np.int64)]
+    for start in range(0, len(buffer), _SCAN_BLOCK_SIZE):
+        end = min(start + _SCAN_BLOCK_SIZE, len(buffer))
+        context = max(start - _HASH_WINDOW, 0)
+        raw = np.frombuffer(buffer, dtype=np.uint8, count=end - context, offset=context)
+        # uint32 sums wrap, differences of them are still exact modulo 2**32
+        sums = np.cumsum(_GEAR[raw], dtype=np.uint32)
+        newlines = np.flatnonzero(raw == ord("\n"))
+        del raw  # a live view would keep the mapping from being closed
+        newlines = newlines[newlines >= start - context]
+
+        window_start = newlines - _HASH_WINDOW
+        hashes = sums[newlines] - np.where(
+            window_start >= 0, sums[np.maximum(window_start, 0)], np.uint32(0)
+        )
+        candidates.append(newlines[(hashes & _BOUNDARY_MASK) == 0] + context + 1)
+
+    return np.concatenate(candidates)
+
+
+def _chunk_ends(buffer: Union[mmap.mmap, bytes]) -> List[int]:
+    """chunk end offsets, candidates closer than MIN_CHUNK_BYTES are skipped and a
+    boundary is forced at the first line end past MAX_CHUNK_BYTES
+    """
+
+    ends: List[int] = []
+    last = 0
+    for candidate in [*_candidate_boundaries(buffer).tolist(), len(buffer)]:
+        while candidate - last > MAX_CHUNK_BYTES:
+            forced = buffer.find(b"\n", last + MAX_CHUNK_BYTES - 1, candidate - 1)
+            if forced == -1:
+                break
+            ends.append(forced + 1)
+            last = forced + 1
+        if candidate - last >= MIN_CHUNK_BYTES or (
+            candidate == len(buffer) and candidate > last
+        ):
+            ends.append(candidate)
+            last = candidate
+
+    return ends
+
+
+def chunk_file(path: Path) -> ChunkTable:
+    """splits a file into content-defined chunks of whole lines"""
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _chunk_table(b"", [])
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return _chunk_table(buffer, _chunk_ends(buffer))
+
+
+def _chunk_table(buffer: Union[mmap.mmap, bytes], ends: List[int]) -> ChunkTable:
+    """hashes and newline counts of the chunks ending at ends"""
+
+    starts = [0, *ends[:-1]] if ends else []
+    hashes = np.empty(len(ends), dtype=np.uint64)
+    newlines = np.empty(len(ends), dtype=np.int64)
+    with memoryview(buffer) as view:
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            chunk = view[start:end]
+            hashes[i] = int.from_bytes(
+                hashlib.blake2b(chunk, digest_size=8).digest(), "little"
+            )
+            newlines[i] = chunk.tobytes().count(b"\n")
+            chunk.release()
+
+    return ChunkTable(
+        np.array(starts, dtype=np.int64),
+        np.array(ends, dtype=np.int64),
+        hashes,
+        newlines,
+    )
+
+
+def load_index(index_file: Path) -> DeltaIndex:
+    """reads a delta index written by write_index"""
+
+    with np.load(index_file, allow_pickle=False) as data:
+        return DeltaIndex(
+            settings=json.loads(str(data["settings"])),
+            rectangle=data["rectangle"],
+            expected_points=data["expected_points"],
+            chunks=ChunkTable(
+                data["starts"], data["ends"], data["hashes"], data["newlines"]
+            ),
+            point_counts=data["point_counts"],
+            clean=data["clean"],
+            actual_points=data["actual_points"],
+            passed=data["passed"],
+        )
+
+
+def write_index(index: DeltaIndex, index_file: Path) -> Path:
+    """writes a delta index, replacing the file atomically"""
+
+    tmp_file = index_file.with_name(f"{index_file.name}.{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        np.savez(
+            f,
+            settings=np.array(json.dumps(index.settings, sort_keys=True)),
+            rectangle=index.rectangle,
+            expected_points=index.expected_points,
+            **index.chunks._asdict(),
+            point_counts=index.point_counts,
+            clean=index.clean,
+            actual_points=index.actual_points,
+            passed=index.passed,
+        )
+    os.replace(tmp_file, index_file)
+    return index_file
+
+
+def default_index_file(output_file: Path) -> Path:
+    """the delta index kept next to an output file"""
+
+    return output_file.with_name(output_file.name + DELTA_INDEX_SUFFIX)
+
+
+def _reuse_plan(
+    previous: Optional[DeltaIndex], chunks: ChunkTable
+) -> Tuple[List[int], List[Tuple[int, int, int, int]]]:
+    """previous chunk reused for each new chunk (-1 to parse it) and the changed
+    (new, previous) chunk ranges, aligned by their hashes
+    """
+
+    if previous is None:
+        return [-1] * len(chunks.hashes), []
+
+    reuse = [-1] * len(chunks.hashes)
+    changed = []
+    matcher = SequenceMatcher(
+        None, previous.chunks.hashes.tolist(), chunks.hashes.tolist(), autojunk=False
+    )
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            changed.append((j1, j2, i1, i2))
+            continue
+        for i, j in zip(range(i1, i2), range(j1, j2)):
+            # chunks with parsing failures are parsed again for their messages
+            if previous.clean[i]:
+                reuse[j] = i
+
+    return reuse, changed
+
+
+def _reference(
+    input_file: Path, previous: Optional[DeltaIndex]
+) -> Tuple[PointArray, PointArray, List[str]]:
+    """rectangle and expected points of the previous index, else parsed from the file"""
+
+    if previous is not None:
+        return previous.rectangle, previous.expected_points, []
+
+    parser = CoordinateParser(input_file, output_file=Path(os.devnull))
+    rectangle, expected_points = parser.get_parsed_input_arrays()
+    rectangle_failures, expected_points_failures, _ = parser.get_failures()
+    return rectangle, expected_points, rectangle_failures + expected_points_failures
+
+
+def _sequence_mask(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    expected: PointArray,
+    actual: PointArray,
+    offsets: npt.NDArray[np.int64],
+    reuse: List[int],
+    previous: Optional[DeltaIndex],
+    atol: float,
+    rtol: float,
+) -> Tuple[npt.NDArray[np.bool_], int]:
+    """PASS mask of the sequence comparison and the number of points compared
+
+    offsets are the first point of each chunk (and the point count). the
+    verdicts of a reused chunk are copied if its points kept their
+    positions, all other points are compared again.
+    """
+
+    previous_offsets = _offsets(previous.point_counts) if previous else offsets
+    passed = np.zeros(max(len(expected), len(actual)), dtype=bool)
+    compared = 0
+    for j, i in enumerate(reuse):
+        start, end = int(offsets[j]), int(offsets[j + 1])
+        if previous is not None and i >= 0 and previous_offsets[i] == start:
+            passed[start:end] = previous.passed[start:end]
+            continue
+        end = min(end, len(expected))
+        if end > start:
+            passed[start:end] = compare_point_arrays(
+                expected[start:end], actual[start:end], atol, rtol
+            )
+            compared += end - start
+
+    return passed, compared
+
+
+def _offsets(point_counts: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    """first point of each chunk, followed by the total point count"""
+
+    return np.concatenate(([0], np.cumsum(point_counts, dtype=np.int64)))
+
+
+def _assemble_points(
+    parsed: Dict[int, PointArray],
+    point_counts: npt.NDArray[np.int64],
+    reuse: List[int],
+    previous: Optional[DeltaIndex],
+) -> PointArray:
+    """actual points of all chunks, in order, from parsed and reused chunks"""
+
+    offsets = _offsets(point_counts)
+    previous_offsets = _offsets(previous.point_counts) if previous else offsets
+    actual = np.empty((int(offsets[-1]), 2), dtype=np.float64)
+    for j, i in enumerate(reuse):
+        start, end = offsets[j], offsets[j + 1]
+        if i < 0:
+            actual[start:end] = parsed[j]
+        elif previous is not None:
+            actual[start:end] = previous.actual_points[
+                previous_offsets[i] : previous_offsets[i] + end - start
+            ]
+    return actual
+
+
+def _parse_chunks(
+    output_file: Path,
+    chunks: ChunkTable,
+    reuse: List[int],
+    previous: Optional[DeltaIndex],
+) -> Tuple[PointArray, npt.NDArray[np.int64], npt.NDArray[np.bool_], List[str]]:
+    """actual points of all chunks: reused from the previous index or parsed again
+
+    returns the points, the point count and clean flag per chunk and the
+    parsing failures, which carry their line numbers in the whole file.
+    """
+
+    parser = CoordinateParser(Path(os.devnull), output_file)
+    first_lines = _offsets(chunks.newlines) + 1
+    parsed_chunks = [j for j, i in enumerate(reuse) if i < 0]
+
+    point_counts = np.zeros(len(reuse), dtype=np.int64)
+    clean = np.ones(len(reuse), dtype=bool)
+    parsed: Dict[int, PointArray] = {}
+    spans = parser.get_parsed_output_spans(
+        (int(chunks.starts[j]), int(chunks.ends[j]), int(first_lines[j]))
+        for j in parsed_chunks
+    )
+    for j, (points, failure_count) in zip(parsed_chunks, spans):
+        parsed[j] = points
+        point_counts[j] = len(points)
+        clean[j] = failure_count == 0
+    if previous is not None:
+        reused = np.array(reuse, dtype=np.int64)
+        point_counts[reused >= 0] = previous.point_counts[reused[reused >= 0]]
+
+    return (
+        _assemble_points(parsed, point_counts, reuse, previous),
+        point_counts,
+        clean,
+        list(parser.actual_points_failures),
+    )
+
+
+def verify_delta(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    input_file: Path,
+    output_file: Path,
+    index_file: Optional[Path] = None,
+    atol: float = 0.0,
+    rtol: float = 0.0,
+    match_mode: str = "sequence",
+    update_index: bool = True,
+) -> DeltaResult:
+    """verifies an output file, re-parsing only what changed since the indexed run
+
+    the index (next to the output file by default) is only used if it was
+    written for the same input file content, tolerances and match mode.
+    with update_index, the index is rewritten for this run, unless the input
+    file does not parse.
+    """
+
+    start_time = time.perf_counter()
+    index_file = index_file or default_index_file(output_file)
+    settings = {
+        "version": __version__,
+        "input": file_digest(input_file),
+        "atol": atol,
+        "rtol": rtol,
+        "match_mode": match_mode,
+    }
+    previous = load_index(index_file) if index_file.exists() else None
+    if previous is not None and previous.settings != settings:
+        previous = None
+
+    rectangle, expected, input_failures = _reference(input_file, previous)
+    if input_failures:
+        return DeltaResult(
+            output_file,
+            "FAIL",
+            failures=input_failures,
+            elapsed_seconds=time.perf_counter() - start_time,
+        )
+
+    try:
+        chunks = chunk_file(output_file)
+    except FileNotFoundError as e:
+        return DeltaResult(
+            output_file,
+            "FAIL",
+            failures=[f"File not found: {e.filename}"],
+            baseline=previous is not None,
+            elapsed_seconds=time.perf_counter() - start_time,
+        )
+
+    reuse, changed_chunks = _reuse_plan(previous, chunks)
+    actual, point_counts, clean, parse_failures = _parse_chunks(
+        output_file, chunks, reuse, previous
+    )
+    offsets = _offsets(point_counts)
+    previous_offsets = _offsets(previous.point_counts) if previous else offsets
+
+    passed = np.empty(0, dtype=bool)
+    compared = len(actual)
+    if match_mode == "sequence":
+        passed, compared = _sequence_mask(
+            expected, actual, offsets, reuse, previous, atol, rtol
+        )
+    verifier = TracerSentinel(
+        WorkArea(rectangle, expected), actual, atol, rtol, match_mode
+    )
+    failures = parse_failures + verifier.run_verification(
+        passed if match_mode == "sequence" else None
+    )
+
+    if update_index:
+        write_index(
+            DeltaIndex(
+                settings,
+                as_point_array(rectangle),
+                expected,
+                chunks,
+                point_counts,
+                clean,
+                actual,
+                passed,
+            ),
+            index_file,
+        )
+
+    parsed_chunks = [j for j, i in enumerate(reuse) if i < 0]
+    first_lines = _offsets(chunks.newlines) + 1
+    return DeltaResult(
+        output_file,
+        "FAIL" if failures else "PASS",
+        failures=failures,
+        changed=[
+            ChangedRange(
+                int(offsets[j1]),
+                int(offsets[j2]),
+                int(previous_offsets[i1]) if previous else 0,
+                int(previous_offsets[i2]) if previous else 0,
+                int(first_lines[j1]) if j1 < len(chunks.starts) else 0,
+            )
+            for j1, j2, i1, i2 in changed_chunks
+        ],
+        baseline=previous is not None,
+        chunks=len(chunks.starts),
+        reparsed_chunks=len(parsed_chunks),
+        reparsed_bytes=int((chunks.ends - chunks.starts)[parsed_chunks].sum()),
+        compared_points=compared,
+        actual_count=len(actual),
+        elapsed_seconds=time.perf_counter() - start_time,
+        metrics=verifier.metrics,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """command line entry point, non-zero if the output fails verification"""
+
+    arg_parser = argparse.ArgumentParser(
+        description="Re-verify a TraceR output file, re-parsing only what changed "
+        "since the previous run."
+    )
+    arg_parser.add_argument("input_file", type=Path, help="system_input_file.txt")
+    arg_parser.add_argument("output_file", type=Path, help="system_output_file.txt")
+    arg_parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help="delta index of the previous run (default: <output_file>.delta.npz)",
+    )
+    arg_parser.add_argument(
+        "--no-update",
+        action="store_true",
+        help="keep the index of the previous run instead of indexing this one",
+    )
+    add_match_arguments(arg_parser)
+    args = arg_parser.parse_args(argv)
+
+    result = verify_delta(
+        args.input_file,
+        args.output_file,
+        args.index,
+        atol=args.atol,
+        rtol=args.rtol,
+        match_mode=args.match_mode,
+        update_index=not args.no_update,
+    )
+
+    if not result.baseline:
+        print(f"{result.output_file}: no usable delta index, verified in full")
+    else:
+        print(
+            f"{result.output_file}: {result.reparsed_chunks} of {result.chunks} chunks "
+            f"re-parsed ({result.reparsed_bytes / 1024:.1f} KiB), "
+            f"{result.compared_points} of {result.actual_count} points re-compared"
+        )
+        for changed in result.changed:
+            print(
+                f"  points [{changed.start}, {changed.end}) changed, previously "
+                f"[{changed.previous_start}, {changed.previous_end}) "
+                f"(from line {changed.first_line})"
+            )
+    print(f"OVERALL TEST STATUS: {result.overall_status}")
+    for failure in result.failures:
+        print(f"  {failure}")
+
+    return 0 if result.overall_status == "PASS" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
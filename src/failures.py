@@ -0,0 +1,100 @@
+"""Compact failure records of parsed Sentinel point files"""
+
+from array import array
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+
+class FailureLog:
+    """compact failure list of a parsed file
+
+    failures are recorded as (line number, code) pairs in typed arrays,
+    9 bytes each, so a corrupted file with millions of bad lines does not
+    hold millions of messages. only the first `limit` failures keep their
+    detail text. iterating renders their messages plus one line counting
+    the rest, len() is the number of failures recorded.
+    """
+
+    __slots__ = ("limit", "_lines", "_codes", "_details")
+
+    DEFAULT_LIMIT = 100
+
+    # code 0 is a free-form message, the others render from a template
+    MESSAGE, MULTIPLE_COORDINATES, INVALID_FORMAT, INVALID_FLOAT = range(4)
+    _TEMPLATES = (
+        "{detail}",
+        "Multiple coordinates on one line not allowed (line {line})",
+        "Invalid coordinate format at line {line}: '{detail}'",
+        "Could not convert float at line {line}: {detail}",
+    )
+    _KINDS = ("other", "multiple coordinates", "invalid format", "invalid float")
+
+    def __init__(self, limit: int = DEFAULT_LIMIT):
+        self.limit = limit
+        self._lines = array("q")
+        self._codes = array("B")
+        self._details: List[str] = []
+
+    def add(self, code: int, line: int = 0, detail: str = "") -> None:
+        """records a failure, the detail is dropped once the limit is reached"""
+
+        if len(self._details) < self.limit:
+            self._details.append(detail)
+        self._lines.append(line)
+        self._codes.append(code)
+
+    def append(self, message: str) -> None:
+        """records a free-form message, e.g. a missing keyword"""
+
+        self.add(self.MESSAGE, 0, message)
+
+    def records(self) -> Iterator[Tuple[int, int]]:
+        """(line number, code) of every failure, line 0 if not tied to a line"""
+
+        return zip(self._lines, self._codes)
+
+    def messages(self) -> List[str]:
+        """rendered messages of the first `limit` failures and a count of the rest"""
+
+        messages = [
+            self._TEMPLATES[code].format(line=line, detail=detail)
+            for line, code, detail in zip(self._lines, self._codes, self._details)
+        ]
+        hidden = len(self._codes) - len(self._details)
+        if hidden:
+            counts = np.bincount(
+                np.frombuffer(self._codes, dtype=np.uint8)[len(self._details) :],
+                minlength=len(self._KINDS),
+            )
+            kinds = ", ".join(
+                f"{count} {kind}"
+                for kind, count in zip(self._KINDS, counts.tolist())
+                if count
+            )
+            messages.append(f"{hidden} more failures not shown ({kinds}).")
+
+        return messages
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.messages())
+
+    def __getitem__(self, index: int) -> str:
+        return self.messages()[index]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (FailureLog, list)):
+            return NotImplemented
+        return self.messages() == list(other)
+
+    def __add__(self, other: Iterable[str]) -> List[str]:
+        return self.messages() + list(other)
+
+    def __radd__(self, other: Iterable[str]) -> List[str]:
+        return list(other) + self.messages()
+
+    def __repr__(self) -> str:
+        return f"FailureLog({self.messages()!r})"
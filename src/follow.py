@@ -0,0 +1,324 @@
+"""Live follow mode: verify TraceR output while it is still being written
+
+the output file is tailed as it grows and every new point is verified in
+lockstep against the expected path. the first out-of-sequence or
+out-of-bounds point is reported as soon as its line has been read, along
+with the time that took.
+
+usage: python -m src.follow SCENARIO_DIR [--poll SECONDS] [--idle-timeout SECONDS]
+                            [--settle SECONDS] [--atol ATOL] [--rtol RTOL]
+                            [--keep-going]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from math import isnan
+from pathlib import Path
+from typing import Callable, Dict, Generator, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.core import CoordinateParser, TracerSentinel, WorkArea
+
+# once every expected point has been read, following ends after the output
+# file has been idle this long (the arm is done unless it writes more)
+DEFAULT_SETTLE_SECONDS = 1.0
+
+
+class LineFollower:  # pylint: disable=too-few-public-methods
+    """yields the complete lines appended to a file, like tail -f
+
+    lines are yielded with the perf_counter time they were read. a partial
+    last line is held back until its newline arrives, until is_complete
+    accepts it while the file is idle, or until the file has been idle for
+    idle_timeout seconds, which ends the iteration. the idle timeout may be
+    changed while following. the file does not need to exist
+    yet. truncated or rotated files are not handled.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        poll_interval: float = 0.01,
+        idle_timeout: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None,
+        is_complete: Optional[Callable[[str], bool]] = None,
+    ):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.stop_event = stop_event or threading.Event()
+        self.is_complete = is_complete
+
+    def _wait(self, idle_since: float) -> bool:
+        """sleeps one poll interval, False once following should end"""
+
+        if self.idle_timeout is not None and (
+            time.perf_counter() - idle_since >= self.idle_timeout
+        ):
+            return False
+        return not self.stop_event.wait(self.poll_interval)
+
+    def __iter__(self) -> Iterator[Tuple[str, float]]:
+        idle_since = time.perf_counter()
+        while not self.path.exists():
+            if not self._wait(idle_since):
+                return
+
+        partial = ""
+        with open(self.path, "r", encoding="utf-8") as f:
+            while True:
+                line = f.readline()
+                if line:
+                    idle_since = time.perf_counter()
+                    if line.endswith("\n"):
+                        yield partial + line, idle_since
+                        partial = ""
+                    else:
+                        partial += line
+                elif partial and self.is_complete and self.is_complete(partial):
+                    # e.g. the last line of a file without a final newline
+                    yield partial, time.perf_counter()
+                    partial = ""
+                elif not self._wait(idle_since):
+                    break
+
+        if partial:
+            yield partial, time.perf_counter()
+
+
+@dataclass
+class FollowEvent:
+    """an alarm raised while following, e.g. to stop the arm"""
+
+    kind: str  # "sequence" or "bounds"
+    position: int
+    expected: Optional[Tuple[float, float]]
+    actual: Optional[Tuple[float, float]]
+    latency_seconds: float  # from reading the line to raising the alarm
+
+    def describe(self) -> str:
+        """one line description of the alarm"""
+
+        what = (
+            "is outside the work area"
+            if self.kind == "bounds"
+            else f"does not match expected point {self.expected}"
+        )
+        return (
+            f"{self.kind.upper()} ALARM at index {self.position}: actual point "
+            f"{self.actual} {what} ({self.latency_seconds * 1000:.3f} ms after read)"
+        )
+
+
+@dataclass
+class FollowResult:
+    """outcome of following one scenario"""
+
+    overall_status: str
+    failures: List[str]
+    alarms: List[FollowEvent] = field(default_factory=list)
+    latencies: array = field(default_factory=lambda: array("d"))
+    stopped_early: bool = False
+
+    def latency_summary(self) -> Dict[str, float]:
+        """per-point read-to-verdict latency statistics in milliseconds"""
+
+        if not self.latencies:
+            return {}
+        latencies_ms = np.frombuffer(self.latencies, dtype=np.float64) * 1000
+        return {
+            "points": float(len(latencies_ms)),
+            "mean_ms": float(latencies_ms.mean()),
+            "p50_ms": float(np.percentile(latencies_ms, 50)),
+            "p99_ms": float(np.percentile(latencies_ms, 99)),
+            "max_ms": float(latencies_ms.max()),
+        }
+
+
+def follow_scenario(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    scenario_path: Path,
+    poll_interval: float = 0.01,
+    idle_timeout: Optional[float] = None,
+    atol: float = 0.0,
+    rtol: float = 0.0,
+    stop_on_alarm: bool = True,
+    on_alarm: Optional[Callable[[FollowEvent], None]] = None,
+    stop_event: Optional[threading.Event] = None,
+    settle_timeout: float = DEFAULT_SETTLE_SECONDS,
+) -> FollowResult:
+    """verifies a scenario's output file while it grows
+
+    the input file must be complete. following ends when the output file
+    has been idle for idle_timeout seconds (settle_timeout once every
+    expected point has been read), when stop_event is set, or at the first
+    alarm if stop_on_alarm. when followed to the end, the failures
+    include those of a normal run over the output written so far. unlike a
+    normal run, points are still verified after a malformed output line, and
+    every actual point outside the work area adds a bounds failure.
+    """
+
+    parser = CoordinateParser(
+        input_file=scenario_path / "system_input_file.txt",
+        output_file=scenario_path / "system_output_file.txt",
+    )
+    rectangle_coords, expected_iter, _ = parser.stream_parsed_data()
+    expected_points = list(expected_iter)
+    if parser.rectangle_failures or parser.expected_points_failures:
+        return FollowResult(
+            "FAIL", parser.rectangle_failures + parser.expected_points_failures
+        )
+
+    work_area = WorkArea(rectangle_coords, expected_points)
+    stop_event = stop_event or threading.Event()
+    read_times: deque = deque()
+
+    def actual_points() -> Generator[Tuple[float, float], None, None]:
+        follower = LineFollower(
+            parser.output_file,
+            poll_interval,
+            idle_timeout,
+            stop_event,
+            # a point line is complete once its closing parenthesis is written
+            is_complete=lambda line: line.rstrip().endswith(")"),
+        )
+        settled = (
+            settle_timeout
+            if idle_timeout is None
+            else min(idle_timeout, settle_timeout)
+        )
+        if not expected_points:
+            follower.idle_timeout = settled
+        for line_number, (line, read_at) in enumerate(follower, 1):
+            point = parser._parse_point_line(  # pylint: disable=protected-access
+                line, parser.actual_points_failures, line_number
+            )
+            if point is not None:
+                read_times.append(read_at)
+                if len(result.latencies) + len(read_times) == len(expected_points):
+                    # every expected point has its verdict once this one is checked
+                    follower.idle_timeout = settled
+                yield point
+
+    result = FollowResult("PASS", [])
+    actual_iter = actual_points()
+    verifier = TracerSentinel(work_area, actual_iter, atol=atol, rtol=rtol)
+    for verdict in verifier.iter_verification():
+        if verdict.actual is None:
+            # the output ended, the remaining expected points are missing
+            continue
+
+        latency = time.perf_counter() - read_times.popleft()
+        result.latencies.append(latency)
+
+        kind = None
+        if not isnan(verdict.actual[0]) and not work_area.point_in_bounds(
+            verdict.actual
+        ):
+            kind = "bounds"
+        elif verdict.status == "FAIL":
+            kind = "sequence"
+        if kind is None:
+            continue
+
+        event = FollowEvent(
+            kind, verdict.position, verdict.expected, verdict.actual, latency
+        )
+        result.alarms.append(event)
+        if on_alarm is not None:
+            on_alarm(event)
+        if stop_on_alarm:
+            stop_event.set()
+            result.stopped_early = True
+            break
+    # closes the output file when following stopped early
+    actual_iter.close()
+
+    result.failures = (
+        parser.actual_points_failures
+        + verifier.failures
+        + [f"Bounds FAIL: {a.describe()}" for a in result.alarms if a.kind == "bounds"]
+    )
+    if result.stopped_early and result.alarms[0].kind == "sequence":
+        result.failures.append(
+            "Sequence FAIL: Following stopped at the first divergence "
+            f"(index {result.alarms[0].position})."
+        )
+    result.overall_status = "FAIL" if result.failures else "PASS"
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """command line entry point, returns non-zero on any failure"""
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("scenario", type=Path, help="scenario folder to follow")
+    arg_parser.add_argument(
+        "--poll", type=float, default=0.01, help="seconds between file checks"
+    )
+    arg_parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="stop once the output file has not grown for this many seconds",
+    )
+    arg_parser.add_argument(
+        "--settle",
+        type=float,
+        default=DEFAULT_SETTLE_SECONDS,
+        help="once every expected point was read, stop after this many idle seconds",
+    )
+    arg_parser.add_argument("--atol", type=float, default=0.0)
+    arg_parser.add_argument("--rtol", type=float, default=0.0)
+    arg_parser.add_argument(
+        "--keep-going", action="store_true", help="do not stop at the first alarm"
+    )
+    args = arg_parser.parse_args(argv)
+
+    # followed on a worker thread, so Ctrl-C stops following and the
+    # verdict of the output read so far is still printed
+    stop_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(
+        follow_scenario,
+        args.scenario,
+        poll_interval=args.poll,
+        idle_timeout=args.idle_timeout,
+        atol=args.atol,
+        rtol=args.rtol,
+        stop_on_alarm=not args.keep_going,
+        on_alarm=lambda event: print(event.describe(), flush=True),
+        stop_event=stop_event,
+        settle_timeout=args.settle,
+    )
+    try:
+        result = future.result()
+    except KeyboardInterrupt:
+        stop_event.set()
+        print("Interrupted, stopped following", flush=True)
+        result = future.result()
+    finally:
+        executor.shutdown()
+
+    print(f"OVERALL TEST STATUS: {result.overall_status}")
+    for failure in result.failures:
+        print(f"  {failure}")
+    latency = result.latency_summary()
+    if latency:
+        print(
+            f"latency over {latency['points']:.0f} points: mean {latency['mean_ms']:.3f} ms, "
+            f"p50 {latency['p50_ms']:.3f} ms, p99 {latency['p99_ms']:.3f} ms, "
+            f"max {latency['max_ms']:.3f} ms"
+        )
+
+    return 1 if result.overall_status == "FAIL" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Seeded synthetic scenario generator for Sentinel
+
+writes system_input_file.txt/system_output_file.txt pairs of any size, either
+valid or with one deliberate defect, e.g. for benchmarks or fuzzing. the same
+seed always produces the same files.
+
+usage: python -m src.generator OUT_DIR [--points N] [--seed S] [--defect DEFECT]
+                               [--rotated]
+"""
+
+import argparse
+import math
+import sys
+from pathlib import Path
+from typing import IO, List, Optional, Tuple
+
+import numpy as np
+
+from src.points import PointArray
+
+# defects a generated scenario can carry, "none" gives a passing scenario
+DEFECTS = (
+    "none",
+    "mismatch",
+    "outside",
+    "invalid_coordinate",
+    "missing_keyword",
+    "extra_actual",
+    "missing_actual",
+)
+
+# points are generated and written in chunks so memory stays bounded
+_CHUNK_SIZE = 1_000_000
+
+# keeps rounded points clear of the work area boundary
+_MARGIN = 0.01
+
+_POINT_FORMAT = "(%.2f, %.2f)"
+
+
+def _work_area(
+    rng: np.random.Generator, rotated: bool
+) -> Tuple[PointArray, PointArray, PointArray]:
+    """random work area as (corners, origin, edge vectors) of a rectangle"""
+
+    origin = rng.uniform(0.0, 100.0, size=2).round(2)
+    width, height = rng.uniform(5.0, 50.0, size=2).round(2)
+    angle = rng.uniform(0.1, math.pi / 2 - 0.1) if rotated else 0.0
+    u = np.array([math.cos(angle), math.sin(angle)]) * width
+    v = np.array([-math.sin(angle), math.cos(angle)]) * height
+    if rotated:
+        # keep every corner at non-negative coordinates
+        origin = origin + np.array([height, 0.0])
+
+    corners = np.array([origin, origin + u, origin + u + v, origin + v]).round(2)
+    return corners, origin, np.array([u, v])
+
+
+def _points_inside(
+    rng: np.random.Generator, count: int, origin: PointArray, edges: PointArray
+) -> PointArray:
+    """uniform random points inside the work area"""
+
+    local = rng.uniform(_MARGIN, 1.0 - _MARGIN, size=(count, 2))
+    return (origin + local @ edges).round(2)
+
+
+def _write_points(f: IO[str], points: PointArray) -> None:
+    """writes one '(x, y)' line per point"""
+
+    # about twice as fast as np.savetxt
+    f.writelines(f"{_POINT_FORMAT % tuple(point)}\n" for point in points.tolist())
+
+
+def _defect_lines(
+    defect: str, point: PointArray, corners: PointArray
+) -> Tuple[List[str], List[str]]:
+    """(expected, actual) lines replacing one point of a defective scenario"""
+
+    line = _POINT_FORMAT % tuple(point)
+    if defect == "mismatch":
+        shifted = _POINT_FORMAT % (point[0], point[1] + 0.01)
+        return [line], [shifted]
+    if defect == "outside":
+        # beyond the top-right corner of the bounding box, on both sides
+        outside = _POINT_FORMAT % tuple(corners.max(axis=0) + 1.0)
+        return [outside], [outside]
+    if defect == "invalid_coordinate":
+        return [line], [f"({point[0]:.2f}, y)"]
+    if defect == "extra_actual":
+        return [line], [line, line]
+    if defect == "missing_actual":
+        return [line], []
+    return [line], [line]
+
+
+def scenario_name(
+    num_points: int, seed: int, defect: str = "none", rotated: bool = False
+) -> str:
+    """scenario folder name, prefixed with the outcome the runner expects"""
+
+    shape = "_rotated" if rotated else ""
+    if defect == "none":
+        return f"pass_synthetic{shape}_{num_points}_seed{seed}"
+    return f"fail_synthetic{shape}_{defect}_{num_points}_seed{seed}"
+
+
+def generate_scenario(  # pylint: disable=too-many-locals
+    scenario_path: Path,
+    num_points: int,
+    seed: int = 0,
+    defect: str = "none",
+    rotated: bool = False,
+) -> Path:
+    """writes a synthetic scenario into scenario_path and returns it
+
+    a defect other than "none" is placed at one seeded random point.
+    """
+
+    if defect not in DEFECTS:
+        raise ValueError(f"Unknown defect '{defect}', expected one of {DEFECTS}")
+    if num_points < 1:
+        raise ValueError("A scenario needs at least one point")
+
+    rng = np.random.default_rng(seed)
+    corners, origin, edges = _work_area(rng, rotated)
+    defect_index = int(rng.integers(num_points)) if defect != "none" else -1
+    keyword = "Puints:" if defect == "missing_keyword" else "Points:"
+
+    scenario_path.mkdir(parents=True, exist_ok=True)
+    input_file = scenario_path / "system_input_file.txt"
+    output_file = scenario_path / "system_output_file.txt"
+    with open(input_file, "w", encoding="utf-8") as expected_f, open(
+        output_file, "w", encoding="utf-8"
+    ) as actual_f:
+        expected_f.write("Rectangle:\n")
+        expected_f.write(", ".join(_POINT_FORMAT % tuple(c) for c in corners) + "\n")
+        expected_f.write(f"{keyword}\n")
+
+        for start in range(0, num_points, _CHUNK_SIZE):
+            points = _points_inside(
+                rng, min(_CHUNK_SIZE, num_points - start), origin, edges
+            )
+            offset = defect_index - start
+            if not 0 <= offset < len(points):
+                _write_points(expected_f, points)
+                _write_points(actual_f, points)
+                continue
+
+            expected_lines, actual_lines = _defect_lines(
+                defect, points[offset], corners
+            )
+            _write_points(expected_f, points[:offset])
+            _write_points(actual_f, points[:offset])
+            expected_f.writelines(f"{line}\n" for line in expected_lines)
+            actual_f.writelines(f"{line}\n" for line in actual_lines)
+            _write_points(expected_f, points[offset + 1 :])
+            _write_points(actual_f, points[offset + 1 :])
+
+    return scenario_path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """command line entry point"""
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument(
+        "out_dir", type=Path, help="scenario folder is created here"
+    )
+    arg_parser.add_argument("--points", type=int, default=1000)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--defect", choices=DEFECTS, default="none")
+    arg_parser.add_argument(
+        "--rotated", action="store_true", help="rotate the work area"
+    )
+    args = arg_parser.parse_args(argv)
+
+    scenario_path = generate_scenario(
+        args.out_dir / scenario_name(args.points, args.seed, args.defect, args.rotated),
+        args.points,
+        args.seed,
+        args.defect,
+        args.rotated,
+    )
+    print(scenario_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,303 +1,402 @@
-import re
-from dataclasses import dataclass
+"""Sentinel report writing and plotting
+
+matplotlib is only imported once a plot is rendered. the verification core
+is re-exported from src.core for existing callers.
+"""
+
+import shutil
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from math import isnan
 from pathlib import Path
-from typing import List, Tuple
-
-import matplotlib.pyplot as plt
-from matplotlib.lines import Line2D
-
-
-class CoordinateParser:
-    """read and parse coordinates input/output files."""
-
-    def __init__(self, input_file: Path, output_file: Path):
-        self.input_file = input_file
-        self.output_file = output_file
-        self.rectangle_failures: List[str] = []
-        self.expected_points_failures: List[str] = []
-        self.actual_points_failures: List[str] = []
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from src.core import (
+    CoordinateParser,
+    FailureLog,
+    PointVerdict,
+    ResultsBucket,
+    TracerSentinel,
+    WorkArea,
+    iter_point_verdicts,
+)
+from src.history import HistoryEntry, RunHistory
+from src.instrumentation import StageRecord
+from src.metrics import PathMetrics
+from src.points import (
+    PointArray,
+    PointGridIndex,
+    as_point_array,
+    compare_point_arrays,
+    match_visited,
+    order_convex_quadrilateral,
+    point_comparison,
+)
+
+__all__ = [
+    "CoordinateParser",
+    "FailureLog",
+    "PathMetrics",
+    "PlotRenderQueue",
+    "PointArray",
+    "PointGridIndex",
+    "PointVerdict",
+    "ResultsBucket",
+    "ResultsWriter",
+    "TracerSentinel",
+    "WorkArea",
+    "as_point_array",
+    "compare_point_arrays",
+    "iter_point_verdicts",
+    "order_convex_quadrilateral",
+]
+
+# layout of the reports (test_results.txt, point tables, stages sidecar).
+# cached results are keyed on it: bump it whenever what is written changes,
+# so reruns regenerate reports instead of serving them in the old layout.
+REPORT_FORMAT_VERSION = 1
+
+
+class ResultsWriter:  # pylint: disable=too-many-instance-attributes
+    """handles writing test results to file"""
 
-    # compiled regex for rectangle parsing (class-level for efficiency)
-    _RECTANGLE_REGEX = re.compile(
-        r"^\s*\(\s*(?P<x1>[+\-]?\d+(?:\.\d+)?)\s*,\s*(?P<y1>[+\-]?\d+(?:\.\d+)?)\s*\)\s*,\s*"
-        r"\(\s*(?P<x2>[+\-]?\d+(?:\.\d+)?)\s*,\s*(?P<y2>[+\-]?\d+(?:\.\d+)?)\s*\)\s*,\s*"
-        r"\(\s*(?P<x3>[+\-]?\d+(?:\.\d+)?)\s*,\s*(?P<y3>[+\-]?\d+(?:\.\d+)?)\s*\)\s*,\s*"
-        r"\(\s*(?P<x4>[+\-]?\d+(?:\.\d+)?)\s*,\s*(?P<y4>[+\-]?\d+(?:\.\d+)?)\s*\)\s*$"
-    )
+    # point tables larger than this spill from memory to a temporary file
+    _SPOOL_MAX_SIZE = 8 * 1024 * 1024
 
-    def _parse_rectangle(self, data) -> List[Tuple[float, float]]:
-        """parse coordinates after the Rectangle keyword"""
+    # larger traces are downsampled before plotting
+    _MAX_SCATTER_POINTS = 20_000
 
-        if data is None:
-            self.rectangle_failures.append("No 'Rectangle:' keyword found.")
-            return []
-        data_str = data.group(1).strip()
+    # comparison rows are formatted in batches, each written with one call
+    _WRITE_BATCH_ROWS = 65_536
+    _ROW_FORMAT = "%-20s %-20s %-10s\n"
+    _WRITE_BUFFER_SIZE = 1024 * 1024
 
-        if not data_str:
-            self.rectangle_failures.append(
-                "No coordinates found between Rectangle and Points keywords."
-            )
-            return []
+    # machine-readable point tables written next to the human report
+    REPORT_FORMATS = ("csv", "jsonl")
 
-        if "\n" in data_str:
-            self.rectangle_failures.append(
-                "Rectangle coordinates must be on a single line."
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        scenario_path: Path,
+        rectangle_coords: Union[PointArray, List[Tuple[float, float]]],
+        atol: float = 0.0,
+        rtol: float = 0.0,
+        report_format: Optional[str] = None,
+        max_divergences: Optional[int] = None,
+        match_mode: str = "sequence",
+    ):
+        """initialize the writer with a scenario path
+
+        atol, rtol and match_mode are the point matching settings of the
+        verifier, used for the assessments. in "visited" mode the comparison
+        has one row per expected point, with the nearest actual point that
+        visited it ('-' if none).
+        report_format adds a full csv/jsonl point table (test_results.<format>),
+        max_divergences limits the human table to the first K failing rows.
+        """
+
+        if report_format is not None and report_format not in self.REPORT_FORMATS:
+            raise ValueError(
+                f"Unknown report format '{report_format}', "
+                f"expected one of {self.REPORT_FORMATS}"
             )
-            return []
-
-        match = self._RECTANGLE_REGEX.match(data_str)
-        if not match:
-            self.rectangle_failures.append("Work area is not valid/quadrilateral")
-            return []
-
-        # extract all 4 coordinates in one pass
-        try:
-            points = [
-                (float(match.group(f"x{i}")), float(match.group(f"y{i}")))
-                for i in range(1, 5)
-            ]
-        except (ValueError, AttributeError) as e:
-            self.rectangle_failures.append(
-                f"Could not convert coordinates to float in rectangle data '{data_str}': {e}"
+        if max_divergences is not None and max_divergences < 0:
+            raise ValueError("max_divergences must not be negative")
+        if match_mode not in TracerSentinel.MATCH_MODES:
+            raise ValueError(
+                f"Unknown match mode '{match_mode}', "
+                f"expected one of {TracerSentinel.MATCH_MODES}"
             )
-            return []
-
-        return points
-
-    def _parse_points(
-        self, data, is_expected: bool = True
-    ) -> List[Tuple[float, float]]:
-        """parse points from a raw string or regex match (for output file)"""
 
-        # select the appropriate failures dictionary
-        failures_dict = (
-            self.expected_points_failures
-            if is_expected
-            else self.actual_points_failures
+        self.scenario_path = scenario_path
+        self.rectangle_coords = rectangle_coords
+        self.atol = atol
+        self.rtol = rtol
+        self.report_format = report_format
+        self.max_divergences = max_divergences
+        self.match_mode = match_mode
+        self.output_file = scenario_path / "test_results.txt"
+        self.table_file = (
+            scenario_path / f"test_results.{report_format}" if report_format else None
         )
+        # stage timings sidecar and cProfile dump, written by the runner
+        self.stages_file = scenario_path / "test_results.stages.json"
+        self.profile_file = scenario_path / "test_results.prof"
 
-        # handle both re.Match object and string
-        if data is None or (isinstance(data, re.Match) and data is None):
-            failures_dict.append("No 'Points:' keyword found.")
-            return []
-        if isinstance(data, re.Match):
-            data = data.group(1).strip()
-        elif isinstance(data, str):
-            data = data.strip()
-        else:
-            failures_dict.append("Data cannot be parsed")
-            return []
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.plot_file = scenario_path / f"test_results_{timestamp}.png"
 
-        # regex to match a single coordinate (x, y)
-        single_coord_regex = re.compile(
-            r"^\s*\(\s*(?P<x>[+\-]?\d+(?:\.\d+)?)\s*,\s*(?P<y>[+\-]?\d+(?:\.\d+)?)\s*\)\s*$"
+    @staticmethod
+    def _format_point(point: Optional[Tuple[float, float]]) -> str:
+        """format a point, converting missing entries to '-' and NaN tuples to 'INVALID'"""
+
+        if point is None:
+            return "-"
+        if isnan(point[0]) or isnan(point[1]):
+            return "INVALID"
+        return str(point)
+
+    @classmethod
+    def _write_comparison_rows(cls, f: IO[str], verdicts: Iterable[PointVerdict]):
+        """write one point-by-point comparison row per verdict, in batches"""
+
+        rows = (
+            cls._ROW_FORMAT
+            % (
+                cls._format_point(verdict.expected),
+                cls._format_point(verdict.actual),
+                verdict.status,
+            )
+            for verdict in verdicts
         )
-
-        points = []
-        for line in data.split("\n"):
-            line = line.strip()
-
-            # skip empty lines
-            if not line:
-                continue
-
-            # check for multiple coordinates on one line
-            if line.count("(") != 1:
-                failures_dict.append("Multiple coordinates on one line not allowed")
-                continue
-
-            single_match = single_coord_regex.match(line)
-            if single_match:
-                try:
-                    x = float(single_match.group("x"))
-                    y = float(single_match.group("y"))
-                    points.append((x, y))
-                except (ValueError, AttributeError) as e:
-                    failures_dict.append(
-                        f"Could not convert float: '{single_match.group(0)}' - {e}"
-                    )
-                    points.append((float("nan"), float("nan")))  # invalid entry marker
-                    continue
-            else:
-                failures_dict.append(f"Invalid coordinate format: '{line}'")
-                points.append((float("nan"), float("nan")))  # invalid entry marker
-                continue
-
-        return points
-
-    def _parse_input(
-        self, content: str
-    ) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
-        """reads the input file and returns workarea points and expected points"""
-
-        workarea_points: List[Tuple[float, float]] = []
-        expected_points: List[Tuple[float, float]] = []
-
-        # extract workarea_points (between Rectangle and Points)
-        rect_match = re.search(r"Rectangle:\s*([\s\S]*?)(?=Points:|\Z)", content)
-        workarea_points = self._parse_rectangle(rect_match)
-
-        # extract expected_points (after Points)
-        # note: if the Points keyword is not found or invalid,
-        # the coordinates will be considered part of the Rectangle section
-        # which then fails the multiple line check in _parse_rectangle
-        points_match = re.search(r"Points:\s*([\s\S]*)", content)
-        expected_points = self._parse_points(points_match, is_expected=True)
-
-        return workarea_points, expected_points
-
-    def _parse_output(self, content: str) -> List[Tuple[float, float]]:
-        """reads the actual visited points from the output file"""
-
-        # no keywords, only points and potential errors/invalid entries
-        return self._parse_points(content, is_expected=False)
-
-    def get_parsed_data(
+        for batch in iter(lambda: list(islice(rows, cls._WRITE_BATCH_ROWS)), []):
+            f.write("".join(batch))
+
+    @staticmethod
+    def _format_point_array(  # pylint: disable=too-many-arguments
+        points: PointArray,
+        length: int,
+        point_format: str = "(%r, %r)",
+        invalid: str = "INVALID",
+        missing: str = "-",
+    ) -> List[str]:
+        """format point rows, padded with '-' up to length and NaN rows as 'INVALID'
+
+        the default point format matches str() of a coordinate tuple.
+        """
+
+        formatted = [
+            invalid if isnan(x) or isnan(y) else point_format % (x, y)
+            for x, y in points.tolist()
+        ]
+        formatted.extend([missing] * (length - len(formatted)))
+        return formatted
+
+    def _format_actual_array(
         self,
-    ) -> Tuple[
-        List[Tuple[float, float]], List[Tuple[float, float]], List[Tuple[float, float]]
-    ]:
-        """reads and parses all necessary data from both files"""
-
-        rectangle_coords: List[Tuple[float, float]] = []
-        expected_points: List[Tuple[float, float]] = []
-        actual_points: List[Tuple[float, float]] = []
-
-        try:
-            with open(self.input_file, "r", encoding="utf-8") as f:
-                input_content = f.read()
-            rectangle_coords, expected_points = self._parse_input(input_content)
-        except FileNotFoundError as e:
-            self.rectangle_failures.append(f"File not found: {e.filename}")
-
-        try:
-            with open(self.output_file, "r", encoding="utf-8") as f:
-                output_content = f.read()
-            actual_points = self._parse_output(output_content)
-        except FileNotFoundError as e:
-            self.actual_points_failures.append(f"File not found: {e.filename}")
-
-        return rectangle_coords, expected_points, actual_points
-
-    def get_failures(self) -> Tuple[List[str], List[str], List[str]]:
-        """returns 3 lists of failures: rectangle, expected points, and actual points"""
-
-        return (
-            self.rectangle_failures,
-            self.expected_points_failures,
-            self.actual_points_failures,
-        )
-
-
-class WorkArea:  # pylint: disable=too-few-public-methods
-    """models the robot arm's work environment and expected path"""
-
-    def __init__(
+        points: PointArray,
+        length: int,
+        point_format: str = "(%r, %r)",
+        invalid: str = "INVALID",
+        missing: str = "-",
+    ) -> List[str]:
+        """format actual point rows like _format_point_array
+
+        in "visited" mode the NaN rows stand for unvisited expected points
+        (invalid points never visit one), so they are formatted as missing.
+        """
+
+        if self.match_mode == "visited":
+            invalid = missing
+        return self._format_point_array(points, length, point_format, invalid, missing)
+
+    def _iter_row_batches(
+        self, passed: npt.NDArray, expected: PointArray, actual: PointArray
+    ) -> Iterator[Tuple[int, npt.NDArray, PointArray, PointArray]]:
+        """(first row, assessments, expected, actual) slices of at most a batch"""
+
+        for start in range(0, len(passed), self._WRITE_BATCH_ROWS):
+            stop = start + self._WRITE_BATCH_ROWS
+            yield start, passed[start:stop], expected[start:stop], actual[start:stop]
+
+    def _write_comparison_arrays(
         self,
-        rectangle_coords: List[Tuple[float, float]],
-        expected_points: List[Tuple[float, float]],
+        f: IO[str],
+        passed: npt.NDArray,
+        expected: PointArray,
+        actual: PointArray,
     ):
+        """write the point-by-point comparison rows from point arrays"""
+
+        for _, batch, expected_batch, actual_batch in self._iter_row_batches(
+            passed, expected, actual
+        ):
+            rows = zip(
+                self._format_point_array(expected_batch, len(batch)),
+                self._format_actual_array(actual_batch, len(batch)),
+                np.where(batch, "PASS", "FAIL").tolist(),
+            )
+            f.write("".join(map(self._ROW_FORMAT.__mod__, rows)))
 
-        # determine the work area bounding box (x_min, y_min, x_max, y_max)
-        x_coords = [p[0] for p in rectangle_coords]
-        y_coords = [p[1] for p in rectangle_coords]
-        self.x_min, self.x_max = min(x_coords), max(x_coords)
-        self.y_min, self.y_max = min(y_coords), max(y_coords)
-
-        self.bounding_box = (self.x_min, self.y_min, self.x_max, self.y_max)
-        self.expected_sequence = expected_points
-
-    def point_in_bounds(self, point: Tuple[float, float]) -> bool:
-        """checks if a point is within the closed rectangle work area (including boundary)"""
-
-        x, y = point
-        x_min, y_min, x_max, y_max = self.bounding_box
-
-        # assumes the rectangle is axis-aligned
-        return (x_min <= x <= x_max) and (y_min <= y <= y_max)
-
+    def _write_divergences(
+        self,
+        f: IO[str],
+        passed: npt.NDArray,
+        expected: PointArray,
+        actual: PointArray,
+    ):
+        """write a table of only the first max_divergences failing rows and counts"""
 
-class TracerSentinel:  # pylint: disable=too-few-public-methods
-    """performs strict sequence and geometric validation"""
+        diverged = np.flatnonzero(~passed)
+        shown = diverged[: self.max_divergences]
 
-    def __init__(self, work_area: WorkArea, actual_points: List[Tuple[float, float]]):
+        f.write(
+            f"POINT-BY-POINT COMPARISON (first {self.max_divergences} divergences):\n"
+        )
+        f.write("-" * 70 + "\n")
+        f.write(
+            f"{'Row':<10} {'Expected Points':<20} {'Actual Points':<20} "
+            f"{'Assessment':<10}\n"
+        )
+        f.write("-" * 66 + "\n")
+
+        # row indices are ascending, so the missing rows come last
+        rows = zip(
+            shown.tolist(),
+            self._format_point_array(
+                expected[shown[shown < len(expected)]], len(shown)
+            ),
+            self._format_actual_array(actual[shown[shown < len(actual)]], len(shown)),
+        )
+        f.write(
+            "".join(
+                f"{row:<10} {expected_str:<20} {actual_str:<20} {'FAIL':<10}\n"
+                for row, expected_str, actual_str in rows
+            )
+        )
+        f.write("-" * 66 + "\n")
+        f.write(
+            f"Showing {len(shown)} of {len(diverged)} divergent rows. "
+            f"{len(passed)} rows compared: {len(passed) - len(diverged)} PASS, "
+            f"{len(diverged)} FAIL.\n"
+        )
 
-        self.work_area = work_area
-        self.actual_sequence = actual_points
-        self.failures: List[str] = []
+    def _write_point_table(
+        self, passed: npt.NDArray, expected: PointArray, actual: PointArray
+    ):
+        """write the full comparison as a csv or jsonl table, in batches"""
 
-    def _check_geometric_validity(self):
-        """all actual points must be within the work area bounds"""
+        assert self.table_file is not None and self.report_format is not None
+        csv = self.report_format == "csv"
+        point_format, invalid, missing = (
+            ("%r,%r", "nan,nan", ",") if csv else ("[%r, %r]", '"INVALID"', "null")
+        )
 
-        # check if expected points are within bounds
-        for point in self.work_area.expected_sequence:
-            if not self.work_area.point_in_bounds(point):
-                self.failures.append(
-                    f"Geometric FAIL: Expected point ({point}) is outside the closed work area."
+        with open(
+            self.table_file, "w", encoding="utf-8", buffering=self._WRITE_BUFFER_SIZE
+        ) as f:
+            if csv:
+                f.write("row,expected_x,expected_y,actual_x,actual_y,assessment\n")
+
+            for start, batch, expected_batch, actual_batch in self._iter_row_batches(
+                passed, expected, actual
+            ):
+                rows = zip(
+                    range(start, start + len(batch)),
+                    self._format_point_array(
+                        expected_batch, len(batch), point_format, invalid, missing
+                    ),
+                    self._format_actual_array(
+                        actual_batch, len(batch), point_format, invalid, missing
+                    ),
+                    np.where(batch, "PASS", "FAIL").tolist(),
                 )
+                row_format = (
+                    "%d,%s,%s,%s\n"
+                    if csv
+                    else '{"row": %d, "expected": %s, "actual": %s, "assessment": "%s"}\n'
+                )
+                f.write("".join(map(row_format.__mod__, rows)))
 
-    def _check_sequence_sameness(self):
-        """actual sequence must match expected sequence exactly"""
+    @classmethod
+    def spool_comparison(cls, verdicts: Iterable[PointVerdict]) -> IO[str]:
+        """consume verdicts into a spooled point-by-point table
 
-        expected = self.work_area.expected_sequence
-        actual = self.actual_sequence
+        this lets a single streaming pass write the table before the overall
+        status (needed for the report header) is known.
+        """
 
-        if len(expected) != len(actual):
-            self.failures.append(
-                f"Sequence FAIL: Length mismatch. Expected {len(expected)} versus {len(actual)}"
-            )
-        elif expected != actual:
-            self.failures.append(
-                "Sequence FAIL: Sequence mismatch between expected and actual points."
+        spool = tempfile.SpooledTemporaryFile(  # pylint: disable=consider-using-with
+            max_size=cls._SPOOL_MAX_SIZE, mode="w+", encoding="utf-8"
+        )
+        cls._write_comparison_rows(spool, verdicts)  # type: ignore[arg-type]
+        return spool  # type: ignore[return-value]
+
+    @staticmethod
+    def _write_path_metrics(f: IO[str], metrics: PathMetrics):
+        """write the deviation, path length, outside and dwell figures"""
+
+        f.write("PATH METRICS:\n")
+        f.write("-" * 70 + "\n")
+        for label, value in (
+            ("Compared points", metrics.compared_points),
+            ("Deviation max", metrics.deviation_max),
+            ("Deviation mean", metrics.deviation_mean),
+            ("Deviation p99", metrics.deviation_p99),
+            ("Expected path length", metrics.expected_path_length),
+            ("Actual path length", metrics.actual_path_length),
+            ("Actual points outside", metrics.actual_points_outside),
+            ("Actual dwell points", metrics.actual_dwell_points),
+        ):
+            f.write(f"  {label:<24} {value:.6g}\n")
+        f.write("\n")
+
+    @staticmethod
+    def _write_stage_timings(f: IO[str], stages: List[StageRecord]):
+        """write the time, point and failure counts of the stages run so far"""
+
+        f.write("STAGE TIMINGS:\n")
+        f.write("-" * 70 + "\n")
+        f.write(f"  {'Stage':<16} {'Time (s)':>10} {'Points':>10} {'Failures':>10}\n")
+        for record in stages:
+            peak = "" if record.peak_mib is None else f"   peak {record.peak_mib} MiB"
+            f.write(
+                f"  {record.name:<16} {record.seconds:>10.4f} "
+                f"{record.points:>10} {record.failures:>10}{peak}\n"
             )
+        f.write("\n")
+
+    @staticmethod
+    def _write_comparison_header(f: IO[str]):
+        """write the title and column headers of the full comparison table"""
+
+        f.write("POINT-BY-POINT COMPARISON:\n")
+        f.write("-" * 70 + "\n")
+        f.write(f"{'Expected Points':<20} {'Actual Points':<20} {'Assessment':<10}\n")
+        f.write("-" * 55 + "\n")
+
+    def _write_point_comparison(self, f: IO[str], results: ResultsBucket):
+        """compare the points held by results and write the comparison tables"""
+
+        passed, expected, actual = point_comparison(
+            as_point_array(results.expected_points),
+            as_point_array(results.actual_points),
+            self.atol,
+            self.rtol,
+            self.match_mode,
+        )
 
-    def run_verification(self) -> List[str]:
-        """runs checks on parsed data and returns list of failures"""
-
-        self.failures = []
-        self._check_geometric_validity()
-        self._check_sequence_sameness()
-
-        return self.failures
-
-
-@dataclass
-class ResultsBucket:
-    """container for test results data"""
-
-    expected_points: List[Tuple[float, float]]
-    actual_points: List[Tuple[float, float]]
-    rectangle_failures: List[str]
-    expected_points_failures: List[str]
-    actual_points_failures: List[str]
-    verifier_failures: List[str]
-    overall_status: str = "UNKNOWN"
-
-
-class ResultsWriter:
-    """handles writing test results to file"""
-
-    def __init__(
-        self, scenario_path: Path, rectangle_coords: List[Tuple[float, float]]
-    ):
-        """initialize the writer with a scenario path"""
-
-        self.scenario_path = scenario_path
-        self.rectangle_coords = rectangle_coords
-        self.output_file = scenario_path / "test_results.txt"
+        if self.max_divergences is None:
+            self._write_comparison_header(f)
+            # missing entries are filled up with '-'
+            self._write_comparison_arrays(f, passed, expected, actual)
+        else:
+            self._write_divergences(f, passed, expected, actual)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.plot_file = scenario_path / f"test_results_{timestamp}.png"
+        if self.table_file is not None:
+            self._write_point_table(passed, expected, actual)
 
-    def write_results(  # pylint: disable=too-many-branches
+    def write_results(
         self,
         results: ResultsBucket,
+        comparison: Optional[IO[str]] = None,
+        stages: Optional[List[StageRecord]] = None,
     ) -> None:
-        """write test results to test_results.txt in the scenario folder"""
+        """write test results to test_results.txt in the scenario folder
 
-        with open(self.output_file, "w", encoding="utf-8") as f:
+        comparison is an optional table from spool_comparison, used instead
+        of comparing the points held by results. it is copied as is, neither
+        truncated nor written as a csv/jsonl table. stages are the timings
+        of the pipeline stages that ran before the report is written.
+        """
+
+        with open(
+            self.output_file, "w", encoding="utf-8", buffering=self._WRITE_BUFFER_SIZE
+        ) as f:
             # overall status header
             f.write("=" * 70 + "\n")
             f.write(f"OVERALL TEST STATUS: {results.overall_status}\n")
@@ -307,7 +406,7 @@ class ResultsWriter:
             if results.rectangle_failures:
                 f.write("RECTANGLE PARSING FAILURES:\n")
                 f.write("-" * 70 + "\n")
-                for error_msg in sorted(results.rectangle_failures):
+                for error_msg in results.rectangle_failures:
                     f.write(f"  {error_msg}\n")
                 f.write("\n")
 
@@ -315,7 +414,7 @@ class ResultsWriter:
             if results.expected_points_failures:
                 f.write("EXPECTED POINTS PARSING FAILURES:\n")
                 f.write("-" * 70 + "\n")
-                for error_msg in sorted(results.expected_points_failures):
+                for error_msg in results.expected_points_failures:
                     f.write(f"  {error_msg}\n")
                 f.write("\n")
 
@@ -323,7 +422,7 @@ class ResultsWriter:
             if results.actual_points_failures:
                 f.write("ACTUAL POINTS PARSING FAILURES:\n")
                 f.write("-" * 70 + "\n")
-                for error_msg in sorted(results.actual_points_failures):
+                for error_msg in results.actual_points_failures:
                     f.write(f"  {error_msg}\n")
                 f.write("\n")
 
@@ -335,86 +434,93 @@ class ResultsWriter:
                     f.write(f"  {failure_msg}\n")
                 f.write("\n")
 
+            # path metrics, if the points were verified
+            if results.metrics is not None:
+                self._write_path_metrics(f, results.metrics)
+
+            if stages:
+                self._write_stage_timings(f, stages)
+
             # point-by-point comparison
-            f.write("POINT-BY-POINT COMPARISON:\n")
-            f.write("-" * 70 + "\n")
-            f.write(
-                f"{'Expected Points':<20} {'Actual Points':<20} {'Assessment':<10}\n"
-            )
-            f.write("-" * 55 + "\n")
+            if comparison is None:
+                self._write_point_comparison(f, results)
+            else:
+                self._write_comparison_header(f)
+                comparison.seek(0)
+                shutil.copyfileobj(comparison, f)
 
-            # determine the longest length so we can fill up missing entries with '-'
-            max_len = (
-                max(len(results.expected_points), len(results.actual_points))
-                if results.expected_points or results.actual_points
-                else 0
+    def record_history(
+        self,
+        history: RunHistory,
+        results: ResultsBucket,
+        plot_file: Optional[Path] = None,
+    ) -> None:
+        """adds the results and their failing rows to the current run
+
+        they are inserted with the history's next batch. divergences use the
+        writer's tolerances and match mode, the report (and plot, if one was
+        rendered) are recorded as the artifacts of the result.
+        """
+
+        history.add_result(
+            HistoryEntry(
+                self.scenario_path.name,
+                results,
+                atol=self.atol,
+                rtol=self.rtol,
+                match_mode=self.match_mode,
+                artifacts=(self.output_file, plot_file),
             )
-            for i in range(max_len):
-                expected = (
-                    results.expected_points[i]
-                    if i < len(results.expected_points)
-                    else "-"
-                )
-                actual = (
-                    results.actual_points[i] if i < len(results.actual_points) else "-"
-                )
+        )
 
-                # format points, converting NaN tuples to "INVALID"
-                def format_point(point):
-                    if point == "-":
-                        return "-"
-                    if isinstance(point, tuple) and len(point) == 2:
-                        if isnan(point[0]) or isnan(point[1]):
-                            return "INVALID"
-                    return str(point)
-
-                expected_str = format_point(expected)
-                actual_str = format_point(actual)
-
-                if expected == "-" or actual == "-":
-                    status = "FAIL"
-                elif (
-                    isinstance(expected, tuple)
-                    and isinstance(actual, tuple)
-                    and (isnan(expected[0]) or isnan(actual[0]))
-                ):
-                    status = "FAIL"
-                elif expected == actual:
-                    status = "PASS"
-                else:
-                    status = "FAIL"
-
-                f.write(f"{expected_str:<20} {actual_str:<20} {status:<10}\n")
-
-    def _plot_points_and_assess(self, ax, expected_points, actual_points):
-        """plot points and assess if pass or fail"""
-
-        if expected_points:
-            point_xs, point_ys = zip(*expected_points)
-            ax.scatter(
-                point_xs,
-                point_ys,
-                c="blue",
-                s=50,
-                marker="o",
-                alpha=0.7,
-                label="Expected Points",
-            )
+    @classmethod
+    def _downsample(cls, points: PointArray) -> Tuple[PointArray, int]:
+        """keeps every n-th point of huge traces, returns the points and n"""
+
+        step = -(-len(points) // cls._MAX_SCATTER_POINTS)  # ceiling division
+        return (points[::step], step) if step > 1 else (points, 1)
 
-        if actual_points:
-            point_xs, point_ys = zip(*actual_points)
+    def _plot_points_and_assess(
+        self, ax, expected_points, actual_points, assessment=None
+    ):
+        """plot points and assess if pass or fail (unless already assessed)"""
+
+        expected_points = as_point_array(expected_points)
+        actual_points = as_point_array(actual_points)
+
+        if assessment is None:
+            if self.match_mode == "visited":
+                matched = match_visited(
+                    expected_points, actual_points, self.atol, self.rtol
+                ).all_matched
+            else:
+                matched = compare_point_arrays(
+                    expected_points, actual_points, self.atol, self.rtol
+                ).all()
+            assessment = "PASS" if matched else "FAIL"
+
+        for points, color, label in (
+            (expected_points, "blue", "Expected Points"),
+            (actual_points, "pink", "Actual Points"),
+        ):
+            if points.shape[0] == 0:
+                continue
+            shown, step = self._downsample(points)
             ax.scatter(
-                point_xs,
-                point_ys,
-                c="pink",
-                s=50,
+                shown[:, 0],
+                shown[:, 1],
+                c=color,
+                s=50 if step == 1 else 4,
                 marker="o",
                 alpha=0.7,
-                label="Actual Points",
+                label=label if step == 1 else f"{label} (1 of every {step})",
             )
-        return "PASS" if expected_points == actual_points else "FAIL"
 
-    def _configure_plot_appearance(self, ax, assessment):
+        return assessment
+
+    def _configure_plot_appearance(  # pylint: disable=import-outside-toplevel
+        self, ax, assessment
+    ):
         """configure plot formatting and legend"""
 
         ax.set_title("Work Area", fontsize=14, fontweight="bold")
@@ -431,6 +537,8 @@ class ResultsWriter:
             if assessment == "PASS"
             else "red" if assessment == "FAIL" else "gray"
         )
+        from matplotlib.lines import Line2D
+
         assessment_handle = Line2D(
             [0],
             [0],
@@ -454,21 +562,90 @@ class ResultsWriter:
             fontsize=10,
         )
 
-    def save_plot(
+    def save_plot(  # pylint: disable=import-outside-toplevel
         self,
-        expected_points: List[Tuple[float, float]],
-        actual_points: List[Tuple[float, float]],
+        expected_points: Union[PointArray, List[Tuple[float, float]]],
+        actual_points: Union[PointArray, List[Tuple[float, float]]],
+        assessment: Optional[str] = None,
     ) -> Path:
-        """saves plot to PNG file"""
-
-        fig, ax = plt.subplots(figsize=(10, 8))
-        closed_coords = self.rectangle_coords + [self.rectangle_coords[0]]
-        xs, ys = zip(*closed_coords)
-        ax.plot(xs, ys, "r-", linewidth=2, label="Work Area")
+        """saves plot to PNG file
+
+        pass the assessment when it is already known (e.g. from a
+        TracerSentinel walk) to skip comparing the points again.
+        """
+
+        # imported here so verification-only runs never load matplotlib
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        # figure with its own Agg canvas, no pyplot state, safe off the main thread
+        fig = Figure(figsize=(10, 8))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        corners = as_point_array(self.rectangle_coords)
+        closed_coords = np.vstack([corners, corners[:1]])
+        ax.plot(
+            closed_coords[:, 0],
+            closed_coords[:, 1],
+            "r-",
+            linewidth=2,
+            label="Work Area",
+        )
 
-        assessment = self._plot_points_and_assess(ax, expected_points, actual_points)
+        assessment = self._plot_points_and_assess(
+            ax, expected_points, actual_points, assessment
+        )
         self._configure_plot_appearance(ax, assessment)
 
-        plt.savefig(self.plot_file, format="png", dpi=150, bbox_inches="tight")
-        plt.close(fig)
+        fig.savefig(self.plot_file, format="png", dpi=150, bbox_inches="tight")
         return self.plot_file
+
+
+class PlotRenderQueue:
+    """renders ResultsWriter plots on a background thread
+
+    submit() returns right away with a future of the PNG path, so verifying
+    the next scenario never waits on figure rendering and PNG encoding.
+    """
+
+    def __init__(self, workers: int = 1):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="sentinel-plot"
+        )
+        self.render_failures: List[str] = []
+
+    def _record_failure(self, plot_file: Path, future: "Future[Path]"):
+        """keeps render errors, which would otherwise be lost with the future"""
+
+        error = future.exception()
+        if error is not None:
+            self.render_failures.append(f"Could not render {plot_file}: {error}")
+
+    def submit(
+        self,
+        writer: ResultsWriter,
+        expected_points: Union[PointArray, List[Tuple[float, float]]],
+        actual_points: Union[PointArray, List[Tuple[float, float]]],
+        assessment: Optional[str] = None,
+    ) -> "Future[Path]":
+        """queues writer.save_plot, returns a future of the plot file"""
+
+        future = self._executor.submit(
+            writer.save_plot, expected_points, actual_points, assessment
+        )
+        future.add_done_callback(
+            lambda done: self._record_failure(writer.plot_file, done)
+        )
+        return future
+
+    def close(self, wait: bool = True) -> List[str]:
+        """stops the queue (by default after rendering everything queued)"""
+
+        self._executor.shutdown(wait=wait)
+        return self.render_failures
+
+    def __enter__(self) -> "PlotRenderQueue":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
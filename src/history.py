@@ -0,0 +1,442 @@
+"""Indexed run history of Sentinel scenario results in a local SQLite store
+
+every run gets a row with an optional label (e.g. the firmware version),
+each scenario result of the run a row with its status and path metrics,
+plus its failure messages and failing point rows. results are inserted in
+one transaction per scenario or per batch of scenarios, so pool workers can
+record concurrently.
+queries such as "which scenarios started failing after firmware X" or "how
+did the p99 deviation trend" then run on indexes instead of text reports.
+
+usage: python -m src.history DB runs
+       python -m src.history DB newly-failing LABEL
+       python -m src.history DB trend SCENARIO [--metric METRIC]
+       python -m src.history DB scenario SCENARIO
+"""
+
+import argparse
+import sqlite3
+import sys
+from dataclasses import fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Sequence, cast
+
+import numpy as np
+
+from src import __version__
+from src.core import ResultsBucket
+from src.metrics import PathMetrics
+from src.points import as_point_array, point_comparison
+
+# failing rows stored per result, the total is always recorded
+DEFAULT_MAX_DIVERGENCES = 10_000
+
+# connections wait this long for a concurrent writer's transaction
+_BUSY_TIMEOUT_SECONDS = 30.0
+
+METRIC_COLUMNS = tuple(f.name for f in fields(PathMetrics))
+
+_FAILURE_SECTIONS = (
+    ("rectangle", "rectangle_failures"),
+    ("expected", "expected_points_failures"),
+    ("actual", "actual_points_failures"),
+    ("verifier", "verifier_failures"),
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    label TEXT,
+    started_at TEXT NOT NULL,
+    version TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_label ON runs (label, run_id);
+
+CREATE TABLE IF NOT EXISTS results (
+    result_id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    scenario TEXT NOT NULL,
+    overall_status TEXT NOT NULL,
+    expected_count INTEGER NOT NULL,
+    actual_count INTEGER NOT NULL,
+    failure_count INTEGER NOT NULL,
+    divergence_count INTEGER NOT NULL,
+    {", ".join(f"{name} REAL" for name in METRIC_COLUMNS)},
+    report_file TEXT,
+    plot_file TEXT
+);
+CREATE INDEX IF NOT EXISTS results_scenario ON results (scenario, run_id);
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id, overall_status);
+
+CREATE TABLE IF NOT EXISTS failures (
+    result_id INTEGER NOT NULL REFERENCES results (result_id),
+    section TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS failures_result ON failures (result_id);
+
+CREATE TABLE IF NOT EXISTS divergences (
+    result_id INTEGER NOT NULL REFERENCES results (result_id),
+    position INTEGER NOT NULL,
+    expected_x REAL,
+    expected_y REAL,
+    actual_x REAL,
+    actual_y REAL,
+    PRIMARY KEY (result_id, position)
+) WITHOUT ROWID;
+"""
+
+_INSERT_RESULT = (
+    "INSERT INTO results (run_id, scenario, overall_status, expected_count, "
+    f"actual_count, failure_count, divergence_count, {', '.join(METRIC_COLUMNS)}, "
+    f"report_file, plot_file) VALUES ({', '.join('?' * (9 + len(METRIC_COLUMNS)))})"
+)
+
+
+class RunRecord(NamedTuple):
+    """one recorded run and the outcome counts of its scenarios"""
+
+    run_id: int
+    label: Optional[str]
+    started_at: str
+    scenarios: int
+    failed: int
+
+
+class ScenarioRecord(NamedTuple):
+    """the outcome (or a metric) of one scenario in one run"""
+
+    run_id: int
+    label: Optional[str]
+    started_at: str
+    value: Any
+
+
+class HistoryEntry(NamedTuple):
+    """one scenario result to record, with the comparison settings of its report"""
+
+    scenario: str
+    results: ResultsBucket
+    atol: float = 0.0
+    rtol: float = 0.0
+    artifacts: Sequence[Optional[Path]] = (None, None)
+    max_divergences: Optional[int] = DEFAULT_MAX_DIVERGENCES
+    match_mode: str = "sequence"
+
+
+class _PreparedResult(NamedTuple):
+    """the rows of one result, without the ids assigned on insert"""
+
+    result_row: tuple
+    failure_rows: List[tuple]
+    divergence_rows: List[tuple]
+
+
+class RunHistory:
+    """SQLite store of scenario results across runs
+
+    the connection is opened on first use and not pickled, so a history
+    (and its current run) can be handed to pool workers, each of them
+    opening its own connection. results added with add_result are inserted
+    batch_size at a time, the rest of them on flush or close.
+    """
+
+    def __init__(
+        self, db_path: Path, run_id: Optional[int] = None, batch_size: int = 1
+    ):
+        self.db_path = db_path
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self._connection: Optional[sqlite3.Connection] = None
+        self._queued: List[_PreparedResult] = []
+
+    def __getstate__(self):
+        return {
+            "db_path": self.db_path,
+            "run_id": self.run_id,
+            "batch_size": self.batch_size,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)  # pylint: disable=unnecessary-dunder-call
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """connection of this process, the schema is created on first use"""
+
+        if self._connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=_BUSY_TIMEOUT_SECONDS)
+            # concurrent readers and one writer at a time, without fsync per commit
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        """inserts the queued results and closes the connection of this process"""
+
+        self.flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def start_run(self, label: Optional[str] = None) -> int:
+        """records a new run, results inserted from now on belong to it"""
+
+        with self.connection as connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (label, started_at, version) VALUES (?, ?, ?)",
+                (label, datetime.now(timezone.utc).isoformat(), __version__),
+            )
+        self.run_id = cast(int, cursor.lastrowid)
+        return self.run_id
+
+    def insert_result(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        scenario: str,
+        results: ResultsBucket,
+        atol: float = 0.0,
+        rtol: float = 0.0,
+        artifacts: Sequence[Optional[Path]] = (None, None),
+        max_divergences: Optional[int] = DEFAULT_MAX_DIVERGENCES,
+        match_mode: str = "sequence",
+    ) -> int:
+        """inserts one scenario result of the current run in a single transaction
+
+        failing point rows are compared with the same tolerances and match
+        mode as the report (in "visited" mode, the expected points that were
+        never visited), only the first max_divergences of them are stored.
+        artifacts are the report and plot files.
+        """
+
+        entry = HistoryEntry(
+            scenario, results, atol, rtol, artifacts, max_divergences, match_mode
+        )
+        return self.insert_results([entry])[0]
+
+    def insert_results(self, entries: Iterable[HistoryEntry]) -> List[int]:
+        """inserts scenario results of the current run in a single transaction
+
+        returns their result ids, in order.
+        """
+
+        return self._insert([self._prepare(entry) for entry in entries])
+
+    def add_result(self, entry: HistoryEntry) -> None:
+        """queues a scenario result of the current run, inserted with its batch
+
+        the points are compared right away, so the queue only holds rows.
+        """
+
+        self._queued.append(self._prepare(entry))
+        if len(self._queued) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> List[int]:
+        """inserts the queued results in a single transaction, returns their ids"""
+
+        queued, self._queued = self._queued, []
+        return self._insert(queued) if queued else []
+
+    def _prepare(self, entry: HistoryEntry) -> _PreparedResult:
+        """compares the points of a result as in its report, returns its rows"""
+
+        if self.run_id is None:
+            raise ValueError("No run started, call start_run first")
+
+        results = entry.results
+        # (PASS mask, expected rows, actual rows) as in the report
+        passed, *rows = point_comparison(
+            as_point_array(results.expected_points),
+            as_point_array(results.actual_points),
+            entry.atol,
+            entry.rtol,
+            entry.match_mode,
+        )
+        diverged = np.flatnonzero(~passed)
+        failure_rows = [
+            (section, message)
+            for section, name in _FAILURE_SECTIONS
+            for message in getattr(results, name)
+        ]
+
+        return _PreparedResult(
+            (
+                entry.scenario,
+                results.overall_status,
+                len(results.expected_points),
+                len(results.actual_points),
+                len(failure_rows),
+                len(diverged),
+                *_metric_values(results.metrics),
+                *(str(path) if path else None for path in entry.artifacts),
+            ),
+            failure_rows,
+            list(_divergence_rows(diverged[: entry.max_divergences], *rows)),
+        )
+
+    def _insert(self, prepared: Sequence[_PreparedResult]) -> List[int]:
+        """inserts the rows of prepared results in a single transaction"""
+
+        result_ids = []
+        with self.connection as connection:
+            for result_row, failure_rows, divergence_rows in prepared:
+                cursor = connection.execute(_INSERT_RESULT, (self.run_id, *result_row))
+                result_id = cast(int, cursor.lastrowid)
+                connection.executemany(
+                    "INSERT INTO failures (result_id, section, message) "
+                    "VALUES (?, ?, ?)",
+                    ((result_id, *row) for row in failure_rows),
+                )
+                connection.executemany(
+                    "INSERT INTO divergences VALUES (?, ?, ?, ?, ?, ?)",
+                    ((result_id, *row) for row in divergence_rows),
+                )
+                result_ids.append(result_id)
+
+        return result_ids
+
+    def runs(self) -> List[RunRecord]:
+        """all runs with their scenario and failure counts, oldest first"""
+
+        return [
+            RunRecord(*row)
+            for row in self.connection.execute(
+                "SELECT runs.run_id, label, started_at, COUNT(result_id), "
+                "COALESCE(SUM(overall_status != 'PASS'), 0) "
+                "FROM runs LEFT JOIN results USING (run_id) "
+                "GROUP BY runs.run_id ORDER BY runs.run_id"
+            )
+        ]
+
+    def scenario_history(self, scenario: str) -> List[ScenarioRecord]:
+        """the overall status of a scenario in every run that recorded it"""
+
+        return self.trend(scenario, "overall_status")
+
+    def trend(self, scenario: str, metric: str) -> List[ScenarioRecord]:
+        """a metric column (see METRIC_COLUMNS) of a scenario across runs
+
+        deviations that were not computed (NaN) read back as None.
+        """
+
+        if metric not in METRIC_COLUMNS + ("overall_status", "divergence_count"):
+            raise ValueError(f"Unknown metric '{metric}'")
+
+        return [
+            ScenarioRecord(*row)
+            for row in self.connection.execute(
+                f"SELECT run_id, label, started_at, {metric} "
+                "FROM results JOIN runs USING (run_id) "
+                "WHERE scenario = ? ORDER BY run_id",
+                (scenario,),
+            )
+        ]
+
+    def newly_failing(self, label: str) -> List[ScenarioRecord]:
+        """scenarios that passed in the latest run labelled label but failed later
+
+        each scenario is listed with the first later run it did not pass
+        in, the value is the scenario name.
+        """
+
+        baseline = self.connection.execute(
+            "SELECT MAX(run_id) FROM runs WHERE label = ?", (label,)
+        ).fetchone()[0]
+        if baseline is None:
+            raise ValueError(f"No run labelled '{label}'")
+
+        return [
+            ScenarioRecord(run_id, run_label, started_at, scenario)
+            for scenario, run_id, run_label, started_at in self.connection.execute(
+                "SELECT later.scenario, MIN(later.run_id), runs.label, runs.started_at "
+                "FROM results AS later "
+                "JOIN results AS base ON base.scenario = later.scenario "
+                "AND base.run_id = :baseline AND base.overall_status = 'PASS' "
+                "JOIN runs ON runs.run_id = later.run_id "
+                "WHERE later.run_id > :baseline AND later.overall_status != 'PASS' "
+                "GROUP BY later.scenario ORDER BY later.scenario",
+                {"baseline": baseline},
+            )
+        ]
+
+
+def _metric_values(metrics: Optional[PathMetrics]) -> List[Any]:
+    """metric column values, all NULL if the points were not verified"""
+
+    return [getattr(metrics, name) if metrics else None for name in METRIC_COLUMNS]
+
+
+def _divergence_rows(
+    positions: np.ndarray, expected: np.ndarray, actual: np.ndarray
+) -> Iterator[tuple]:
+    """(position, expected x/y, actual x/y) rows, None past a sequence end"""
+
+    def coordinates(points: np.ndarray) -> List[tuple]:
+        inside = positions[positions < len(points)]
+        rows: List[tuple] = [(None, None)] * len(positions)
+        rows[: len(inside)] = [tuple(row) for row in points[inside].tolist()]
+        return rows
+
+    for position, expected_xy, actual_xy in zip(
+        positions.tolist(), coordinates(expected), coordinates(actual)
+    ):
+        yield (position, *expected_xy, *actual_xy)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """command line entry point, prints the answer to one history query"""
+
+    arg_parser = argparse.ArgumentParser(description="Query the Sentinel run history.")
+    arg_parser.add_argument("db", type=Path, help="run history database")
+    queries = arg_parser.add_subparsers(dest="query", required=True)
+    queries.add_parser("runs", help="list all runs")
+    newly_failing = queries.add_parser(
+        "newly-failing", help="scenarios failing since the run with a label"
+    )
+    newly_failing.add_argument("label")
+    trend = queries.add_parser("trend", help="a metric of a scenario across runs")
+    trend.add_argument("scenario")
+    trend.add_argument("--metric", choices=METRIC_COLUMNS, default="deviation_p99")
+    scenario = queries.add_parser("scenario", help="the status of a scenario by run")
+    scenario.add_argument("scenario")
+    args = arg_parser.parse_args(argv)
+
+    if not args.db.exists():
+        print(f"No run history at {args.db}", file=sys.stderr)
+        return 2
+
+    history = RunHistory(args.db)
+    try:
+        if args.query == "runs":
+            for run in history.runs():
+                print(
+                    f"{run.run_id:>6} {run.label or '-':<20} {run.started_at:<32} "
+                    f"{run.scenarios:>6} scenarios {run.failed:>6} failed"
+                )
+            return 0
+        if args.query == "newly-failing":
+            records = history.newly_failing(args.label)
+        elif args.query == "trend":
+            records = history.trend(args.scenario, args.metric)
+        else:
+            records = history.scenario_history(args.scenario)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    finally:
+        history.close()
+
+    for record in records:
+        print(
+            f"{record.run_id:>6} {record.label or '-':<20} {record.started_at:<32} "
+            f"{'-' if record.value is None else record.value}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Per-stage instrumentation of the Sentinel verification pipeline
+
+each pipeline stage (parse, verify, write_results, plot) is timed and its
+point and failure counts are recorded. cProfile and tracemalloc can be
+switched on for a run, the profile is dumped next to the report and the
+tracemalloc peak is recorded per stage. stage records of many scenarios
+are aggregated so CI can compare them with a baseline run.
+"""
+
+import cProfile
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src import __version__
+
+# stage regressions below this many seconds are timer noise
+MIN_REGRESSION_SECONDS = 0.001
+
+
+@dataclass
+class StageRecord:
+    """wall time and counts of one pipeline stage"""
+
+    name: str
+    seconds: float = 0.0
+    points: int = 0
+    failures: int = 0
+    peak_mib: Optional[float] = None  # only with trace_memory
+
+
+class PipelineInstruments:
+    """times pipeline stages, optionally under cProfile and tracemalloc
+
+    tracemalloc is started for the first stage if it is not running yet and
+    stopped again by close(). the profile collects all stages of one run.
+    """
+
+    def __init__(self, profile: bool = False, trace_memory: bool = False):
+        self.stages: List[StageRecord] = []
+        self.profiler = cProfile.Profile() if profile else None
+        self.trace_memory = trace_memory
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        """times the enclosed block as a stage, its counts are set on the record"""
+
+        record = StageRecord(name)
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+        if self.profiler is not None:
+            self.profiler.enable()
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            if self.profiler is not None:
+                self.profiler.disable()
+            if self.trace_memory:
+                record.peak_mib = round(tracemalloc.get_traced_memory()[1] / 2**20, 3)
+            self.stages.append(record)
+
+    def close(self) -> None:
+        """stops tracemalloc if it was started for the stages"""
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def write_profile(self, profile_file: Path) -> Optional[Path]:
+        """dumps the collected profile for pstats/snakeviz, None without profiling"""
+
+        if self.profiler is None:
+            return None
+        self.profiler.dump_stats(profile_file)
+        return profile_file
+
+    def write_sidecar(self, sidecar_file: Path, **context: Any) -> Path:
+        """writes the stage records as JSON, with context such as the scenario name"""
+
+        with open(sidecar_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": __version__,
+                    **context,
+                    "stages": [asdict(record) for record in self.stages],
+                },
+                f,
+                indent=2,
+                default=str,
+            )
+        return sidecar_file
+
+
+def aggregate_stages(
+    runs: Iterable[Tuple[str, List[StageRecord]]],
+) -> Dict[str, Dict[str, Any]]:
+    """totals per stage over (scenario, stage records) pairs, in pipeline order
+
+    each stage gets its run count, total/mean/max seconds, the slowest
+    scenario and its total points and failures.
+    """
+
+    totals: Dict[str, Dict[str, Any]] = {}
+    for scenario, records in runs:
+        for record in records:
+            total = totals.setdefault(
+                record.name,
+                {
+                    "runs": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "slowest": scenario,
+                    "points": 0,
+                    "failures": 0,
+                },
+            )
+            total["runs"] += 1
+            total["total_seconds"] += record.seconds
+            total["points"] += record.points
+            total["failures"] += record.failures
+            if record.seconds >= total["max_seconds"]:
+                total["max_seconds"] = record.seconds
+                total["slowest"] = scenario
+
+    for total in totals.values():
+        total["mean_seconds"] = total["total_seconds"] / total["runs"]
+    return totals
+
+
+def find_regressions(
+    totals: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    max_slowdown: float = 1.5,
+) -> List[str]:
+    """stages whose mean time grew beyond max_slowdown times the baseline mean
+
+    stages missing from the baseline are not compared.
+    """
+
+    regressions = []
+    for name, total in totals.items():
+        if name not in baseline:
+            continue
+        mean, baseline_mean = total["mean_seconds"], baseline[name]["mean_seconds"]
+        if (
+            mean > baseline_mean * max_slowdown
+            and mean - baseline_mean >= MIN_REGRESSION_SECONDS
+        ):
+            regressions.append(
+                f"Stage '{name}' regressed: mean {mean:.4f} s versus "
+                f"{baseline_mean:.4f} s in the baseline"
+            )
+    return regressions
+
+
+def write_timings_json(totals: Dict[str, Dict[str, Any]], timings_file: Path) -> Path:
+    """writes aggregated stage totals, the format read back by load_timings"""
+
+    with open(timings_file, "w", encoding="utf-8") as f:
+        json.dump({"version": __version__, "stages": totals}, f, indent=2)
+    return timings_file
+
+
+def load_timings(timings_file: Path) -> Dict[str, Dict[str, Any]]:
+    """reads the stage totals written by write_timings_json"""
+
+    with open(timings_file, "r", encoding="utf-8") as f:
+        return json.load(f)["stages"]
@@ -0,0 +1,294 @@
+"""Scenario manifest of a Sentinel scenarios root, and runtime-balanced shards
+
+the manifest (manifest.json in the scenarios root) lists every scenario
+with its expected outcome, point counts, file digests and a smoothed
+runtime of previous runs. with a manifest, scenarios are selected without
+a directory walk, and --shard i/N splits them into N shards of about equal
+total runtime, so CI runners finish at about the same time.
+
+usage: python -m src.manifest [--scenarios DIR] [--check] [--shard i/N]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src import __version__
+from src.cache import scenario_digests
+from src.tracefile import scenario_parser
+
+# base directory for all scenario data
+DEFAULT_SCENARIOS_DIR = Path(__file__).parent.parent / "data" / "scenarios"
+MANIFEST_FILE_NAME = "manifest.json"
+
+# weight of the latest run in a scenario's smoothed runtime
+RUNTIME_SMOOTHING = 0.5
+
+
+@dataclass
+class ManifestEntry:
+    """what is known about one scenario folder before running it"""
+
+    name: str
+    expected_status: str
+    expected_points: int
+    actual_points: int
+    digests: Dict[str, str] = field(default_factory=dict)
+    runtime_seconds: Optional[float] = None
+
+
+def expected_status(scenario_path: Path) -> str:
+    """expected outcome of a scenario, inferred from its folder name"""
+
+    return "FAIL" if "fail" in scenario_path.name.lower() else "PASS"
+
+
+def discover_scenarios(
+    scenarios_dir: Path = DEFAULT_SCENARIOS_DIR, name_filter: str = ""
+) -> List[Path]:
+    """finds all scenario directories, optionally keeping names containing name_filter
+
+    hidden directories (e.g. the result cache) are not scenarios.
+    """
+
+    return [
+        p
+        for p in sorted(scenarios_dir.glob("*"))
+        if p.is_dir() and not p.name.startswith(".") and name_filter in p.name
+    ]
+
+
+def _scan_scenario(
+    scenario_path: Path, previous: Optional[ManifestEntry]
+) -> ManifestEntry:
+    """manifest entry of a scenario, reusing the previous one if its files are unchanged
+
+    the expected outcome and runtime of a previous entry are kept, so they
+    can be edited by hand and survive changes to the scenario files.
+    """
+
+    digests = scenario_digests(scenario_path)
+    if previous is not None and previous.digests == digests:
+        return previous
+
+    _, expected_points, actual_points = scenario_parser(
+        scenario_path
+    ).get_parsed_arrays()
+    return ManifestEntry(
+        name=scenario_path.name,
+        expected_status=(
+            previous.expected_status if previous else expected_status(scenario_path)
+        ),
+        expected_points=len(expected_points),
+        actual_points=len(actual_points),
+        digests=digests,
+        runtime_seconds=previous.runtime_seconds if previous else None,
+    )
+
+
+def build_manifest(
+    scenarios_dir: Path, previous: Optional[Dict[str, ManifestEntry]] = None
+) -> Dict[str, ManifestEntry]:
+    """manifest entries of all scenarios by name, only changed ones are parsed"""
+
+    previous = previous or {}
+    return {
+        p.name: _scan_scenario(p, previous.get(p.name))
+        for p in discover_scenarios(scenarios_dir)
+    }
+
+
+def load_manifest(manifest_file: Path) -> Dict[str, ManifestEntry]:
+    """reads the entries written by write_manifest, in name order"""
+
+    with open(manifest_file, "r", encoding="utf-8") as f:
+        return {
+            entry["name"]: ManifestEntry(**entry) for entry in json.load(f)["scenarios"]
+        }
+
+
+def write_manifest(entries: Dict[str, ManifestEntry], manifest_file: Path) -> Path:
+    """writes manifest entries sorted by name, replacing the file atomically"""
+
+    tmp_file = manifest_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "version": __version__,
+                "scenarios": [asdict(entries[name]) for name in sorted(entries)],
+            },
+            f,
+            indent=2,
+        )
+        f.write("\n")
+    os.replace(tmp_file, manifest_file)
+    return manifest_file
+
+
+def record_runtimes(
+    entries: Dict[str, ManifestEntry], runtimes: Dict[str, float]
+) -> None:
+    """folds measured runtimes into the smoothed runtimes of the entries
+
+    runtimes of scenarios missing from the manifest are ignored.
+    """
+
+    for name, seconds in runtimes.items():
+        entry = entries.get(name)
+        if entry is None:
+            continue
+        if entry.runtime_seconds is None:
+            entry.runtime_seconds = round(seconds, 6)
+        else:
+            entry.runtime_seconds = round(
+                entry.runtime_seconds
+                + RUNTIME_SMOOTHING * (seconds - entry.runtime_seconds),
+                6,
+            )
+
+
+def stale_entries(entries: Dict[str, ManifestEntry], scenarios_dir: Path) -> List[str]:
+    """differences between the manifest and the scenario folders, empty if current"""
+
+    problems = []
+    scenario_paths = {p.name: p for p in discover_scenarios(scenarios_dir)}
+    for name in sorted(entries.keys() - scenario_paths.keys()):
+        problems.append(f"Scenario '{name}' is listed but has no folder")
+    for name in sorted(scenario_paths.keys() - entries.keys()):
+        problems.append(f"Scenario '{name}' is not listed")
+    for name in sorted(entries.keys() & scenario_paths.keys()):
+        if entries[name].digests != scenario_digests(scenario_paths[name]):
+            problems.append(f"Scenario '{name}' changed since the manifest was built")
+    return problems
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """parses 'i/N' (1 <= i <= N) into (i, N), raises ValueError otherwise"""
+
+    try:
+        index, count = (int(part) for part in shard.split("/"))
+    except ValueError as e:
+        raise ValueError(f"Invalid shard '{shard}', expected i/N") from e
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{shard}', expected 1 <= i <= N")
+    return index, count
+
+
+def shard_scenarios(
+    runtimes: Dict[str, Optional[float]], index: int, count: int
+) -> List[str]:
+    """names in shard index of count, balanced by runtime, in name order
+
+    the longest scenarios are assigned first, each to the shard with the
+    least total runtime so far (ties to the lower shard), so every node
+    computes the same shards. unknown runtimes count as the mean of the
+    known ones, without any runtime the shards are balanced by count.
+    """
+
+    known = [seconds for seconds in runtimes.values() if seconds is not None]
+    default = sum(known) / len(known) if known else 1.0
+    estimates = {
+        name: default if seconds is None else seconds
+        for name, seconds in runtimes.items()
+    }
+
+    loads = [(0.0, shard) for shard in range(1, count + 1)]
+    selected = []
+    for name in sorted(estimates, key=lambda name: (-estimates[name], name)):
+        load, shard = heapq.heappop(loads)
+        if shard == index:
+            selected.append(name)
+        heapq.heappush(loads, (load + estimates[name], shard))
+
+    return sorted(selected)
+
+
+def select_scenarios(
+    scenarios_dir: Path,
+    manifest: Optional[Dict[str, ManifestEntry]] = None,
+    name_filter: str = "",
+    shard: Optional[Tuple[int, int]] = None,
+) -> List[Path]:
+    """scenario folders to run, from the manifest if given, else a directory walk
+
+    with shard (i, N), only shard i of the matching scenarios is kept.
+    """
+
+    if manifest is None:
+        scenario_paths = discover_scenarios(scenarios_dir, name_filter)
+    else:
+        scenario_paths = [
+            scenarios_dir / name for name in sorted(manifest) if name_filter in name
+        ]
+    if shard is None:
+        return scenario_paths
+
+    selected = set(
+        shard_scenarios(
+            {
+                p.name: manifest[p.name].runtime_seconds if manifest else None
+                for p in scenario_paths
+            },
+            *shard,
+        )
+    )
+    return [p for p in scenario_paths if p.name in selected]
+
+
+def read_manifest(scenarios_dir: Path) -> Optional[Dict[str, ManifestEntry]]:
+    """the manifest of a scenarios root, None if it has none"""
+
+    manifest_file = scenarios_dir / MANIFEST_FILE_NAME
+    return load_manifest(manifest_file) if manifest_file.exists() else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """command line entry point, builds (or checks) the manifest of a scenarios root"""
+
+    arg_parser = argparse.ArgumentParser(
+        description="Build the Sentinel scenario manifest."
+    )
+    arg_parser.add_argument(
+        "--scenarios", type=Path, default=DEFAULT_SCENARIOS_DIR, help="scenarios root"
+    )
+    arg_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only report whether the manifest is current, non-zero if not",
+    )
+    arg_parser.add_argument(
+        "--shard", type=parse_shard, help="print the scenarios of shard i/N"
+    )
+    args = arg_parser.parse_args(argv)
+
+    manifest = read_manifest(args.scenarios)
+    if args.check:
+        problems = (
+            stale_entries(manifest, args.scenarios)
+            if manifest is not None
+            else [f"No manifest in {args.scenarios}"]
+        )
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        return 1 if problems else 0
+
+    if args.shard:
+        for scenario_path in select_scenarios(
+            args.scenarios, manifest, shard=args.shard
+        ):
+            print(scenario_path.name)
+        return 0
+
+    manifest = build_manifest(args.scenarios, manifest)
+    manifest_file = write_manifest(manifest, args.scenarios / MANIFEST_FILE_NAME)
+    print(f"{len(manifest)} scenarios written to {manifest_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Path metrics of verified Sentinel scenarios
+
+quantifies how far the actual path strays from the expected one, beyond
+the PASS/FAIL verdict, e.g. to track arm performance across releases.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from src.points import PointArray
+
+
+@dataclass(slots=True)
+class PathMetrics:  # pylint: disable=too-many-instance-attributes
+    """quantitative comparison of the expected and actual paths
+
+    deviations are euclidean distances between paired valid points, NaN if
+    no pair was compared. dwell points are actual points that repeat the
+    previous one.
+    """
+
+    compared_points: int
+    deviation_max: float
+    deviation_mean: float
+    deviation_p99: float
+    expected_path_length: float
+    actual_path_length: float
+    actual_points_outside: int
+    actual_dwell_points: int
+
+
+# rows per chunk, small enough for the temporaries to stay in cache
+CHUNK_ROWS = 1 << 16
+
+
+def _distances(first: PointArray, second: PointArray) -> npt.NDArray:
+    """euclidean distances between the rows of two equally long point arrays"""
+
+    step_x = first[:, 0] - second[:, 0]
+    step_y = first[:, 1] - second[:, 1]
+    step_x *= step_x
+    step_y *= step_y
+    step_x += step_y
+    return np.sqrt(step_x, out=step_x)
+
+
+def _path_length(points: PointArray) -> Tuple[float, int]:
+    """summed segment lengths and number of zero length segments
+
+    segments next to invalid points are NaN and left out of the sum.
+    """
+
+    length, repeats = 0.0, 0
+    for start in range(0, len(points) - 1, CHUNK_ROWS):
+        end = min(start + CHUNK_ROWS, len(points) - 1)
+        steps = _distances(points[start + 1 : end + 1], points[start:end])
+        length += float(np.nansum(steps))
+        repeats += int(np.count_nonzero(steps == 0.0))
+    return length, repeats
+
+
+def compute_path_metrics(
+    expected: PointArray,
+    actual: PointArray,
+    actual_inside: npt.NDArray,
+    expected_index: Optional[npt.NDArray] = None,
+) -> PathMetrics:
+    """path metrics of two point arrays, computed in vectorized chunks
+
+    actual_inside is the work area mask of the actual points. points are
+    paired by index, or with expected_index, each actual point with the
+    expected point it matched (-1 if none).
+    """
+
+    if expected_index is None:
+        count = min(len(expected), len(actual))
+        paired_expected, paired_actual = expected[:count], actual[:count]
+    else:
+        matched = expected_index >= 0
+        paired_expected, paired_actual = (
+            expected[expected_index[matched]],
+            actual[matched],
+        )
+
+    deviation = np.empty(len(paired_actual))
+    for start in range(0, len(deviation), CHUNK_ROWS):
+        deviation[start : start + CHUNK_ROWS] = _distances(
+            paired_expected[start : start + CHUNK_ROWS],
+            paired_actual[start : start + CHUNK_ROWS],
+        )
+    deviation = deviation[~np.isnan(deviation)]
+    expected_length, _ = _path_length(expected)
+    actual_length, actual_dwell = _path_length(actual)
+    valid_actual = ~np.isnan(actual[:, 0])
+
+    return PathMetrics(
+        compared_points=len(deviation),
+        deviation_max=float(deviation.max()) if len(deviation) else float("nan"),
+        deviation_mean=float(deviation.mean()) if len(deviation) else float("nan"),
+        deviation_p99=(
+            float(np.percentile(deviation, 99)) if len(deviation) else float("nan")
+        ),
+        expected_path_length=expected_length,
+        actual_path_length=actual_length,
+        actual_points_outside=int(np.count_nonzero(valid_actual & ~actual_inside)),
+        actual_dwell_points=actual_dwell,
+    )
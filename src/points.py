@@ -0,0 +1,236 @@
+"""Point array primitives shared by the Sentinel parser, verifier and writer"""
+
+from typing import Iterable, NamedTuple, Optional, Tuple, Union, cast
+
+import numpy as np
+import numpy.typing as npt
+
+# compact point representation shared by parser, work area, verifier and writer:
+# an (N, 2) float64 array with one (x, y) row per point
+PointArray = npt.NDArray[np.float64]
+_POINT_DTYPE = np.dtype((np.float64, 2))
+
+
+def as_point_array(
+    points: Union[PointArray, Iterable[Tuple[float, float]]],
+) -> PointArray:
+    """returns points as a contiguous (N, 2) float64 array (no copy if already one)"""
+
+    if isinstance(points, np.ndarray):
+        return np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 2)
+    if isinstance(points, (list, tuple)):
+        return np.array(points, dtype=np.float64).reshape(-1, 2)
+
+    # lazy iterators (e.g. from stream_parsed_data) are packed without a list
+    return cast(PointArray, np.fromiter(points, dtype=_POINT_DTYPE).reshape(-1, 2))
+
+
+def compare_point_arrays(
+    expected: PointArray, actual: PointArray, atol: float = 0.0, rtol: float = 0.0
+) -> npt.NDArray:
+    """vectorized lockstep comparison, returns a PASS mask over the longer sequence
+
+    points match if each coordinate is within atol + rtol * |expected| (exact
+    equality by default). indexes missing from the shorter sequence and NaN
+    (invalid) points fail.
+    """
+
+    n_common = min(len(expected), len(actual))
+    passed = np.zeros(max(len(expected), len(actual)), dtype=bool)
+    expected, actual = expected[:n_common], actual[:n_common]
+
+    if atol == 0.0 and rtol == 0.0:
+        passed[:n_common] = np.all(expected == actual, axis=1)
+    else:
+        deviation = np.abs(actual - expected)
+        passed[:n_common] = np.all(deviation <= atol + rtol * np.abs(expected), axis=1)
+    return passed
+
+
+class PointGridIndex:  # pylint: disable=too-few-public-methods
+    """uniform grid over a point array, built once for neighbour lookups
+
+    each point is hashed to a square cell, a query returns the points of the
+    3x3 cells around it, i.e. every point within cell_size along each axis.
+    """
+
+    # cells per axis are capped so a cell (x, y) pair packs into one int64 key
+    _MAX_CELLS_PER_AXIS = 2**30
+
+    def __init__(self, points: PointArray, cell_size: float = 0.0):
+
+        self.points = points
+        indexes = np.flatnonzero(np.isfinite(points).all(axis=1))
+        finite = points[indexes]
+
+        self.origin = finite.min(axis=0) if len(finite) else np.zeros(2)
+        span = float((finite.max(axis=0) - self.origin).max()) if len(finite) else 0.0
+
+        # without a tolerance, aim for about one point per cell
+        if cell_size <= 0.0:
+            cell_size = span / np.sqrt(len(finite)) if span > 0.0 else 1.0
+        self.cell_size = max(cell_size, span / self._MAX_CELLS_PER_AXIS)
+
+        keys = self._cell_keys(finite)
+        order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[order]
+        self._sorted_indexes = indexes[order]
+
+    # stride between the packed keys of horizontally neighbouring cells
+    _KEY_STRIDE = _MAX_CELLS_PER_AXIS + 5
+
+    def _cell_keys(self, points: PointArray) -> npt.NDArray:
+        """packed int64 keys of the cells of points
+
+        far away points are clamped next to the grid, and cells are offset so
+        the keys of the 3x3 neighbours never wrap into another grid column.
+        """
+
+        cells = np.floor((points - self.origin) / self.cell_size)
+        cells = np.clip(cells, -1, self._MAX_CELLS_PER_AXIS + 1).astype(np.int64) + 2
+        return cells[:, 0] * self._KEY_STRIDE + cells[:, 1]
+
+    def candidate_pairs(self, queries: PointArray) -> Tuple[npt.NDArray, npt.NDArray]:
+        """returns (query index, point index) pairs of all points near each query"""
+
+        query_indexes = np.flatnonzero(np.isfinite(queries).all(axis=1))
+        keys = self._cell_keys(queries[query_indexes])
+
+        # sorted lookups walk the sorted grid keys in order, which is far
+        # more cache friendly than random lookups on large arrays
+        order = np.argsort(keys, kind="stable")
+        keys, query_indexes = keys[order], query_indexes[order]
+
+        pairs_q, pairs_p = [], []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                shifted = keys + (dx * self._KEY_STRIDE + dy)
+                lo = np.searchsorted(self._sorted_keys, shifted, "left")
+                counts = np.searchsorted(self._sorted_keys, shifted, "right") - lo
+
+                # expand each query's [lo, lo + count) run of sorted points
+                run_starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+                positions = run_starts + np.arange(counts.sum())
+                pairs_q.append(np.repeat(query_indexes, counts))
+                pairs_p.append(self._sorted_indexes[positions])
+
+        return np.concatenate(pairs_q), np.concatenate(pairs_p)
+
+
+def tolerance_grid_index(
+    expected: PointArray, atol: float, rtol: float
+) -> PointGridIndex:
+    """grid index over the expected points for the given match tolerances"""
+
+    # cells at least as large as the widest tolerance box around any point
+    finite = expected[np.isfinite(expected).all(axis=1)]
+    largest = float(np.abs(finite).max()) if len(finite) else 0.0
+    return PointGridIndex(expected, atol + rtol * largest)
+
+
+class VisitMatch(NamedTuple):
+    """nearest matches between expected and actual points, in any order"""
+
+    nearest_expected: npt.NDArray  # per actual point, -1 if it matches none
+    nearest_actual: npt.NDArray  # per expected point, -1 if never visited
+
+    @property
+    def visited(self) -> npt.NDArray:
+        """mask of the expected points visited by some actual point"""
+
+        return self.nearest_actual >= 0
+
+    @property
+    def all_matched(self) -> bool:
+        """true if every expected point is visited and every actual point expected"""
+
+        return bool(self.visited.all() and (self.nearest_expected >= 0).all())
+
+
+def _nearest(
+    keys: npt.NDArray, values: npt.NDArray, distance: npt.NDArray, size: int
+) -> npt.NDArray:
+    """the value of the closest pair of each key, -1 for keys without a pair"""
+
+    order = np.lexsort((distance, keys))
+    unique_keys, first = np.unique(keys[order], return_index=True)
+    nearest = np.full(size, -1, dtype=np.int64)
+    nearest[unique_keys] = values[order][first]
+    return nearest
+
+
+def match_visited(
+    expected: PointArray,
+    actual: PointArray,
+    atol: float = 0.0,
+    rtol: float = 0.0,
+    index: Optional[PointGridIndex] = None,
+) -> VisitMatch:
+    """matches expected and actual points within atol + rtol * |expected|, in any order
+
+    candidates are looked up through a grid index over the expected points
+    (from tolerance_grid_index, built here unless given), so matching stays
+    O(N log N) instead of O(N^2). the nearest match is by euclidean distance.
+    """
+
+    if index is None:
+        index = tolerance_grid_index(expected, atol, rtol)
+    pairs_actual, pairs_expected = index.candidate_pairs(actual)
+    deviation = np.abs(actual[pairs_actual] - expected[pairs_expected])
+    within = np.all(deviation <= atol + rtol * np.abs(expected[pairs_expected]), axis=1)
+    pairs_actual, pairs_expected = pairs_actual[within], pairs_expected[within]
+    distance = np.hypot(deviation[within, 0], deviation[within, 1])
+
+    return VisitMatch(
+        _nearest(pairs_actual, pairs_expected, distance, len(actual)),
+        _nearest(pairs_expected, pairs_actual, distance, len(expected)),
+    )
+
+
+def point_comparison(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    expected: PointArray,
+    actual: PointArray,
+    atol: float = 0.0,
+    rtol: float = 0.0,
+    match_mode: str = "sequence",
+) -> Tuple[npt.NDArray, PointArray, PointArray]:
+    """(PASS mask, expected rows, actual rows) of a point-by-point comparison
+
+    in "sequence" mode the rows are the points themselves, compared index
+    by index. in "visited" mode there is one row per expected point, which
+    passes if it was visited, and the actual row is the nearest actual point
+    that visited it (NaN if none), as matched by the verifier.
+    """
+
+    if match_mode == "sequence":
+        return compare_point_arrays(expected, actual, atol, rtol), expected, actual
+
+    match = match_visited(expected, actual, atol, rtol)
+    visitors = np.full_like(expected, np.nan)
+    visitors[match.visited] = actual[match.nearest_actual[match.visited]]
+    return match.visited, expected, visitors
+
+
+def order_convex_quadrilateral(corners: PointArray) -> Optional[PointArray]:
+    """returns the corners in counter-clockwise order, None if not a convex quadrilateral
+
+    corners may be listed in any order, they are sorted by angle around their
+    centroid. degenerate shapes (repeated or collinear corners) are rejected.
+    """
+
+    if corners.shape != (4, 2) or not np.isfinite(corners).all():
+        return None
+
+    centroid = corners.mean(axis=0)
+    angles = np.arctan2(corners[:, 1] - centroid[1], corners[:, 0] - centroid[0])
+    ordered = corners[np.argsort(angles)]
+
+    # every turn of a convex counter-clockwise polygon is strictly to the left
+    edges = np.roll(ordered, -1, axis=0) - ordered
+    turns = edges[:, 0] * np.roll(edges[:, 1], -1) - edges[:, 1] * np.roll(
+        edges[:, 0], -1
+    )
+    if not (turns > 0).all():
+        return None
+
+    return ordered
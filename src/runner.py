@@ -0,0 +1,760 @@
+"""Parallel scenario runner for Sentinel
+
+usage: python -m src.runner [--scenarios DIR] [--workers N] [-k FILTER]
+                            [--plot POLICY | --no-plot] [--render]
+                            [--atol ATOL] [--rtol RTOL] [--match-mode MODE]
+                            [--report-format {csv,jsonl}] [--max-divergences K]
+                            [--profile] [--trace-memory]
+                            [--timings-baseline FILE] [--max-slowdown FACTOR]
+                            [--history DB] [--run-label LABEL]
+                            [--shard i/N] [--update-manifest]
+                            [--no-cache] [--cache-dir DIR]
+"""
+
+import argparse
+import multiprocessing.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.cache import CACHE_DIR_NAME, ResultCache
+from src.cli import add_match_arguments
+from src.helpers import (
+    CoordinateParser,
+    FailureLog,
+    PathMetrics,
+    PlotRenderQueue,
+    PointArray,
+    ResultsBucket,
+    ResultsWriter,
+    TracerSentinel,
+    WorkArea,
+    as_point_array,
+)
+from src.history import HistoryEntry, RunHistory
+from src.instrumentation import (
+    PipelineInstruments,
+    StageRecord,
+    aggregate_stages,
+    find_regressions,
+    load_timings,
+    write_timings_json,
+)
+from src.manifest import (
+    DEFAULT_SCENARIOS_DIR,
+    MANIFEST_FILE_NAME,
+    build_manifest,
+    expected_status,
+    parse_shard,
+    read_manifest,
+    record_runtimes,
+    select_scenarios,
+    write_manifest,
+)
+from src.tracefile import scenario_parser
+
+SUMMARY_FILE_NAME = "run_summary.txt"
+TIMINGS_FILE_NAME = "run_timings.json"
+
+# when plots are rendered during a run, "on-demand" defers them to --render
+PLOT_POLICIES = ("always", "failures", "never", "on-demand")
+
+# results each process inserts into the run history per transaction
+HISTORY_BATCH_SIZE = 64
+
+# per-process state of pool workers: the plot render queue and run history
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+@dataclass(frozen=True)
+class RunOptions:  # pylint: disable=too-many-instance-attributes
+    """settings shared by every scenario of a run"""
+
+    plot_policy: str = "always"
+    atol: float = 0.0
+    rtol: float = 0.0
+    match_mode: str = "sequence"
+    report_format: Optional[str] = None
+    max_divergences: Optional[int] = None
+    profile: bool = False
+    trace_memory: bool = False
+
+
+@dataclass
+class ScenarioResult:  # pylint: disable=too-many-instance-attributes
+    """outcome of one scenario run, small enough to send back from a worker"""
+
+    scenario: str
+    scenario_path: Path
+    overall_status: str
+    expected_status: str
+    failures: List[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    report_file: Optional[Path] = None
+    plot_file: Optional[Path] = None
+    table_file: Optional[Path] = None
+    cached: bool = False
+    metrics: Optional[PathMetrics] = None
+    stages: List[StageRecord] = field(default_factory=list)
+    stages_file: Optional[Path] = None
+    profile_file: Optional[Path] = None
+
+    @property
+    def as_expected(self) -> bool:
+        """true if the scenario ended with its expected outcome"""
+
+        return self.overall_status == self.expected_status
+
+
+@dataclass
+class RunSummary:
+    """aggregated results of a scenario run"""
+
+    results: List[ScenarioResult]
+    elapsed_seconds: float = 0.0
+    regressions: List[str] = field(default_factory=list)
+
+    @property
+    def unexpected(self) -> List[ScenarioResult]:
+        """scenarios whose outcome differs from the expected one"""
+
+        return [r for r in self.results if not r.as_expected]
+
+    @property
+    def stage_totals(self) -> Dict[str, Dict[str, Any]]:
+        """stage timings aggregated over the scenarios that ran (not cached)"""
+
+        return aggregate_stages(
+            (r.scenario, r.stages) for r in self.results if not r.cached
+        )
+
+    def count(self, status: str) -> int:
+        """number of scenarios that ended with the given overall status"""
+
+        return sum(1 for r in self.results if r.overall_status == status)
+
+
+def _should_plot(plot_policy: str, parsing_successful: bool, status: str) -> bool:
+    """whether a scenario's plot is rendered during the run"""
+
+    if plot_policy not in PLOT_POLICIES:
+        raise ValueError(f"Unknown plot policy '{plot_policy}'")
+
+    return parsing_successful and (
+        plot_policy == "always" or (plot_policy == "failures" and status == "FAIL")
+    )
+
+
+def _parse_scenario(
+    scenario_path: Path, instruments: PipelineInstruments
+) -> Tuple[PointArray, PointArray, PointArray, Tuple[FailureLog, ...]]:
+    """parses the files (or archived trace file) of a scenario folder as the parse stage"""
+
+    with instruments.stage("parse") as stage:
+        parser = scenario_parser(scenario_path)
+        rectangle_coords, expected_points, actual_points = parser.get_parsed_arrays()
+        failures = parser.get_failures()
+        stage.points = len(expected_points) + len(actual_points)
+        stage.failures = sum(len(f) for f in failures)
+
+    return rectangle_coords, expected_points, actual_points, failures
+
+
+def _run_pipeline(  # pylint: disable=too-many-locals,too-many-statements
+    scenario_path: Path,
+    options: RunOptions,
+    render_queue: Optional[PlotRenderQueue] = None,
+    history: Optional[RunHistory] = None,
+) -> Tuple[ScenarioResult, ResultsBucket]:
+    """runs the parse, verify and report pipeline for one scenario folder
+
+    every stage is timed, the timings are written to the report and its
+    stages sidecar. with a render queue, the plot is rendered in the
+    background (and not timed) and its file may not exist yet when this
+    returns. with a run history, the results are recorded as a last stage.
+    """
+
+    start = time.perf_counter()
+    instruments = PipelineInstruments(options.profile, options.trace_memory)
+    try:
+        # parse input and output files and check for parsing failures
+        rectangle_coords, expected_points, actual_points, parse_failures = (
+            _parse_scenario(scenario_path, instruments)
+        )
+        rectangle_failures, expected_points_failures, actual_points_failures = (
+            parse_failures
+        )
+
+        verifier_failures: List[str] = []
+        metrics = None
+        parsing_successful = not any(parse_failures)
+
+        # proceed only if parsing was successful
+        if parsing_successful:
+            with instruments.stage("verify") as stage:
+                work_area = WorkArea(rectangle_coords, expected_points)
+                verifier = TracerSentinel(
+                    work_area,
+                    actual_points,
+                    atol=options.atol,
+                    rtol=options.rtol,
+                    match_mode=options.match_mode,
+                )
+                verifier_failures = verifier.run_verification()
+                metrics = verifier.metrics
+                stage.points = len(actual_points)
+                stage.failures = len(verifier_failures)
+
+        has_any_failures = not parsing_successful or bool(verifier_failures)
+        overall_status = "FAIL" if has_any_failures else "PASS"
+
+        results_writer = ResultsWriter(
+            scenario_path,
+            rectangle_coords,
+            atol=options.atol,
+            rtol=options.rtol,
+            report_format=options.report_format,
+            max_divergences=options.max_divergences,
+            match_mode=options.match_mode,
+        )
+        results_bucket = ResultsBucket(
+            expected_points=expected_points,
+            actual_points=actual_points,
+            rectangle_failures=rectangle_failures,
+            expected_points_failures=expected_points_failures,
+            actual_points_failures=actual_points_failures,
+            verifier_failures=verifier_failures,
+            overall_status=overall_status,
+            metrics=metrics,
+        )
+        with instruments.stage("write_results") as stage:
+            results_writer.write_results(results_bucket, stages=instruments.stages)
+            stage.points = max(len(expected_points), len(actual_points))
+
+        plot_file = None
+        if _should_plot(options.plot_policy, parsing_successful, overall_status):
+            if render_queue is None:
+                with instruments.stage("plot") as stage:
+                    plot_file = results_writer.save_plot(
+                        expected_points, actual_points, overall_status
+                    )
+                    stage.points = len(expected_points) + len(actual_points)
+            else:
+                render_queue.submit(
+                    results_writer, expected_points, actual_points, overall_status
+                )
+                plot_file = results_writer.plot_file
+
+        if history is not None:
+            with instruments.stage("history") as stage:
+                results_writer.record_history(history, results_bucket, plot_file)
+                stage.points = max(len(expected_points), len(actual_points))
+    finally:
+        instruments.close()
+
+    scenario_result = ScenarioResult(
+        scenario=scenario_path.name,
+        scenario_path=scenario_path,
+        overall_status=overall_status,
+        expected_status=expected_status(scenario_path),
+        failures=rectangle_failures
+        + expected_points_failures
+        + actual_points_failures
+        + verifier_failures,
+        elapsed_seconds=time.perf_counter() - start,
+        report_file=results_writer.output_file,
+        plot_file=plot_file,
+        table_file=results_writer.table_file,
+        metrics=metrics,
+        stages=instruments.stages,
+        stages_file=instruments.write_sidecar(
+            results_writer.stages_file,
+            scenario=scenario_path.name,
+            overall_status=overall_status,
+        ),
+        profile_file=instruments.write_profile(results_writer.profile_file),
+    )
+    return scenario_result, results_bucket
+
+
+def _result_from_cache(fields: Dict[str, Any], elapsed: float) -> ScenarioResult:
+    """rebuilds a scenario result from its cached (JSON) fields"""
+
+    for name in (
+        "scenario_path",
+        "report_file",
+        "plot_file",
+        "table_file",
+        "stages_file",
+        "profile_file",
+    ):
+        if fields[name] is not None:
+            fields[name] = Path(fields[name])
+    if fields.get("metrics") is not None:
+        fields["metrics"] = PathMetrics(**fields["metrics"])
+    fields["stages"] = [StageRecord(**record) for record in fields["stages"]]
+    fields.update(elapsed_seconds=elapsed, cached=True)
+
+    return ScenarioResult(**fields)
+
+
+def _record_cached_result(
+    history: RunHistory,
+    scenario_result: ScenarioResult,
+    options: RunOptions,
+    cache: ResultCache,
+) -> None:
+    """records a reused result in the current run, from its cached results bucket"""
+
+    results_bucket = cache.load_bucket(scenario_result.scenario_path)
+    if results_bucket is not None:
+        history.add_result(
+            HistoryEntry(
+                scenario_result.scenario,
+                results_bucket,
+                atol=options.atol,
+                rtol=options.rtol,
+                match_mode=options.match_mode,
+                artifacts=(scenario_result.report_file, scenario_result.plot_file),
+            )
+        )
+
+
+def run_scenario(
+    scenario_path: Path,
+    options: Optional[RunOptions] = None,
+    cache: Optional[ResultCache] = None,
+    render_queue: Optional[PlotRenderQueue] = None,
+    history: Optional[RunHistory] = None,
+) -> ScenarioResult:
+    """runs one scenario, or reuses its cached result if its files are unchanged
+
+    plots are rendered in place unless a background render queue is given.
+    with a run history, the result (reused or not) is recorded in its run.
+    """
+
+    options = options or RunOptions()
+    if cache is None:
+        return _run_pipeline(scenario_path, options, render_queue, history)[0]
+
+    start = time.perf_counter()
+    cache_key = cache.scenario_key(scenario_path, asdict(options))
+    cached_fields = cache.lookup(scenario_path, cache_key)
+    if cached_fields is not None:
+        scenario_result = _result_from_cache(cached_fields, 0.0)
+        if history is not None:
+            _record_cached_result(history, scenario_result, options, cache)
+        scenario_result.elapsed_seconds = time.perf_counter() - start
+        return scenario_result
+
+    scenario_result, results_bucket = _run_pipeline(
+        scenario_path, options, render_queue, history
+    )
+    cache.store(
+        scenario_path,
+        cache_key,
+        asdict(scenario_result),
+        results_bucket,
+        [
+            p
+            for p in (
+                scenario_result.report_file,
+                scenario_result.plot_file,
+                scenario_result.table_file,
+                scenario_result.stages_file,
+                scenario_result.profile_file,
+            )
+            if p
+        ],
+    )
+    return scenario_result
+
+
+def _init_worker(history: Optional[RunHistory] = None):
+    """gives each pool worker a background plot renderer, drained at worker exit
+
+    a run history opens one connection per worker, closed (and its queued
+    results inserted) at worker exit.
+    """
+
+    render_queue = PlotRenderQueue()
+    _WORKER_STATE["render_queue"] = render_queue
+    multiprocessing.util.Finalize(None, render_queue.close, exitpriority=10)
+    if history is not None:
+        _WORKER_STATE["history"] = history
+        multiprocessing.util.Finalize(None, history.close, exitpriority=5)
+
+
+def _run_scenario_safely(
+    scenario_path: Path,
+    options: RunOptions,
+    cache: Optional[ResultCache],
+    render_queue: Optional[PlotRenderQueue] = None,
+    history: Optional[RunHistory] = None,
+) -> ScenarioResult:
+    """runs a scenario, turning unexpected exceptions into an ERROR result"""
+
+    start = time.perf_counter()
+    render_queue = render_queue or _WORKER_STATE.get("render_queue")
+    history = history or _WORKER_STATE.get("history")
+    try:
+        return run_scenario(scenario_path, options, cache, render_queue, history)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return ScenarioResult(
+            scenario=scenario_path.name,
+            scenario_path=scenario_path,
+            overall_status="ERROR",
+            expected_status=expected_status(scenario_path),
+            failures=[f"{type(e).__name__}: {e}"],
+            elapsed_seconds=time.perf_counter() - start,
+        )
+
+
+def run_scenarios(
+    scenario_paths: Iterable[Path],
+    workers: Optional[int] = None,
+    options: Optional[RunOptions] = None,
+    cache: Optional[ResultCache] = None,
+    history: Optional[RunHistory] = None,
+) -> Iterator[ScenarioResult]:
+    """fans scenarios out across a process pool and yields results as they finish
+
+    workers defaults to the number of CPUs, workers=1 runs in-process.
+    with a cache, unchanged scenarios reuse their previous results. plots
+    are rendered on a background thread of each process, all of them are
+    written once the iterator is exhausted. with a run history (its run
+    started), every result is recorded in that run, in batches of the
+    history's batch size, by then.
+    """
+
+    scenario_paths = list(scenario_paths)
+    workers = workers or os.cpu_count() or 1
+    options = options or RunOptions()
+
+    if workers == 1 or len(scenario_paths) <= 1:
+        with PlotRenderQueue() as render_queue:
+            for scenario_path in scenario_paths:
+                yield _run_scenario_safely(
+                    scenario_path, options, cache, render_queue, history
+                )
+        if history is not None:
+            history.flush()
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(history,)
+    ) as executor:
+        futures = [
+            executor.submit(_run_scenario_safely, scenario_path, options, cache)
+            for scenario_path in scenario_paths
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def render_scenario_plot(
+    scenario_path: Path,
+    options: Optional[RunOptions] = None,
+    cache: Optional[ResultCache] = None,
+) -> Optional[Path]:
+    """renders the plot of one scenario on demand, None if its files do not parse
+
+    points come from the cached results bucket when there is one, otherwise
+    the scenario files are parsed again.
+    """
+
+    options = options or RunOptions()
+    parser = scenario_parser(scenario_path)
+
+    results_bucket = cache.load_bucket(scenario_path) if cache else None
+    if results_bucket is None or not isinstance(parser, CoordinateParser):
+        rectangle_coords, expected_points, actual_points = parser.get_parsed_arrays()
+    else:
+        # only the rectangle header of the input file is read
+        rectangle_coords = as_point_array(parser.stream_parsed_data()[0])
+        expected_points = as_point_array(results_bucket.expected_points)
+        actual_points = as_point_array(results_bucket.actual_points)
+
+    if any(parser.get_failures()):
+        return None
+
+    results_writer = ResultsWriter(
+        scenario_path,
+        rectangle_coords,
+        atol=options.atol,
+        rtol=options.rtol,
+        match_mode=options.match_mode,
+    )
+    return results_writer.save_plot(
+        expected_points,
+        actual_points,
+        results_bucket.overall_status if results_bucket else None,
+    )
+
+
+def write_summary(summary: RunSummary, summary_file: Path) -> Path:
+    """write the aggregated run summary, in the style of test_results.txt"""
+
+    results = sorted(summary.results, key=lambda r: r.scenario)
+    unexpected = summary.unexpected
+
+    with open(summary_file, "w", encoding="utf-8") as f:
+        f.write("=" * 70 + "\n")
+        f.write(
+            f"RUN SUMMARY: {'PASS' if not unexpected else 'FAIL'} "
+            f"({len(results) - len(unexpected)}/{len(results)} as expected)\n"
+        )
+        f.write("=" * 70 + "\n\n")
+
+        f.write(f"Scenarios: {len(results)}\n")
+        for status in ("PASS", "FAIL", "ERROR"):
+            f.write(f"{status:<10} {summary.count(status)}\n")
+        f.write(f"Cached: {sum(1 for r in results if r.cached)}\n")
+        f.write(f"Wall clock: {summary.elapsed_seconds:.3f} s\n")
+        f.write(f"Scenario time: {sum(r.elapsed_seconds for r in results):.3f} s\n\n")
+
+        # scenarios that did not end with their expected outcome
+        if unexpected:
+            f.write("UNEXPECTED OUTCOMES:\n")
+            f.write("-" * 70 + "\n")
+            for result in unexpected:
+                f.write(
+                    f"  {result.scenario}: expected {result.expected_status}, "
+                    f"got {result.overall_status}\n"
+                )
+                for failure_msg in result.failures:
+                    f.write(f"    {failure_msg}\n")
+            f.write("\n")
+
+        # pipeline stage timings over all scenarios that ran
+        stage_totals = summary.stage_totals
+        if stage_totals:
+            f.write("STAGE TIMINGS:\n")
+            f.write("-" * 70 + "\n")
+            f.write(
+                f"{'Stage':<16} {'Runs':>6} {'Total (s)':>10} {'Mean (s)':>10} "
+                f"{'Max (s)':>10}  Slowest\n"
+            )
+            f.write("-" * 70 + "\n")
+            for name, total in stage_totals.items():
+                f.write(
+                    f"{name:<16} {total['runs']:>6} {total['total_seconds']:>10.3f} "
+                    f"{total['mean_seconds']:>10.4f} {total['max_seconds']:>10.4f}  "
+                    f"{total['slowest']}\n"
+                )
+            f.write("\n")
+
+        if summary.regressions:
+            f.write("STAGE REGRESSIONS:\n")
+            f.write("-" * 70 + "\n")
+            for regression in summary.regressions:
+                f.write(f"  {regression}\n")
+            f.write("\n")
+
+        # per-scenario status and timing
+        f.write("PER-SCENARIO RESULTS:\n")
+        f.write("-" * 70 + "\n")
+        f.write(f"{'Scenario':<50} {'Status':<8} {'Time (s)':>10}\n")
+        f.write("-" * 70 + "\n")
+        for result in results:
+            f.write(
+                f"{result.scenario:<50} {result.overall_status:<8} "
+                f"{result.elapsed_seconds:>10.3f}{' (cached)' if result.cached else ''}\n"
+            )
+
+    return summary_file
+
+
+def main(  # pylint: disable=too-many-locals,too-many-statements,too-many-branches
+    argv: Optional[List[str]] = None,
+) -> int:
+    """command line entry point, non-zero on unexpected outcomes or stage regressions"""
+
+    arg_parser = argparse.ArgumentParser(
+        description="Run Sentinel scenarios in parallel."
+    )
+    arg_parser.add_argument(
+        "--scenarios", type=Path, default=DEFAULT_SCENARIOS_DIR, help="scenarios root"
+    )
+    arg_parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    arg_parser.add_argument(
+        "--plot",
+        dest="plot_policy",
+        choices=PLOT_POLICIES,
+        default="always",
+        help="which scenarios get a PNG plot during the run",
+    )
+    arg_parser.add_argument(
+        "--no-plot",
+        dest="plot_policy",
+        action="store_const",
+        const="never",
+        help="same as --plot never",
+    )
+    arg_parser.add_argument(
+        "--render",
+        action="store_true",
+        help="only render the plots of the selected scenarios (e.g. after --plot on-demand)",
+    )
+    arg_parser.add_argument(
+        "-k", dest="name_filter", default="", help="only run matching scenarios"
+    )
+    arg_parser.add_argument(
+        "--summary", type=Path, default=None, help="summary file path"
+    )
+    add_match_arguments(arg_parser)
+    arg_parser.add_argument(
+        "--report-format",
+        choices=ResultsWriter.REPORT_FORMATS,
+        help="also write the full point table as test_results.csv/.jsonl",
+    )
+    arg_parser.add_argument(
+        "--max-divergences",
+        type=int,
+        metavar="K",
+        help="only list the first K failing rows in test_results.txt",
+    )
+    arg_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="run each scenario under cProfile (test_results.prof)",
+    )
+    arg_parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="record the tracemalloc peak of each stage",
+    )
+    arg_parser.add_argument(
+        "--timings-baseline",
+        type=Path,
+        default=None,
+        help="run_timings.json of a previous run to check stage timings against",
+    )
+    arg_parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=1.5,
+        help="mean stage time factor over the baseline that counts as a regression",
+    )
+    arg_parser.add_argument(
+        "--history",
+        type=Path,
+        default=None,
+        help="record the run in this SQLite run history (see python -m src.history)",
+    )
+    arg_parser.add_argument(
+        "--run-label",
+        default=None,
+        help="label of the recorded run, e.g. the firmware version under test",
+    )
+    arg_parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        metavar="i/N",
+        help="only run shard i of N, balanced by the runtimes in the manifest",
+    )
+    arg_parser.add_argument(
+        "--update-manifest",
+        action="store_true",
+        help="record the runtimes of this run in the scenarios manifest",
+    )
+    arg_parser.add_argument(
+        "--no-cache", action="store_true", help="rerun scenarios even if unchanged"
+    )
+    arg_parser.add_argument(
+        "--cache-dir", type=Path, default=None, help="result cache directory"
+    )
+    args = arg_parser.parse_args(argv)
+    options = RunOptions(
+        plot_policy=args.plot_policy,
+        atol=args.atol,
+        rtol=args.rtol,
+        match_mode=args.match_mode,
+        report_format=args.report_format,
+        max_divergences=args.max_divergences,
+        profile=args.profile,
+        trace_memory=args.trace_memory,
+    )
+
+    manifest = read_manifest(args.scenarios)
+    scenario_paths = select_scenarios(
+        args.scenarios, manifest, args.name_filter, args.shard
+    )
+    if not scenario_paths:
+        print(f"No test scenarios found in {args.scenarios}", file=sys.stderr)
+        return 2
+
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache(args.cache_dir or args.scenarios / CACHE_DIR_NAME)
+
+    if args.render:
+        for scenario_path in scenario_paths:
+            plot_file = render_scenario_plot(scenario_path, options, cache)
+            print(f"{scenario_path.name:<50} {plot_file or 'not plottable'}")
+        return 0
+
+    history = None
+    if args.history is not None:
+        history = RunHistory(args.history, batch_size=HISTORY_BATCH_SIZE)
+        history.start_run(args.run_label)
+
+    start = time.perf_counter()
+    results = []
+    try:
+        for result in run_scenarios(
+            scenario_paths, args.workers, options, cache, history
+        ):
+            if manifest is not None and result.scenario in manifest:
+                result.expected_status = manifest[result.scenario].expected_status
+            marker = "ok" if result.as_expected else "UNEXPECTED"
+            print(
+                f"{result.scenario:<50} {result.overall_status:<6} {marker:<10} "
+                f"{result.elapsed_seconds:.3f}s{' (cached)' if result.cached else ''}"
+            )
+            results.append(result)
+    finally:
+        if history is not None:
+            history.close()
+    summary = RunSummary(results, elapsed_seconds=time.perf_counter() - start)
+    if args.timings_baseline:
+        summary.regressions = find_regressions(
+            summary.stage_totals, load_timings(args.timings_baseline), args.max_slowdown
+        )
+        for regression in summary.regressions:
+            print(regression)
+
+    summary_file = write_summary(
+        summary, args.summary or args.scenarios / SUMMARY_FILE_NAME
+    )
+    timings_file = write_timings_json(
+        summary.stage_totals, summary_file.with_name(TIMINGS_FILE_NAME)
+    )
+    print(f"Summary written to {summary_file}, stage timings to {timings_file}")
+    if history is not None:
+        print(f"Recorded as run {history.run_id} in {args.history}")
+    if args.update_manifest:
+        manifest = build_manifest(args.scenarios, manifest)
+        record_runtimes(
+            manifest,
+            {
+                r.scenario: r.elapsed_seconds
+                for r in results
+                if not r.cached and r.overall_status != "ERROR"
+            },
+        )
+        manifest_file = write_manifest(manifest, args.scenarios / MANIFEST_FILE_NAME)
+        print(f"Runtimes recorded in {manifest_file}")
+
+    return 1 if summary.unexpected or summary.regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,514 @@
+"""Long-lived verification service for a fleet of TraceR arms
+
+a single asyncio server accepts input/output point streams from many arms
+at once over a local TCP or unix socket and verifies them concurrently on
+a process pool, so jobs do not pay interpreter or container startup.
+
+messages are JSON lines. a client opens a job, streams the file contents
+in chunks and ends it, the reply carries the job's results bucket:
+
+    {"op": "verify", "job": "arm-7", "atol": 0.0, "rtol": 0.0}
+    {"op": "input", "job": "arm-7", "data": "Rectangle:\\n(0, 0), ..."}
+    {"op": "output", "job": "arm-7", "data": "(1.5, 2.0)\\n..."}
+    {"op": "end", "job": "arm-7"}
+    <- {"job": "arm-7", "status": "ok", "bucket": {...}, "elapsed_seconds": 0.01}
+
+jobs of one connection may be interleaved, replies arrive as jobs finish.
+
+usage: python -m src.service serve [--host HOST] [--port PORT] [--unix PATH]
+                                   [--workers N] [--max-job-mb MB]
+       python -m src.service verify SCENARIO_DIR [SCENARIO_DIR ...]
+                                    [--host HOST] [--port PORT] [--unix PATH]
+                                    [--atol ATOL] [--rtol RTOL] [--match-mode MODE]
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from src.core import CoordinateParser, ResultsBucket, TracerSentinel, WorkArea
+from src.metrics import PathMetrics
+from src.points import as_point_array
+
+DEFAULT_PORT = 8765
+
+# file contents are streamed in chunks of about this many characters
+_CHUNK_CHARS = 1024 * 1024
+
+# messages are UTF-8 JSON without ASCII escapes, so a character of a chunk
+# takes at most 4 bytes, or 6 if it is a control character escaped as \uXXXX
+_MAX_CHARACTER_BYTES = 6
+
+# longest message line accepted, a chunk plus its job id and JSON framing
+_SERVER_LINE_LIMIT = _MAX_CHARACTER_BYTES * _CHUNK_CHARS + 64 * 1024
+
+# message bytes accepted for one job before it is answered with an error
+DEFAULT_MAX_JOB_BYTES = 1024**3
+
+# replies carrying the point arrays of long traces can be large
+_CLIENT_LINE_LIMIT = 2**30
+
+_BUCKET_FAILURE_FIELDS = (
+    "rectangle_failures",
+    "expected_points_failures",
+    "actual_points_failures",
+    "verifier_failures",
+)
+
+
+def verify_contents(
+    input_content: str,
+    output_content: str,
+    atol: float = 0.0,
+    rtol: float = 0.0,
+    match_mode: str = "sequence",
+) -> ResultsBucket:
+    """parses and verifies one arm's input/output file contents"""
+
+    parser = CoordinateParser(
+        input_file=Path("system_input_file.txt"),
+        output_file=Path("system_output_file.txt"),
+    )
+    rectangle_coords, expected_list, actual_list = parser.parse_contents(
+        input_content, output_content
+    )
+    expected_points = as_point_array(expected_list)
+    actual_points = as_point_array(actual_list)
+
+    verifier_failures: List[str] = []
+    metrics = None
+    if not any(parser.get_failures()):
+        verifier = TracerSentinel(
+            WorkArea(rectangle_coords, expected_points),
+            actual_points,
+            atol=atol,
+            rtol=rtol,
+            match_mode=match_mode,
+        )
+        verifier_failures = verifier.run_verification()
+        metrics = verifier.metrics
+
+    failures = parser.get_failures()
+    return ResultsBucket(
+        expected_points,
+        actual_points,
+        *failures,
+        verifier_failures,
+        "FAIL" if any(failures) or verifier_failures else "PASS",
+        metrics,
+    )
+
+
+def bucket_to_message(bucket: ResultsBucket, include_points: bool) -> Dict[str, Any]:
+    """JSON-ready fields of a results bucket"""
+
+    expected_points = np.asarray(bucket.expected_points)
+    actual_points = np.asarray(bucket.actual_points)
+    message: Dict[str, Any] = {
+        name: list(getattr(bucket, name)) for name in _BUCKET_FAILURE_FIELDS
+    }
+    message["overall_status"] = bucket.overall_status
+    message["metrics"] = asdict(bucket.metrics) if bucket.metrics else None
+    message["expected_count"] = len(expected_points)
+    message["actual_count"] = len(actual_points)
+    if include_points:
+        message["expected_points"] = expected_points.tolist()
+        message["actual_points"] = actual_points.tolist()
+
+    return message
+
+
+def bucket_from_message(message: Dict[str, Any]) -> ResultsBucket:
+    """rebuilds a results bucket, the point arrays are empty unless they were sent"""
+
+    return ResultsBucket(
+        expected_points=as_point_array(message.get("expected_points", [])),
+        actual_points=as_point_array(message.get("actual_points", [])),
+        overall_status=message["overall_status"],
+        metrics=PathMetrics(**message["metrics"]) if message.get("metrics") else None,
+        **{name: message[name] for name in _BUCKET_FAILURE_FIELDS},
+    )
+
+
+def _verify_job(
+    input_content: str,
+    output_content: str,
+    options: Dict[str, Any],
+    include_points: bool,
+) -> Dict[str, Any]:
+    """pool worker entry point, converts in the worker to keep the event loop free"""
+
+    bucket = verify_contents(input_content, output_content, **options)
+    return bucket_to_message(bucket, include_points)
+
+
+@dataclass
+class _Job:
+    """a job whose file contents are still being received"""
+
+    options: Dict[str, Any]
+    include_points: bool
+    input_chunks: List[str] = field(default_factory=list)
+    output_chunks: List[str] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+    received_bytes: int = 0
+    # set once the job was answered with an error, the rest of it is dropped
+    rejected: bool = False
+
+
+class VerificationService:
+    """verifies jobs from any number of connections on a shared process pool"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        max_job_bytes: int = DEFAULT_MAX_JOB_BYTES,
+    ):
+        self._owns_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(workers)
+        self.max_job_bytes = max_job_bytes
+        self.jobs_completed = 0
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        unix_path: Optional[Path] = None,
+    ) -> asyncio.Server:
+        """starts listening on a TCP port (0 picks a free one) or a unix socket"""
+
+        if unix_path is not None:
+            return await asyncio.start_unix_server(
+                self._handle_connection, path=str(unix_path), limit=_SERVER_LINE_LIMIT
+            )
+        return await asyncio.start_server(
+            self._handle_connection, host, port, limit=_SERVER_LINE_LIMIT
+        )
+
+    def close(self) -> None:
+        """shuts the process pool down, if the service created it"""
+
+        if self._owns_executor:
+            self._executor.shutdown()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+        writer.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain()
+
+    async def _finish_job(
+        self, job_id: str, job: _Job, writer: asyncio.StreamWriter
+    ) -> None:
+        """verifies a completely received job on the pool and replies"""
+
+        verify = functools.partial(
+            _verify_job,
+            "".join(job.input_chunks),
+            "".join(job.output_chunks),
+            job.options,
+            job.include_points,
+        )
+        job.input_chunks.clear()
+        job.output_chunks.clear()
+        try:
+            bucket = await asyncio.get_running_loop().run_in_executor(
+                self._executor, verify
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # bad options as well as a broken pool or worker: the client
+            # waits for a reply to every job, so each one gets an answer
+            await self._send(
+                writer,
+                {"job": job_id, "status": "error", "error": f"{type(e).__name__}: {e}"},
+            )
+            return
+
+        self.jobs_completed += 1
+        await self._send(
+            writer,
+            {
+                "job": job_id,
+                "status": "ok",
+                "bucket": bucket,
+                "elapsed_seconds": time.perf_counter() - job.started,
+            },
+        )
+
+    def _handle_message(
+        self, message: Dict[str, Any], jobs: Dict[str, _Job], line_bytes: int
+    ) -> Optional[str]:
+        """applies one message to the connection's open jobs, returns an error if any
+
+        line_bytes is the size of the message line, counted towards the job's limit.
+        """
+
+        op, job_id = message.get("op"), message.get("job")
+        if op not in ("verify", "input", "output", "end"):
+            return f"Unknown op '{op}'"
+        if not isinstance(job_id, str):
+            return "Messages need a string job id"
+
+        if op == "verify":
+            if job_id in jobs:
+                return f"Job '{job_id}' is already open"
+            options: Dict[str, Any] = {
+                name: message[name]
+                for name in ("atol", "rtol", "match_mode")
+                if name in message
+            }
+            jobs[job_id] = _Job(options, bool(message.get("include_points", False)))
+        elif job_id not in jobs:
+            return f"Job '{job_id}' is not open"
+        elif op != "end" and not jobs[job_id].rejected:
+            job = jobs[job_id]
+            job.received_bytes += line_bytes
+            if job.received_bytes > self.max_job_bytes:
+                job.rejected = True
+                job.input_chunks.clear()
+                job.output_chunks.clear()
+                return f"Job '{job_id}' exceeds the limit of {self.max_job_bytes} bytes"
+            chunks = job.input_chunks if op == "input" else job.output_chunks
+            chunks.append(str(message.get("data", "")))
+
+        return None
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """reads messages of one connection until it closes"""
+
+        jobs: Dict[str, _Job] = {}
+        tasks: Set[asyncio.Task] = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    message = None
+                if not isinstance(message, dict):
+                    message = {"job": None}
+                    error: Optional[str] = "Messages must be JSON objects"
+                else:
+                    error = self._handle_message(message, jobs, len(line))
+                if error is not None:
+                    await self._send(
+                        writer,
+                        {"job": message.get("job"), "status": "error", "error": error},
+                    )
+                elif message["op"] == "end":
+                    job = jobs.pop(message["job"])
+                    if job.rejected:
+                        # already answered when it went over the limit
+                        continue
+                    task = asyncio.create_task(
+                        self._finish_job(message["job"], job, writer)
+                    )
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except (ConnectionError, ValueError):
+            # the client went away or sent a line over the limit
+            pass
+        finally:
+            writer.close()
+
+
+class VerificationClient:
+    """stand-in arm client, several jobs may be verified concurrently on one connection"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._reply_task = asyncio.create_task(self._read_replies())
+
+    @classmethod
+    async def connect(
+        cls,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        unix_path: Optional[Path] = None,
+    ) -> "VerificationClient":
+        """connects to a running service"""
+
+        if unix_path is not None:
+            reader, writer = await asyncio.open_unix_connection(
+                str(unix_path), limit=_CLIENT_LINE_LIMIT
+            )
+        else:
+            reader, writer = await asyncio.open_connection(
+                host, port, limit=_CLIENT_LINE_LIMIT
+            )
+        return cls(reader, writer)
+
+    async def _read_replies(self) -> None:
+        """hands every reply to the job waiting for it"""
+
+        while line := await self._reader.readline():
+            reply = json.loads(line)
+            future = self._pending.pop(reply.get("job"), None)
+            if future is not None and not future.done():
+                future.set_result(reply)
+
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(
+                    ConnectionError("Verification service closed the connection")
+                )
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        self._writer.write(
+            json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+        )
+        await self._writer.drain()
+
+    async def verify(  # pylint: disable=too-many-arguments
+        self,
+        job_id: str,
+        input_content: str,
+        output_content: str,
+        include_points: bool = True,
+        **options: Any,
+    ) -> ResultsBucket:
+        """streams one job's file contents and waits for its results bucket
+
+        options are passed on to the verifier (atol, rtol, match_mode).
+        """
+
+        if job_id in self._pending:
+            raise ValueError(f"Job '{job_id}' is already running")
+        future = asyncio.get_running_loop().create_future()
+        self._pending[job_id] = future
+
+        await self._send(
+            {"op": "verify", "job": job_id, "include_points": include_points, **options}
+        )
+        for op, content in (("input", input_content), ("output", output_content)):
+            for start in range(0, len(content), _CHUNK_CHARS):
+                await self._send(
+                    {
+                        "op": op,
+                        "job": job_id,
+                        "data": content[start : start + _CHUNK_CHARS],
+                    }
+                )
+        await self._send({"op": "end", "job": job_id})
+
+        reply = await future
+        if reply["status"] != "ok":
+            raise ValueError(f"Job '{job_id}' failed: {reply['error']}")
+        return bucket_from_message(reply["bucket"])
+
+    async def verify_scenario(
+        self, scenario_path: Path, **options: Any
+    ) -> ResultsBucket:
+        """verifies a scenario folder, the job is named after it"""
+
+        return await self.verify(
+            scenario_path.name,
+            (scenario_path / "system_input_file.txt").read_text(encoding="utf-8"),
+            (scenario_path / "system_output_file.txt").read_text(encoding="utf-8"),
+            **options,
+        )
+
+    async def close(self) -> None:
+        """closes the connection"""
+
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._reply_task
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    service = VerificationService(args.workers, max_job_bytes=args.max_job_mb << 20)
+    server = await service.start(args.host, args.port, args.unix)
+    try:
+        sockets = ", ".join(str(s.getsockname()) for s in server.sockets)
+        print(f"Sentinel verification service listening on {sockets}", flush=True)
+        await server.serve_forever()
+    finally:
+        service.close()
+
+
+async def _verify(args: argparse.Namespace) -> int:
+    client = await VerificationClient.connect(args.host, args.port, args.unix)
+    try:
+        buckets = await asyncio.gather(
+            *(
+                client.verify_scenario(
+                    path,
+                    include_points=False,
+                    atol=args.atol,
+                    rtol=args.rtol,
+                    match_mode=args.match_mode,
+                )
+                for path in args.scenarios
+            )
+        )
+    finally:
+        await client.close()
+
+    for path, bucket in zip(args.scenarios, buckets):
+        print(f"{path.name}: {bucket.overall_status}")
+        for name in _BUCKET_FAILURE_FIELDS:
+            for failure in getattr(bucket, name):
+                print(f"  {failure}")
+
+    return 1 if any(b.overall_status == "FAIL" for b in buckets) else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """command line entry point, verify returns non-zero if any scenario failed"""
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run the service")
+    verify_parser = commands.add_parser("verify", help="verify scenario folders")
+    for command_parser in (serve_parser, verify_parser):
+        command_parser.add_argument("--host", default="127.0.0.1")
+        command_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+        command_parser.add_argument(
+            "--unix", type=Path, help="unix socket path, used instead of TCP"
+        )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="verification processes (default: CPUs)",
+    )
+    serve_parser.add_argument(
+        "--max-job-mb",
+        type=int,
+        default=DEFAULT_MAX_JOB_BYTES >> 20,
+        help="file contents accepted per job, larger jobs are answered with an error",
+    )
+    verify_parser.add_argument("scenarios", type=Path, nargs="+")
+    verify_parser.add_argument("--atol", type=float, default=0.0)
+    verify_parser.add_argument("--rtol", type=float, default=0.0)
+    verify_parser.add_argument(
+        "--match-mode", choices=TracerSentinel.MATCH_MODES, default="sequence"
+    )
+    args = arg_parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    return asyncio.run(_verify(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""Compact binary trace files for archived TraceR runs
+
+a trace file holds one scenario: the rectangle, the expected and actual
+points as packed little-endian float64 pairs and the parsing failures of
+the text files it was converted from. the points are memory-mapped straight
+into point arrays, so re-verifying an archive is bound by I/O rather than
+by text parsing.
+
+layout (all little-endian):
+    header    _HEADER.size bytes, see _HEADER
+    expected  expected_count (x, y) float64 pairs
+    actual    actual_count (x, y) float64 pairs
+    failures  failures_size bytes of UTF-8 JSON, the messages per section
+the checksum is the CRC-32 of everything after the header.
+
+usage: python -m src.tracefile SCENARIO_DIR [SCENARIO_DIR ...] [--output-dir DIR]
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+import zlib
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.core import CoordinateParser, FailureLog
+from src.points import PointArray, as_point_array
+
+TRACE_FILE_NAME = "system_trace.bin"
+TRACE_MAGIC = b"SNTLTRC\x00"
+TRACE_VERSION = 1
+
+# magic, version, header size, rectangle points, rectangle (4 corners),
+# expected count, actual count, failures size, checksum and padding, which
+# keeps the points that follow 8-byte aligned
+_HEADER = struct.Struct("<8sHHI8dQQQI4x")
+_POINT_DTYPE = np.dtype("<f8")
+_FAILURE_SECTIONS = ("rectangle", "expected", "actual")
+
+
+class TraceHeader(NamedTuple):
+    """fixed size header at the start of every trace file"""
+
+    magic: bytes
+    version: int
+    header_size: int
+    rectangle_points: int
+    corners: Tuple[float, ...]
+    expected_count: int
+    actual_count: int
+    failures_size: int
+    checksum: int
+
+    @property
+    def failures_offset(self) -> int:
+        """file offset of the failures section, right after the points"""
+
+        return self.header_size + (self.expected_count + self.actual_count) * 16
+
+
+class TraceData(NamedTuple):
+    """contents of a trace file, the point arrays are read-only memory maps"""
+
+    rectangle: PointArray
+    expected_points: PointArray
+    actual_points: PointArray
+    failures: Tuple[List[str], List[str], List[str]]
+
+
+def write_trace(
+    trace_file: Path,
+    rectangle: Union[PointArray, List[Tuple[float, float]]],
+    expected_points: PointArray,
+    actual_points: PointArray,
+    failures: Sequence[Sequence[str]] = ((), (), ()),
+) -> Path:
+    """writes points and failure messages (rectangle, expected, actual) as a trace"""
+
+    rectangle = as_point_array(rectangle)
+    if len(rectangle) not in (0, 4):
+        raise ValueError(f"A rectangle has 4 corners, got {len(rectangle)}")
+    corners = rectangle if len(rectangle) else np.full((4, 2), np.nan)
+
+    sections = [
+        np.ascontiguousarray(points, dtype=_POINT_DTYPE).reshape(-1, 2)
+        for points in (expected_points, actual_points)
+    ]
+    failures_data = json.dumps(
+        {name: list(messages) for name, messages in zip(_FAILURE_SECTIONS, failures)}
+    ).encode("utf-8")
+
+    checksum = 0
+    with open(trace_file, "wb") as f:
+        # the header is written again once the checksum is known
+        f.write(bytes(_HEADER.size))
+        for section in sections:
+            f.write(section.data)
+            checksum = zlib.crc32(section.data, checksum)
+        f.write(failures_data)
+        checksum = zlib.crc32(failures_data, checksum)
+        f.seek(0)
+        f.write(
+            _HEADER.pack(
+                TRACE_MAGIC,
+                TRACE_VERSION,
+                _HEADER.size,
+                len(rectangle),
+                *corners.ravel().tolist(),
+                len(sections[0]),
+                len(sections[1]),
+                len(failures_data),
+                checksum,
+            )
+        )
+
+    return trace_file
+
+
+def _read_header(buffer: mmap.mmap) -> TraceHeader:
+    """unpacks and checks the header of a mapped trace file"""
+
+    if len(buffer) < _HEADER.size:
+        raise ValueError("File is too short for a trace header")
+
+    fields = _HEADER.unpack_from(buffer, 0)
+    header = TraceHeader._make((*fields[:4], fields[4:12], *fields[12:]))
+    if header.magic != TRACE_MAGIC:
+        raise ValueError("Not a Sentinel trace file")
+    if header.version != TRACE_VERSION or header.header_size != _HEADER.size:
+        raise ValueError(f"Unsupported trace file version {header.version}")
+    if len(buffer) != header.failures_offset + header.failures_size:
+        raise ValueError("Trace file is truncated or has trailing data")
+
+    return header
+
+
+def load_trace(trace_file: Path, verify_checksum: bool = True) -> TraceData:
+    """memory-maps a trace file, raises ValueError if it is not a valid trace
+
+    verifying the checksum reads the whole file once. the map stays open as
+    long as the returned point arrays are referenced.
+    """
+
+    with open(trace_file, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # the map is only handed to the point arrays once the file is valid
+    try:
+        header = _read_header(buffer)
+        if verify_checksum:
+            with memoryview(buffer) as view:
+                if zlib.crc32(view[header.header_size :]) != header.checksum:
+                    raise ValueError("Trace file checksum mismatch")
+        failures = json.loads(buffer[header.failures_offset :].decode("utf-8"))
+    except BaseException:
+        buffer.close()
+        raise
+
+    points = np.frombuffer(
+        buffer,
+        dtype=_POINT_DTYPE,
+        count=(header.expected_count + header.actual_count) * 2,
+        offset=header.header_size,
+    ).reshape(-1, 2)
+
+    return TraceData(
+        rectangle=np.array(header.corners[: header.rectangle_points * 2]).reshape(
+            -1, 2
+        ),
+        expected_points=points[: header.expected_count],
+        actual_points=points[header.expected_count :],
+        failures=(
+            failures["rectangle"],
+            failures["expected"],
+            failures["actual"],
+        ),
+    )
+
+
+def _failure_log(messages: List[str]) -> FailureLog:
+    """failure log holding already rendered (and capped) messages"""
+
+    log = FailureLog(limit=max(len(messages), FailureLog.DEFAULT_LIMIT))
+    for message in messages:
+        log.append(message)
+    return log
+
+
+class TraceFileParser:
+    """reads a trace file, a drop-in for CoordinateParser in the pipeline
+
+    an unreadable trace file is reported as a rectangle failure, like a
+    missing input file.
+    """
+
+    def __init__(self, trace_file: Path, verify_checksum: bool = True):
+        self.trace_file = trace_file
+        self.verify_checksum = verify_checksum
+        self.rectangle_failures = FailureLog()
+        self.expected_points_failures = FailureLog()
+        self.actual_points_failures = FailureLog()
+
+    def get_parsed_arrays(self) -> Tuple[PointArray, PointArray, PointArray]:
+        """returns the rectangle, expected and actual points of the trace"""
+
+        empty = as_point_array([])
+        try:
+            trace = load_trace(self.trace_file, self.verify_checksum)
+        except FileNotFoundError as e:
+            self.rectangle_failures.append(f"File not found: {e.filename}")
+            return empty, empty, empty
+        except ValueError as e:
+            self.rectangle_failures.append(f"Invalid trace file {self.trace_file}: {e}")
+            return empty, empty, empty
+
+        (
+            self.rectangle_failures,
+            self.expected_points_failures,
+            self.actual_points_failures,
+        ) = (_failure_log(messages) for messages in trace.failures)
+        return trace.rectangle, trace.expected_points, trace.actual_points
+
+    def get_failures(self) -> Tuple[FailureLog, FailureLog, FailureLog]:
+        """returns 3 lists of failures: rectangle, expected points, and actual points"""
+
+        return (
+            self.rectangle_failures,
+            self.expected_points_failures,
+            self.actual_points_failures,
+        )
+
+
+def scenario_parser(scenario_path: Path) -> Union[CoordinateParser, TraceFileParser]:
+    """parser of a scenario folder, its trace file once the text files are archived"""
+
+    input_file = scenario_path / "system_input_file.txt"
+    trace_file = scenario_path / TRACE_FILE_NAME
+    if not input_file.exists() and trace_file.exists():
+        return TraceFileParser(trace_file)
+
+    return CoordinateParser(
+        input_file=input_file,
+        output_file=scenario_path / "system_output_file.txt",
+    )
+
+
+def convert_scenario(scenario_path: Path, trace_file: Optional[Path] = None) -> Path:
+    """converts the text files of a scenario folder to a trace file
+
+    the trace is written into the scenario folder unless trace_file is
+    given. parsing failures are kept, so the trace verifies the same way.
+    """
+
+    parser = CoordinateParser(
+        input_file=scenario_path / "system_input_file.txt",
+        output_file=scenario_path / "system_output_file.txt",
+    )
+    rectangle, expected_points, actual_points = parser.get_parsed_arrays()
+    return write_trace(
+        trace_file or scenario_path / TRACE_FILE_NAME,
+        rectangle,
+        expected_points,
+        actual_points,
+        [list(log) for log in parser.get_failures()],
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """command line entry point, converts scenario folders to trace files"""
+
+    arg_parser = argparse.ArgumentParser(
+        description="Convert Sentinel scenario text files to binary trace files."
+    )
+    arg_parser.add_argument(
+        "scenarios", type=Path, nargs="+", help="scenario folders to convert"
+    )
+    arg_parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="write <output-dir>/<scenario>/system_trace.bin instead of in place",
+    )
+    args = arg_parser.parse_args(argv)
+
+    for scenario_path in args.scenarios:
+        trace_file = None
+        if args.output_dir is not None:
+            trace_file = args.output_dir / scenario_path.name / TRACE_FILE_NAME
+            trace_file.parent.mkdir(parents=True, exist_ok=True)
+        trace_file = convert_scenario(scenario_path, trace_file)
+        print(f"{scenario_path.name:<50} {trace_file.stat().st_size:>12} B")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
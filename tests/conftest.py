@@ -1,29 +1,73 @@
 from pathlib import Path
+from typing import Optional
 
 import pytest
 
+from src.manifest import expected_status, parse_shard, read_manifest, select_scenarios
+
 # base directory for all test scenario data
 TEST_SCENARIOS_DIR = Path(__file__).parent.parent / "data" / "scenarios"
 
 
-def get_test_scenarios():
-    """Discovers all test case directories in the data/scenarios folder"""
-    scenarios = []
-    # use glob to find all directories
-    for p in sorted(TEST_SCENARIOS_DIR.glob("*")):
-        if p.is_dir():
-            # the scenario name is the directory name
-            scenario_name = p.name
-            # scenario data is the absolute path to the directory
-            scenarios.append(pytest.param(p, id=scenario_name))
+def pytest_addoption(parser):
+    """adds --shard i/N to run one shard of the scenarios, like the runner"""
+    parser.addoption(
+        "--shard",
+        default=None,
+        help="only run shard i/N of the scenarios, balanced by manifest runtime",
+    )
+
+
+def get_test_scenarios(shard: Optional[str] = None):
+    """Discovers all test case directories in the data/scenarios folder
 
-    if not scenarios:
+    each param is the scenario path and its expected outcome, taken from the
+    manifest if the scenarios root has one, else from the folder name.
+    """
+    try:
+        shard_range = parse_shard(shard) if shard else None
+    except ValueError as e:
+        raise pytest.UsageError(str(e)) from e
+
+    # the manifest lists the scenarios without a directory walk
+    manifest = read_manifest(TEST_SCENARIOS_DIR)
+    scenario_paths = select_scenarios(TEST_SCENARIOS_DIR, manifest, shard=shard_range)
+    if not scenario_paths and shard_range is None:
         raise FileNotFoundError(f"No test scenarios found in {TEST_SCENARIOS_DIR}")
 
-    return scenarios
+    return [
+        pytest.param(
+            (p, manifest[p.name].expected_status if manifest else expected_status(p)),
+            id=p.name,
+        )
+        for p in scenario_paths
+    ]
 
 
-@pytest.fixture(scope="session", params=get_test_scenarios())
-def scenario_data_path(request):
-    """Fixture that yields path to scenario directory"""
+def pytest_generate_tests(metafunc):
+    """parametrizes every test using a scenario fixture over the scenarios"""
+    if "scenario_case" in metafunc.fixturenames:
+        metafunc.parametrize(
+            "scenario_case",
+            get_test_scenarios(metafunc.config.getoption("shard")),
+            indirect=True,
+            scope="session",
+        )
+
+
+@pytest.fixture(name="scenario_case", scope="session")
+def fixture_scenario_case(request):
+    """Fixture that yields the scenario directory and its expected outcome"""
     return request.param
+
+
+@pytest.fixture(scope="session")
+def scenario_data_path(scenario_case):
+    """Fixture that yields path to scenario directory"""
+    return scenario_case[0]
+
+
+@pytest.fixture(scope="session")
+def scenario_expected_status(scenario_case):
+    """Fixture that yields the expected outcome (PASS/FAIL) of the scenario"""
+    return scenario_case[1]
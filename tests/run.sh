@@ -6,6 +6,8 @@ set -euo pipefail
 build=false
 cleanup=false
 test=false
+parallel=false
+shard=""
 test_filter=""
 
 while [[ $# -gt 0 ]]; do
@@ -22,6 +24,14 @@ while [[ $# -gt 0 ]]; do
       test=true
       shift
       ;;
+    --parallel)
+      parallel=true
+      shift
+      ;;
+    --shard)
+      shard="$2"
+      shift 2
+      ;;
     *)
       test_filter="$1"
       shift
@@ -33,6 +43,8 @@ done
 if [[ "$cleanup" == true ]]; then
   echo "Cleaning up previous test results..."
   find data/scenarios -type f -name "test_results*" -delete
+  rm -f data/scenarios/run_summary.txt data/scenarios/run_timings.json
+  rm -rf data/scenarios/.sentinel_cache
 fi
 
 # build container + code quality checks
@@ -43,10 +55,20 @@ if [[ "$build" == true ]]; then
   docker compose run --remove-orphans  test_runner bash qa/codeqc.sh  
 fi
 
+# run scenarios across a process pool
+if [[ "$parallel" == true ]]; then
+  echo "Running scenarios in parallel..."
+  cmd_args=()
+  [[ -n "$test_filter" ]] && cmd_args+=(-k "$test_filter")
+  [[ -n "$shard" ]] && cmd_args+=(--shard "$shard")
+  docker compose run --remove-orphans  test_runner python -m src.runner "${cmd_args[@]}"
+fi
+
 # run pytest
-if [[ "$test" == true ]] || [[ -n "$test_filter" ]]; then
+if [[ "$test" == true ]] || { [[ -n "$test_filter" ]] && [[ "$parallel" == false ]]; }; then
   echo "Running tests..."
   cmd_args=()
   [[ -n "$test_filter" ]] && cmd_args+=(-k "$test_filter")
+  [[ -n "$shard" ]] && cmd_args+=(--shard "$shard")
   docker compose run --remove-orphans  test_runner pytest tests/ "${cmd_args[@]}" -s -v
 fi
\ No newline at end of file
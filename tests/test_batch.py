@@ -0,0 +1,121 @@
+"""Batch verification tests for Sentinel"""
+
+import shutil
+from pathlib import Path
+
+from src.batch import (
+    REPORT_FILE_NAME,
+    BatchSummary,
+    ReferenceInput,
+    main,
+    run_batch,
+    write_batch_report,
+)
+from src.runner import DEFAULT_SCENARIOS_DIR, RunOptions, run_scenario
+
+PASSING = DEFAULT_SCENARIOS_DIR / "pass_points_match_inside_workarea"
+
+
+def _replays(tmp_path: Path) -> list:
+    """output files of several replays of the passing scenario's input"""
+
+    output = (PASSING / "system_output_file.txt").read_text()
+    replays = {
+        "same": output,
+        "reversed": "\n".join(reversed(output.splitlines())) + "\n",
+        "truncated": "\n".join(output.splitlines()[:-1]) + "\n",
+        "corrupted": output + "(1.0, x)\n",
+    }
+    paths = []
+    for name, content in replays.items():
+        path = tmp_path / name / "system_output_file.txt"
+        path.parent.mkdir()
+        path.write_text(content)
+        shutil.copy(PASSING / "system_input_file.txt", path.parent)
+        paths.append(path)
+    return paths
+
+
+def test_batch_matches_runner(tmp_path: Path):
+    """each trace gets the verdict and failures of a full scenario run"""
+
+    output_files = _replays(tmp_path)
+    output_files.append(tmp_path / "missing" / "system_output_file.txt")
+    reference = ReferenceInput(PASSING / "system_input_file.txt")
+
+    serial = list(run_batch(reference, output_files, workers=1))
+    parallel = {r.output_file: r for r in run_batch(reference, output_files, 2)}
+
+    assert [r.overall_status for r in serial] == [
+        "PASS",
+        "FAIL",
+        "FAIL",
+        "FAIL",
+        "FAIL",
+    ]
+    for result in serial:
+        assert parallel[result.output_file].failures == result.failures
+        if result.output_file.parent.exists():
+            scenario = run_scenario(
+                result.output_file.parent, RunOptions(plot_policy="never")
+            )
+            assert result.overall_status == scenario.overall_status
+            assert result.failures == scenario.failures
+            assert repr(result.metrics) == repr(scenario.metrics)
+
+
+def test_batch_shares_prepared_work_area(tmp_path: Path):
+    """the expected side is prepared once, input failures fail every trace"""
+
+    reference = ReferenceInput(
+        PASSING / "system_input_file.txt", atol=0.1, match_mode="visited"
+    )
+    work_area = reference.work_area
+    assert work_area is not None
+    index = work_area.expected_grid_index(0.1, 0.0)
+
+    results = list(run_batch(reference, _replays(tmp_path)[:2], workers=1))
+
+    assert [r.overall_status for r in results] == ["PASS", "PASS"]
+    assert work_area.expected_grid_index(0.1, 0.0) is index
+
+    broken = ReferenceInput(
+        DEFAULT_SCENARIOS_DIR
+        / "fail_invalid_coordinates_expected"
+        / "system_input_file.txt"
+    )
+    result = broken.verify(PASSING / "system_output_file.txt")
+    assert broken.work_area is None
+    assert result.overall_status == "FAIL"
+    assert result.failures == broken.input_failures
+
+
+def test_batch_report(tmp_path: Path):
+    """the combined report counts outcomes and lists failed traces"""
+
+    reference = ReferenceInput(PASSING / "system_input_file.txt")
+    results = list(run_batch(reference, _replays(tmp_path), workers=1))
+    summary = BatchSummary(
+        reference.input_file, len(reference.expected_points), results
+    )
+
+    report = write_batch_report(summary, tmp_path / REPORT_FILE_NAME).read_text()
+
+    assert report.startswith("=" * 70 + "\nBATCH STATUS: FAIL (1/4 traces passed)\n")
+    assert "PASS       1\nFAIL       3\nERROR      0\n" in report
+    assert "FAILED TRACES:" in report
+    assert "Sequence FAIL: Sequence mismatch" in report
+    assert str(tmp_path / "same" / "system_output_file.txt") in report
+
+
+def test_batch_cli(tmp_path: Path):
+    """the CLI exits non-zero unless every trace passes"""
+
+    output_files = [str(p) for p in _replays(tmp_path)]
+    input_file = str(PASSING / "system_input_file.txt")
+    report_file = tmp_path / "report.txt"
+
+    assert main([input_file, output_files[0], "--report", str(report_file)]) == 0
+    assert "BATCH STATUS: PASS (1/1" in report_file.read_text()
+    assert main([input_file, *output_files, "--report", str(report_file)]) == 1
+    assert "BATCH STATUS: FAIL (1/4" in report_file.read_text()
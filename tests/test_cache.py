@@ -0,0 +1,90 @@
+"""Incremental result cache tests for Sentinel"""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from src import cache as cache_module
+from src.cache import ResultCache
+from src.runner import DEFAULT_SCENARIOS_DIR, RunOptions, run_scenario
+
+SCENARIO = "fail_points_mismatch_actual_inside_workarea"
+
+
+def _copy_scenario(tmp_path: Path) -> Path:
+    """copies one scenario so the cache tests can modify it"""
+
+    scenario_path = tmp_path / SCENARIO
+    shutil.copytree(
+        DEFAULT_SCENARIOS_DIR / SCENARIO,
+        scenario_path,
+        ignore=shutil.ignore_patterns("test_results*"),
+    )
+    return scenario_path
+
+
+def test_unchanged_scenario_is_served_from_cache(tmp_path: Path):
+    """a rerun with identical files reuses the stored result and bucket"""
+
+    scenario_path = _copy_scenario(tmp_path)
+    cache = ResultCache(tmp_path / "cache")
+    options = RunOptions(plot_policy="never")
+
+    first = run_scenario(scenario_path, options, cache)
+    second = run_scenario(scenario_path, options, cache)
+
+    assert not first.cached
+    assert second.cached
+    assert second.overall_status == first.overall_status == "FAIL"
+    assert second.failures == first.failures
+    assert second.report_file == first.report_file
+
+    bucket = cache.load_bucket(scenario_path)
+    assert bucket is not None
+    assert bucket.overall_status == "FAIL"
+    assert bucket.verifier_failures == first.failures
+    assert isinstance(bucket.actual_points, np.ndarray)
+    assert bucket.actual_points.shape == (6, 2)
+
+
+def test_changes_invalidate_the_cache(tmp_path: Path):
+    """new output, different settings or a missing report force a rerun"""
+
+    scenario_path = _copy_scenario(tmp_path)
+    cache = ResultCache(tmp_path / "cache")
+    options = RunOptions(plot_policy="never")
+    run_scenario(scenario_path, options, cache)
+
+    # different run settings
+    assert not run_scenario(scenario_path, RunOptions("never", atol=0.5), cache).cached
+
+    # new TraceR output, now matching the expected points
+    input_text = (scenario_path / "system_input_file.txt").read_text()
+    expected_text = input_text.split("Points:", 1)[1]
+    (scenario_path / "system_output_file.txt").write_text(expected_text)
+    rerun = run_scenario(scenario_path, options, cache)
+    assert not rerun.cached
+    assert rerun.overall_status == "PASS"
+    assert run_scenario(scenario_path, options, cache).cached
+
+    # report removed (e.g. by run.sh --cleanup)
+    (scenario_path / "test_results.txt").unlink()
+    assert not run_scenario(scenario_path, options, cache).cached
+    assert (scenario_path / "test_results.txt").exists()
+
+
+def test_report_format_change_invalidates_the_cache(tmp_path: Path, monkeypatch):
+    """reports written in an older layout are regenerated, not served"""
+
+    scenario_path = _copy_scenario(tmp_path)
+    cache = ResultCache(tmp_path / "cache")
+    options = RunOptions(plot_policy="never")
+    run_scenario(scenario_path, options, cache)
+    assert run_scenario(scenario_path, options, cache).cached
+
+    monkeypatch.setattr(
+        cache_module, "REPORT_FORMAT_VERSION", cache_module.REPORT_FORMAT_VERSION + 1
+    )
+    assert not run_scenario(scenario_path, options, cache).cached
+    assert run_scenario(scenario_path, options, cache).cached
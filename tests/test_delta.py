@@ -0,0 +1,162 @@
+"""Delta re-verification tests for Sentinel"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src import delta
+from src.core import CoordinateParser, TracerSentinel, WorkArea
+from src.delta import chunk_file, default_index_file, load_index, main, verify_delta
+from src.generator import generate_scenario
+
+
+@pytest.fixture(name="scenario")
+def fixture_scenario(tmp_path: Path, monkeypatch) -> Path:
+    """a passing generated scenario, chunked about every 16 lines"""
+
+    monkeypatch.setattr(delta, "_BOUNDARY_MASK", 15)
+    monkeypatch.setattr(delta, "MIN_CHUNK_BYTES", 64)
+    monkeypatch.setattr(delta, "MAX_CHUNK_BYTES", 1024)
+    return generate_scenario(tmp_path / "scenario", 2000, 3, "none")
+
+
+def _full_verification(scenario: Path, match_mode: str = "sequence"):
+    """failures and metrics of a full parse and verification of the scenario"""
+
+    parser = CoordinateParser(
+        scenario / "system_input_file.txt", scenario / "system_output_file.txt"
+    )
+    rectangle, expected, actual = parser.get_parsed_arrays()
+    sentinel = TracerSentinel(
+        WorkArea(rectangle, expected), actual, match_mode=match_mode
+    )
+    return list(parser.get_failures()[2]) + sentinel.run_verification(), (
+        sentinel.metrics
+    )
+
+
+def _edit_lines(output_file: Path, edit) -> None:
+    """rewrites the output file with edit applied to its list of lines"""
+
+    lines = output_file.read_text().splitlines()
+    edit(lines)
+    output_file.write_text("".join(f"{line}\n" for line in lines))
+
+
+def _verify(scenario: Path, match_mode: str = "sequence"):
+    """delta verification of the scenario against its previous run"""
+
+    return verify_delta(
+        scenario / "system_input_file.txt",
+        scenario / "system_output_file.txt",
+        match_mode=match_mode,
+    )
+
+
+def test_chunks_are_content_defined(scenario: Path):
+    """chunks cover whole lines, an edit only changes the chunks around it"""
+
+    output_file = scenario / "system_output_file.txt"
+    chunks = chunk_file(output_file)
+    data = output_file.read_bytes()
+
+    assert chunks.starts[0] == 0 and chunks.ends[-1] == len(data)
+    assert (chunks.starts[1:] == chunks.ends[:-1]).all()
+    assert all(data[end - 1 : end] == b"\n" for end in chunks.ends)
+    assert chunks.newlines.sum() == data.count(b"\n")
+
+    _edit_lines(output_file, lambda lines: lines.insert(1000, "(0.5, 0.5)"))
+    edited = set(chunk_file(output_file).hashes.tolist())
+    assert len(set(chunks.hashes.tolist()) - edited) <= 2
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        lambda lines: lines.__setitem__(1200, "(1.0, 2.0)"),
+        lambda lines: lines.insert(700, "(1.0, 2.0)"),
+        lambda lines: lines.__delitem__(slice(300, 340)),
+        lambda lines: lines.__setitem__(1500, "(1.0, 2.0) (3.0, 4.0)"),
+        lambda lines: lines.clear(),
+    ],
+    ids=["replace", "insert", "delete", "invalid", "empty"],
+)
+@pytest.mark.parametrize("match_mode", ["sequence", "visited"])
+def test_delta_matches_full_verification(scenario: Path, edit, match_mode: str):
+    """after an edit, only changed chunks are re-parsed and the outcome is a full run's"""
+
+    baseline = _verify(scenario, match_mode)
+    assert not baseline.baseline and baseline.overall_status == "PASS"
+    assert _verify(scenario, match_mode).reparsed_chunks == 0
+
+    _edit_lines(scenario / "system_output_file.txt", edit)
+    result = _verify(scenario, match_mode)
+    failures, metrics = _full_verification(scenario, match_mode)
+
+    assert result.baseline and result.overall_status == "FAIL"
+    assert result.failures == failures
+    assert str(result.metrics) == str(metrics)
+    assert result.changed and result.reparsed_chunks <= 3
+    assert result.reparsed_chunks < result.chunks or not result.chunks
+
+
+def test_changed_ranges_and_restore(scenario: Path):
+    """changed point ranges map to the previous run, restoring the output passes"""
+
+    output_file = scenario / "system_output_file.txt"
+    original = output_file.read_text()
+    _verify(scenario)
+
+    _edit_lines(output_file, lambda lines: lines.insert(1000, "(1.0, 2.0)"))
+    result = _verify(scenario)
+    (changed,) = result.changed
+    assert changed.start <= 1000 < changed.end
+    assert (
+        changed.end - changed.start == changed.previous_end - changed.previous_start + 1
+    )
+    assert changed.first_line == changed.start + 1
+    assert result.compared_points < result.actual_count
+
+    output_file.write_text(original)
+    restored = _verify(scenario)
+    assert restored.overall_status == "PASS" and not restored.failures
+
+
+def test_index_of_other_settings_is_not_used(scenario: Path):
+    """an index of other tolerances, match mode or input is ignored and replaced"""
+
+    _verify(scenario)
+    index_file = default_index_file(scenario / "system_output_file.txt")
+    assert load_index(index_file).settings["match_mode"] == "sequence"
+
+    assert not _verify(scenario, "visited").baseline
+    assert load_index(index_file).settings["match_mode"] == "visited"
+
+    input_file = scenario / "system_input_file.txt"
+    input_file.write_text(input_file.read_text() + "(9.0, 9.0)\n")
+    result = _verify(scenario, "visited")
+    assert not result.baseline and result.overall_status == "FAIL"
+
+
+def test_missing_output_and_cli(scenario: Path, capsys):
+    """the CLI reports the changed ranges and fails like a full run"""
+
+    input_file = scenario / "system_input_file.txt"
+    output_file = scenario / "system_output_file.txt"
+    args = [str(input_file), str(output_file)]
+
+    assert main(args) == 0
+    assert "verified in full" in capsys.readouterr().out
+
+    _edit_lines(output_file, lambda lines: lines.__setitem__(10, "(1.0, 2.0)"))
+    assert main(args + ["--no-update"]) == 1
+    out = capsys.readouterr().out
+    assert "points [" in out and "OVERALL TEST STATUS: FAIL" in out
+    # the index still holds the passing run
+    assert load_index(default_index_file(output_file)).passed.all()
+
+    missing = verify_delta(input_file, scenario / "missing.txt", update_index=False)
+    assert missing.overall_status == "FAIL"
+    assert any("File not found" in failure for failure in missing.failures)
+    assert np.isfinite(missing.elapsed_seconds)
@@ -0,0 +1,168 @@
+"""Live follow mode tests for Sentinel"""
+
+import os
+import shutil
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from src.follow import FollowEvent, LineFollower, follow_scenario, main
+from src.generator import generate_scenario
+from src.runner import RunOptions, run_scenario
+
+
+def _copy_input(scenario_path: Path, tmp_path: Path) -> Path:
+    """copies a scenario's input file, the output file is written by the test"""
+
+    shutil.copy(scenario_path / "system_input_file.txt", tmp_path)
+    return tmp_path / "system_output_file.txt"
+
+
+def test_follow_matches_full_run(scenario_data_path: Path):
+    """following a finished output file to the end finds the normal run's failures"""
+
+    result = follow_scenario(scenario_data_path, idle_timeout=0.0, stop_on_alarm=False)
+    full_result = run_scenario(scenario_data_path, RunOptions(plot_policy="never"))
+
+    assert set(full_result.failures) <= set(result.failures)
+    assert result.overall_status == full_result.overall_status
+
+
+def test_line_follower_waits_for_lines(tmp_path: Path):
+    """lines are yielded as they are appended, partial lines once completed"""
+
+    path = tmp_path / "growing.txt"
+    writer_done = threading.Event()
+
+    def write():
+        time.sleep(0.05)  # the file does not exist yet when following starts
+        with open(path, "w", encoding="utf-8") as f:
+            for chunk in ("(1, 2)\n(3,", " 4)\n", "(5, 6)"):
+                f.write(chunk)
+                f.flush()
+                time.sleep(0.05)
+        writer_done.set()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    lines = [line for line, _ in LineFollower(path, 0.005, idle_timeout=0.5)]
+    writer.join()
+
+    assert writer_done.is_set()
+    assert lines == ["(1, 2)\n", "(3, 4)\n", "(5, 6)"]
+
+
+def test_follow_alarms_before_output_ends(tmp_path: Path):
+    """the first divergence is reported while the arm is still writing"""
+
+    scenario_path = generate_scenario(tmp_path / "scenario", 50, seed=3)
+    expected_lines = (scenario_path / "system_output_file.txt").read_text().splitlines()
+    live_path = tmp_path / "live"
+    live_path.mkdir()
+    output_file = _copy_input(scenario_path, live_path)
+
+    alarmed = threading.Event()
+    alarms: List[FollowEvent] = []
+    lines_written_at_alarm: List[int] = []
+
+    def on_alarm(event: FollowEvent):
+        alarms.append(event)
+        alarmed.set()
+
+    def write():
+        with open(output_file, "w", encoding="utf-8") as f:
+            for index, line in enumerate(expected_lines):
+                f.write("(0.0, 0.0)\n" if index == 10 else f"{line}\n")
+                f.flush()
+                if index == 10:
+                    # the arm keeps moving until the alarm stops it
+                    alarmed.wait(timeout=5.0)
+                    lines_written_at_alarm.append(index + 1)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    result = follow_scenario(
+        live_path, poll_interval=0.001, idle_timeout=1.0, on_alarm=on_alarm
+    )
+    writer.join()
+
+    assert lines_written_at_alarm == [11]
+    assert [(a.kind, a.position) for a in alarms] == [("bounds", 10)]
+    assert result.stopped_early
+    assert result.overall_status == "FAIL"
+    assert len(result.latencies) == 11
+    assert result.latency_summary()["max_ms"] < 1000.0
+
+
+def test_follow_keep_going_reports_sequence_alarms(tmp_path: Path):
+    """with stop_on_alarm off every diverging point raises its own alarm"""
+
+    scenario_path = generate_scenario(
+        tmp_path / "scenario", 20, seed=5, defect="mismatch"
+    )
+    result = follow_scenario(scenario_path, idle_timeout=0.0, stop_on_alarm=False)
+
+    assert [a.kind for a in result.alarms] == ["sequence"]
+    assert not result.stopped_early
+    assert len(result.latencies) == 20
+    assert any(f.startswith("Sequence FAIL") for f in result.failures)
+
+
+def test_follow_cli(tmp_path: Path, capsys):
+    """the command line exits non-zero and prints the alarm on a failing scenario"""
+
+    passing = generate_scenario(tmp_path / "pass", 10, seed=1)
+    failing = generate_scenario(tmp_path / "fail", 10, seed=1, defect="outside")
+
+    assert main([str(passing), "--idle-timeout", "0"]) == 0
+    assert "ALARM" not in capsys.readouterr().out
+    assert main([str(failing), "--idle-timeout", "0"]) == 1
+    assert capsys.readouterr().out.startswith("BOUNDS ALARM at index")
+
+
+def test_follow_ends_once_every_point_settled(tmp_path: Path):
+    """without an idle timeout, a complete output is followed until it settles"""
+
+    scenario_path = generate_scenario(tmp_path / "scenario", 20, seed=2)
+
+    start = time.perf_counter()
+    result = follow_scenario(scenario_path, poll_interval=0.001, settle_timeout=0.1)
+
+    assert result.overall_status == "PASS"
+    assert len(result.latencies) == 20
+    assert time.perf_counter() - start < 5.0
+
+
+def test_follow_settles_without_final_newline(tmp_path: Path):
+    """the last point is verified even if the output file does not end in a newline"""
+
+    scenario_path = generate_scenario(tmp_path / "scenario", 20, seed=3)
+    output_file = scenario_path / "system_output_file.txt"
+    output_file.write_text(output_file.read_text().rstrip("\n"))
+
+    result = follow_scenario(scenario_path, poll_interval=0.001, settle_timeout=0.1)
+
+    assert result.overall_status == "PASS"
+    assert len(result.latencies) == 20
+
+
+def test_follow_cli_interrupted(tmp_path: Path, capsys):
+    """Ctrl-C stops following and still prints the verdict and latencies"""
+
+    scenario_path = generate_scenario(tmp_path / "scenario", 10, seed=1)
+    output_file = scenario_path / "system_output_file.txt"
+    output_file.write_text("".join(output_file.read_text().splitlines(True)[:5]))
+
+    timer = threading.Timer(0.3, os.kill, (os.getpid(), signal.SIGINT))
+    timer.start()
+    try:
+        assert main([str(scenario_path), "--poll", "0.001"]) == 1
+    finally:
+        timer.cancel()
+
+    out = capsys.readouterr().out
+    assert "Interrupted" in out
+    assert "OVERALL TEST STATUS: FAIL" in out
+    assert "latency over 5 points" in out
@@ -0,0 +1,46 @@
+"""Synthetic scenario generator and hot path benchmark tests for Sentinel"""
+
+from pathlib import Path
+
+import pytest
+
+from benchmarks.hotpaths import STAGES, run_benchmarks
+from src.generator import DEFECTS, generate_scenario, scenario_name
+from src.runner import RunOptions, run_scenario
+
+
+@pytest.mark.parametrize("rotated", [False, True])
+@pytest.mark.parametrize("defect", DEFECTS)
+def test_generated_scenario_outcome(tmp_path: Path, defect: str, rotated: bool):
+    """valid scenarios pass and every defect makes the scenario fail"""
+
+    scenario_path = generate_scenario(
+        tmp_path / scenario_name(200, 7, defect, rotated), 200, 7, defect, rotated
+    )
+    result = run_scenario(scenario_path, RunOptions(plot_policy="never"))
+
+    assert result.overall_status == ("PASS" if defect == "none" else "FAIL")
+    assert result.as_expected
+
+
+def test_generator_is_seeded(tmp_path: Path):
+    """the same seed reproduces the same files, another seed does not"""
+
+    first, second, other = (
+        generate_scenario(tmp_path / name, 100, seed, "mismatch")
+        for name, seed in (("a", 1), ("b", 1), ("c", 2))
+    )
+    for file_name in ("system_input_file.txt", "system_output_file.txt"):
+        assert (first / file_name).read_text() == (second / file_name).read_text()
+        assert (first / file_name).read_text() != (other / file_name).read_text()
+
+
+def test_benchmark_report():
+    """the benchmark reports time and memory of every stage at every size"""
+
+    report = run_benchmarks(sizes=(10, 100), repeat=1)
+
+    assert [(r["stage"], r["points"]) for r in report["results"]] == [
+        (stage, size) for size in (10, 100) for stage in STAGES
+    ]
+    assert all(r["seconds"] >= 0 and r["peak_mib"] >= 0 for r in report["results"])
@@ -0,0 +1,208 @@
+"""Run history tests for Sentinel"""
+
+import pickle
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.core import ResultsBucket
+from src.history import HistoryEntry, RunHistory, main
+from src.metrics import PathMetrics
+from src.runner import DEFAULT_SCENARIOS_DIR
+from src.runner import main as run_main
+
+NAN = float("nan")
+PASSING = "pass_points_match_inside_workarea"
+
+
+def _bucket(actual, status: str, p99: float = NAN) -> ResultsBucket:
+    """results bucket of the expected points (0, 0) ... (3, 0)"""
+
+    expected = [(float(i), 0.0) for i in range(4)]
+    return ResultsBucket(
+        expected_points=expected,
+        actual_points=actual,
+        rectangle_failures=[],
+        expected_points_failures=[],
+        actual_points_failures=[],
+        verifier_failures=[] if status == "PASS" else ["Points mismatch"],
+        overall_status=status,
+        metrics=PathMetrics(4, 0.0, 0.0, p99, 3.0, 3.0, 0, 0),
+    )
+
+
+def test_insert_and_query(tmp_path: Path):
+    """results, divergences and metrics are recorded per run and queried back"""
+
+    history = RunHistory(tmp_path / "history.sqlite")
+    matching = [(float(i), 0.0) for i in range(4)]
+
+    history.start_run("fw-1")
+    history.insert_result("a", _bucket(matching, "PASS", 0.0))
+    history.insert_result("b", _bucket(matching, "PASS", 0.0))
+    history.start_run("fw-2")
+    history.insert_result("a", _bucket(matching, "PASS", 0.0))
+    result_id = history.insert_result(
+        "b", _bucket([(0.0, 0.0), (1.0, 0.5), (NAN, NAN)], "FAIL", 0.5)
+    )
+    history.start_run("fw-3")
+    history.insert_result("b", _bucket(matching, "FAIL"))
+
+    assert [(r.label, r.scenarios, r.failed) for r in history.runs()] == [
+        ("fw-1", 2, 0),
+        ("fw-2", 2, 1),
+        ("fw-3", 1, 1),
+    ]
+    assert [(r.value, r.label) for r in history.newly_failing("fw-1")] == [
+        ("b", "fw-2")
+    ]
+    assert not history.newly_failing("fw-2")
+    assert [r.value for r in history.trend("b", "deviation_p99")] == [0.0, 0.5, None]
+    assert [r.value for r in history.scenario_history("b")] == ["PASS", "FAIL", "FAIL"]
+
+    # rows 1 and 2 mismatch, row 3 is missing from the actual points
+    divergences = history.connection.execute(
+        "SELECT position, expected_x, expected_y, actual_x, actual_y "
+        "FROM divergences WHERE result_id = ? ORDER BY position",
+        (result_id,),
+    ).fetchall()
+    assert divergences == [
+        (1, 1.0, 0.0, 1.0, 0.5),
+        (2, 2.0, 0.0, None, None),
+        (3, 3.0, 0.0, None, None),
+    ]
+    assert history.connection.execute(
+        "SELECT section, message FROM failures WHERE result_id = ?", (result_id,)
+    ).fetchall() == [("verifier", "Points mismatch")]
+
+    with pytest.raises(ValueError, match="Unknown metric"):
+        history.trend("b", "scenario; DROP TABLE runs")
+    with pytest.raises(ValueError, match="No run labelled"):
+        history.newly_failing("fw-0")
+    history.close()
+
+
+def test_divergences_capped_and_counted(tmp_path: Path):
+    """only the first divergences are stored, all of them are counted"""
+
+    history = RunHistory(tmp_path / "history.sqlite")
+    history.start_run()
+    result_id = history.insert_result(
+        "b", _bucket(np.ones((4, 2)), "FAIL"), max_divergences=2
+    )
+
+    connection = history.connection
+    assert connection.execute(
+        "SELECT COUNT(*) FROM divergences WHERE result_id = ?", (result_id,)
+    ).fetchone() == (2,)
+    assert connection.execute(
+        "SELECT divergence_count FROM results WHERE result_id = ?", (result_id,)
+    ).fetchone() == (4,)
+
+
+def test_visited_mode_divergences(tmp_path: Path):
+    """in visited mode only the expected points never visited are divergences"""
+
+    history = RunHistory(tmp_path / "history.sqlite")
+    history.start_run()
+    shuffled = [(3.0, 0.0), (1.0, 0.0), (0.0, 0.0), (2.0, 0.0)]
+    passing = history.insert_result(
+        "a", _bucket(shuffled, "PASS"), match_mode="visited"
+    )
+    failing = history.insert_result(
+        "b", _bucket(shuffled[:2] + [(9.0, 9.0)], "FAIL"), match_mode="visited"
+    )
+
+    def divergences(result_id: int):
+        return history.connection.execute(
+            "SELECT position, expected_x, expected_y, actual_x, actual_y "
+            "FROM divergences WHERE result_id = ? ORDER BY position",
+            (result_id,),
+        ).fetchall()
+
+    assert not divergences(passing)
+    assert divergences(failing) == [
+        (0, 0.0, 0.0, None, None),
+        (2, 2.0, 0.0, None, None),
+    ]
+    assert history.trend("a", "divergence_count")[0].value == 0
+    assert history.trend("b", "divergence_count")[0].value == 2
+
+
+def test_results_inserted_in_batches(tmp_path: Path):
+    """insert_results commits once, added results are inserted batch_size at a time"""
+
+    db = tmp_path / "history.sqlite"
+    history = RunHistory(db, batch_size=3)
+    history.start_run("fw-1")
+    matching = [(float(i), 0.0) for i in range(4)]
+
+    commits = []
+    history.connection.set_trace_callback(
+        lambda statement: commits.append(statement) if statement == "COMMIT" else None
+    )
+    result_ids = history.insert_results(
+        HistoryEntry(name, _bucket(matching, "PASS", 0.0)) for name in "abcd"
+    )
+    assert len(result_ids) == 4 and result_ids == sorted(result_ids)
+    assert len(commits) == 1
+
+    for name in "efgh":
+        history.add_result(HistoryEntry(name, _bucket([], "FAIL")))
+    assert len(commits) == 2
+    assert RunHistory(db).runs()[0].scenarios == 7
+
+    history.close()
+    assert len(commits) == 3
+    assert RunHistory(db).runs()[0][3:] == (8, 4)
+
+
+def test_history_pickles_without_its_connection(tmp_path: Path):
+    """pool workers get the database and current run, and open their own connection"""
+
+    history = RunHistory(tmp_path / "history.sqlite")
+    history.start_run("fw-1")
+
+    copy = pickle.loads(pickle.dumps(history))
+    assert copy.run_id == history.run_id
+    copy.insert_result("a", _bucket([], "FAIL"))
+    copy.close()
+
+    assert history.runs()[0].scenarios == 1
+    with pytest.raises(ValueError, match="No run started"):
+        RunHistory(tmp_path / "history.sqlite").insert_result("a", _bucket([], "FAIL"))
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_runner_records_runs(tmp_path: Path, capsys, workers: str):
+    """the runner records fresh and cached results, the CLI queries them"""
+
+    scenarios_dir = tmp_path / "scenarios"
+    for name in (PASSING, "fail_points_mismatch_actual_inside_workarea"):
+        shutil.copytree(
+            DEFAULT_SCENARIOS_DIR / name,
+            scenarios_dir / name,
+            ignore=shutil.ignore_patterns("test_results*"),
+        )
+    db = tmp_path / "history.sqlite"
+    args = ["--scenarios", str(scenarios_dir), "--no-plot", "--workers", workers]
+
+    assert run_main(args + ["--history", str(db), "--run-label", "fw-1"]) == 0
+    assert run_main(args + ["--history", str(db), "--run-label", "fw-2"]) == 0
+
+    runs = RunHistory(db).runs()
+    assert [(r.label, r.scenarios, r.failed) for r in runs] == [
+        ("fw-1", 2, 1),
+        ("fw-2", 2, 1),
+    ]
+
+    capsys.readouterr()
+    assert main([str(db), "scenario", PASSING]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2 and all(line.endswith("PASS") for line in lines)
+    assert main([str(db), "newly-failing", "fw-1"]) == 0
+    assert capsys.readouterr().out == ""
+    assert main([str(db), "newly-failing", "fw-9"]) == 2
+    assert main([str(tmp_path / "missing.sqlite"), "runs"]) == 2
@@ -0,0 +1,142 @@
+"""Pipeline instrumentation tests for Sentinel"""
+
+import json
+import pstats
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.instrumentation import (
+    StageRecord,
+    aggregate_stages,
+    find_regressions,
+    load_timings,
+    write_timings_json,
+)
+from src.runner import (
+    DEFAULT_SCENARIOS_DIR,
+    TIMINGS_FILE_NAME,
+    RunOptions,
+    main,
+    run_scenario,
+)
+
+PASSING = "pass_points_match_inside_workarea"
+
+
+def test_stages_reported_and_written_to_sidecar(tmp_path: Path):
+    """every stage is timed and counted in the report and its sidecar"""
+
+    scenario_path = tmp_path / PASSING
+    shutil.copytree(
+        DEFAULT_SCENARIOS_DIR / PASSING,
+        scenario_path,
+        ignore=shutil.ignore_patterns("test_results*"),
+    )
+
+    result = run_scenario(scenario_path)
+
+    assert [stage.name for stage in result.stages] == [
+        "parse",
+        "verify",
+        "write_results",
+        "plot",
+    ]
+    assert result.stages[0].points == 12
+    assert all(stage.peak_mib is None for stage in result.stages)
+    assert result.profile_file is None
+    assert result.stages_file is not None
+    sidecar = json.loads(result.stages_file.read_text())
+    assert sidecar["scenario"] == PASSING
+    assert sidecar["overall_status"] == "PASS"
+    assert [stage["name"] for stage in sidecar["stages"]] == [
+        stage.name for stage in result.stages
+    ]
+
+    # the report is written before its own stage ends
+    assert result.report_file is not None
+    report = result.report_file.read_text()
+    assert "STAGE TIMINGS:\n" in report
+    assert "  parse  " in report and "  verify  " in report
+    assert "write_results" not in report
+
+
+def test_profile_and_memory_toggles(tmp_path: Path):
+    """cProfile dumps a profile next to the report, tracemalloc adds stage peaks"""
+
+    scenario_path = tmp_path / PASSING
+    shutil.copytree(
+        DEFAULT_SCENARIOS_DIR / PASSING,
+        scenario_path,
+        ignore=shutil.ignore_patterns("test_results*"),
+    )
+
+    result = run_scenario(
+        scenario_path,
+        RunOptions(plot_policy="never", profile=True, trace_memory=True),
+    )
+
+    assert result.profile_file == scenario_path / "test_results.prof"
+    profile = pstats.Stats(str(result.profile_file))
+    function_names = {func[2] for func in profile.stats}  # type: ignore[attr-defined]
+    assert "run_verification" in function_names
+    assert all(
+        stage.peak_mib is not None and stage.peak_mib > 0 for stage in result.stages
+    )
+    assert result.report_file is not None
+    assert " MiB\n" in result.report_file.read_text()
+
+
+def test_aggregate_and_regressions(tmp_path: Path):
+    """stages aggregate across scenarios and compare with a baseline by mean"""
+
+    totals = aggregate_stages(
+        [
+            ("a", [StageRecord("parse", 0.2, 10, 1), StageRecord("verify", 0.1)]),
+            ("b", [StageRecord("parse", 0.4, 20, 0)]),
+        ]
+    )
+
+    assert list(totals) == ["parse", "verify"]
+    assert totals["parse"]["runs"] == 2
+    assert totals["parse"]["mean_seconds"] == pytest.approx(0.3)
+    assert totals["parse"]["slowest"] == "b"
+    assert totals["parse"]["points"] == 30 and totals["parse"]["failures"] == 1
+
+    baseline = load_timings(write_timings_json(totals, tmp_path / "timings.json"))
+    assert baseline == json.loads(json.dumps(totals))
+    assert not find_regressions(totals, baseline)
+
+    slower = aggregate_stages([("a", [StageRecord("parse", 1.0)])])
+    assert find_regressions(slower, baseline) == [
+        "Stage 'parse' regressed: mean 1.0000 s versus 0.3000 s in the baseline"
+    ]
+    assert not find_regressions(slower, baseline, max_slowdown=4.0)
+
+
+def test_cli_flags_stage_regressions(tmp_path: Path, monkeypatch):
+    """the CLI aggregates stage timings and fails on a regression"""
+
+    scenarios_dir = tmp_path / "scenarios"
+    shutil.copytree(
+        DEFAULT_SCENARIOS_DIR / PASSING,
+        scenarios_dir / PASSING,
+        ignore=shutil.ignore_patterns("test_results*"),
+    )
+    args = ["--scenarios", str(scenarios_dir), "--no-plot", "--no-cache"]
+
+    assert main(args) == 0
+    timings_file = scenarios_dir / TIMINGS_FILE_NAME
+    totals = load_timings(timings_file)
+    assert set(totals) == {"parse", "verify", "write_results"}
+
+    # a baseline far faster than any real run, the stages here are too short
+    # to stand out from timer noise otherwise
+    for total in totals.values():
+        total["mean_seconds"] = 0.0
+    monkeypatch.setattr("src.instrumentation.MIN_REGRESSION_SECONDS", 0.0)
+    baseline_file = write_timings_json(totals, tmp_path / "baseline.json")
+
+    assert main(args + ["--timings-baseline", str(baseline_file)]) == 1
+    assert "STAGE REGRESSIONS:" in (scenarios_dir / "run_summary.txt").read_text()
@@ -0,0 +1,128 @@
+"""Scenario manifest and sharding tests for Sentinel"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.manifest import (
+    DEFAULT_SCENARIOS_DIR,
+    MANIFEST_FILE_NAME,
+    build_manifest,
+    discover_scenarios,
+    load_manifest,
+    main,
+    parse_shard,
+    read_manifest,
+    record_runtimes,
+    select_scenarios,
+    shard_scenarios,
+    stale_entries,
+    write_manifest,
+)
+from src.runner import main as run_main
+
+PASSING = "pass_points_match_inside_workarea"
+
+
+def test_committed_manifest_is_current():
+    """data/scenarios/manifest.json lists the scenario folders as they are"""
+
+    manifest = read_manifest(DEFAULT_SCENARIOS_DIR)
+
+    assert manifest is not None
+    assert not stale_entries(manifest, DEFAULT_SCENARIOS_DIR)
+    assert manifest[PASSING].expected_status == "PASS"
+    assert manifest[PASSING].expected_points == manifest[PASSING].actual_points == 6
+
+
+def test_build_keeps_edits_and_detects_changes(tmp_path: Path):
+    """rebuilding keeps expected outcomes and runtimes, stale folders are reported"""
+
+    for name in (PASSING, "fail_non_convex_workarea"):
+        shutil.copytree(DEFAULT_SCENARIOS_DIR / name, tmp_path / name)
+    manifest = build_manifest(tmp_path)
+    manifest[PASSING].expected_status = "FAIL"
+    record_runtimes(manifest, {PASSING: 2.0, "unlisted": 1.0})
+    record_runtimes(manifest, {PASSING: 1.0})
+    manifest_file = write_manifest(manifest, tmp_path / MANIFEST_FILE_NAME)
+
+    assert load_manifest(manifest_file) == manifest
+    assert manifest[PASSING].runtime_seconds == pytest.approx(1.5)
+    assert manifest["fail_non_convex_workarea"].runtime_seconds is None
+
+    output_file = tmp_path / PASSING / "system_output_file.txt"
+    output_file.write_text(output_file.read_text().rstrip() + "\n(9, 9)\n")
+    shutil.rmtree(tmp_path / "fail_non_convex_workarea")
+    (tmp_path / "new_scenario").mkdir()
+
+    assert stale_entries(manifest, tmp_path) == [
+        "Scenario 'fail_non_convex_workarea' is listed but has no folder",
+        "Scenario 'new_scenario' is not listed",
+        f"Scenario '{PASSING}' changed since the manifest was built",
+    ]
+    assert main(["--scenarios", str(tmp_path), "--check"]) == 1
+
+    rebuilt = build_manifest(tmp_path, manifest)
+    assert rebuilt[PASSING].actual_points == 7
+    assert rebuilt[PASSING].expected_status == "FAIL"
+    assert rebuilt[PASSING].runtime_seconds == pytest.approx(1.5)
+    assert "fail_non_convex_workarea" not in rebuilt
+
+
+@pytest.mark.parametrize(
+    "shard, expected",
+    [("1/1", (1, 1)), ("3/4", (3, 4)), ("0/2", None), ("3/2", None), ("x", None)],
+)
+def test_parse_shard(shard: str, expected):
+    """shards are 1-based i/N"""
+
+    if expected is None:
+        with pytest.raises(ValueError, match="Invalid shard"):
+            parse_shard(shard)
+    else:
+        assert parse_shard(shard) == expected
+
+
+def test_shards_balance_runtime():
+    """shards partition the scenarios with about equal total runtime"""
+
+    runtimes = {"a": 8.0, "b": 7.0, "c": 4.0, "d": 3.0, "e": 2.0, "f": 1.0, "g": None}
+    shards = [shard_scenarios(runtimes, i, 3) for i in (1, 2, 3)]
+
+    assert sorted(sum(shards, [])) == sorted(runtimes)
+    # g counts as the mean runtime of 25 / 6 seconds
+    assert shards == [["a", "e"], ["b", "d"], ["c", "f", "g"]]
+    assert shard_scenarios(dict.fromkeys("abcde"), 2, 2) == ["b", "d"]
+
+
+def test_runner_shards_from_manifest(tmp_path: Path):
+    """runner shards cover every scenario once, with expected outcomes from the manifest"""
+
+    scenarios_dir = tmp_path / "scenarios"
+    shutil.copytree(DEFAULT_SCENARIOS_DIR, scenarios_dir)
+    manifest = read_manifest(scenarios_dir)
+    assert manifest is not None
+
+    shards = [
+        select_scenarios(scenarios_dir, manifest, shard=(i, 3)) for i in (1, 2, 3)
+    ]
+    assert sorted(p.name for shard in shards for p in shard) == [
+        p.name for p in discover_scenarios(scenarios_dir)
+    ]
+
+    # a passing scenario declared as failing is unexpected
+    manifest[PASSING].expected_status = "FAIL"
+    write_manifest(manifest, scenarios_dir / MANIFEST_FILE_NAME)
+    args = ["--scenarios", str(scenarios_dir), "--no-plot", "--no-cache", "-k", "pass"]
+
+    assert run_main(args + ["--shard", "1/1", "--update-manifest"]) == 1
+    updated = json.loads((scenarios_dir / MANIFEST_FILE_NAME).read_text())
+    runtimes = {
+        entry["name"]: entry["runtime_seconds"] for entry in updated["scenarios"]
+    }
+    assert runtimes[PASSING] != manifest[PASSING].runtime_seconds
+    assert runtimes["fail_non_convex_workarea"] == (
+        manifest["fail_non_convex_workarea"].runtime_seconds
+    )
@@ -0,0 +1,116 @@
+"""Tolerance and order-insensitive matching tests for Sentinel"""
+
+import numpy as np
+import pytest
+
+from src.helpers import TracerSentinel, WorkArea, as_point_array
+
+RECTANGLE = [(0.0, 0.0), (100.0, 0.0), (100.0, 100.0), (0.0, 100.0)]
+
+
+def _verifier(expected, actual, **kwargs) -> TracerSentinel:
+    """verifier over a 100x100 work area"""
+
+    return TracerSentinel(
+        WorkArea(RECTANGLE, as_point_array(expected)), as_point_array(actual), **kwargs
+    )
+
+
+def test_sequence_tolerance():
+    """encoder jitter within the tolerance passes, larger deviations fail"""
+
+    rng = np.random.default_rng(1)
+    expected = rng.uniform(1.0, 99.0, size=(1000, 2))
+    jittered = expected + rng.uniform(-0.009, 0.009, size=expected.shape)
+
+    assert _verifier(expected, jittered).run_verification()
+    assert not _verifier(expected, jittered, atol=0.01).run_verification()
+    assert not _verifier(expected, jittered, rtol=0.01).run_verification()
+
+    jittered[600] += 0.02
+    strict = _verifier(expected, jittered, atol=0.01)
+    assert strict.run_verification()
+    assert strict.first_divergence_index == 600
+
+
+def test_lockstep_tolerance_matches_vectorized():
+    """the streamed walk must apply the same tolerance as the array path"""
+
+    expected = [(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)]
+    actual = [(1.004, 0.996), (2.02, 2.0), (3.0, 3.005)]
+
+    vectorized = _verifier(expected, actual, atol=0.005)
+    lockstep = TracerSentinel(WorkArea(RECTANGLE, iter(expected)), iter(actual), 0.005)
+    list(lockstep.iter_verification())
+
+    assert vectorized.run_verification() == lockstep.failures
+    assert lockstep.first_divergence_index == 1
+
+
+def test_visited_mode_ignores_order():
+    """a shuffled visit of all expected points passes in visited mode only"""
+
+    rng = np.random.default_rng(2)
+    expected = rng.uniform(1.0, 99.0, size=(5000, 2))
+    actual = rng.permutation(expected) + rng.uniform(-0.004, 0.004, size=(5000, 2))
+
+    assert _verifier(expected, actual, atol=0.005).run_verification()
+    verifier = _verifier(expected, actual, atol=0.005, match_mode="visited")
+    assert not verifier.run_verification()
+
+    # the nearest match of each actual point is the expected point it came from
+    nearest = verifier.nearest_expected_index
+    assert nearest is not None
+    np.testing.assert_allclose(expected[nearest], actual, atol=0.005)
+
+
+def test_visited_mode_reports_unvisited_and_unexpected_points():
+    """missing expected points and stray actual points both fail"""
+
+    expected = [(1.0, 1.0), (5.0, 5.0), (5.0, 5.0), (9.0, 9.0)]
+    actual = [(9.0, 9.0), (5.0, 5.0), (1.0, 1.0), (1.0, 1.0)]
+
+    assert not _verifier(expected, actual, match_mode="visited").run_verification()
+
+    failures = _verifier(
+        expected, [(9.0, 9.0), (50.0, 50.0), (1.0, 1.0)], match_mode="visited"
+    ).run_verification()
+    assert failures == [
+        "Visit FAIL: 2 expected point(s) never visited, first at index 1 ((5.0, 5.0)).",
+        "Visit FAIL: 1 actual point(s) match no expected point, first at index 1 "
+        "((50.0, 50.0)).",
+    ]
+
+
+def test_visited_mode_matches_brute_force():
+    """grid index lookups must agree with an O(N^2) nearest neighbour search"""
+
+    rng = np.random.default_rng(3)
+    expected = np.round(rng.uniform(0.0, 100.0, size=(400, 2)), 1)
+    actual = np.round(rng.uniform(0.0, 100.0, size=(300, 2)), 1)
+    atol = 2.5
+
+    verifier = _verifier(expected, actual, atol=atol, match_mode="visited")
+    verifier.run_verification()
+
+    deviation = np.abs(actual[:, np.newaxis, :] - expected[np.newaxis, :, :])
+    within = (deviation <= atol).all(axis=2)
+    distance = np.where(within, np.hypot(deviation[..., 0], deviation[..., 1]), np.inf)
+    nearest = verifier.nearest_expected_index
+    assert nearest is not None
+    assert (nearest >= 0).tolist() == within.any(axis=1).tolist()
+    matched = np.flatnonzero(nearest >= 0)
+    np.testing.assert_array_equal(
+        distance[matched, nearest[matched]], distance[matched].min(axis=1)
+    )
+
+
+def test_invalid_match_settings():
+    """unknown modes, negative tolerances and streamed visited mode are rejected"""
+
+    with pytest.raises(ValueError):
+        _verifier([], [], match_mode="fuzzy")
+    with pytest.raises(ValueError):
+        _verifier([], [], atol=-1.0)
+    with pytest.raises(ValueError):
+        list(_verifier([], [], match_mode="visited").iter_verification())
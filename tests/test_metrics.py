@@ -0,0 +1,107 @@
+"""Path metrics tests for Sentinel"""
+
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.cache import ResultCache
+from src.helpers import ResultsBucket, ResultsWriter, TracerSentinel, WorkArea
+from src.metrics import compute_path_metrics
+from src.runner import RunOptions, run_scenario
+
+RECTANGLE = [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)]
+NAN = float("nan")
+
+
+def test_sequence_metrics():
+    """deviations pair points by index, invalid points and gaps are skipped"""
+
+    expected = np.array([(1.0, 1.0), (4.0, 1.0), (4.0, 5.0), (1.0, 5.0), (1.0, 1.0)])
+    actual = np.array([(1.0, 1.0), (4.0, 2.0), (4.0, 2.0), (NAN, NAN), (12.0, 1.0)])
+
+    verifier = TracerSentinel(WorkArea(RECTANGLE, expected), actual)
+    verifier.run_verification()
+    metrics = verifier.metrics
+
+    assert metrics is not None
+    assert metrics.compared_points == 4
+    assert metrics.deviation_max == pytest.approx(11.0)
+    assert metrics.deviation_mean == pytest.approx((0.0 + 1.0 + 3.0 + 11.0) / 4)
+    assert metrics.deviation_p99 == pytest.approx(np.percentile([0, 1, 3, 11], 99))
+    assert metrics.expected_path_length == pytest.approx(14.0)
+    # segments next to the invalid point are not counted
+    assert metrics.actual_path_length == pytest.approx(math.hypot(3.0, 1.0))
+    assert metrics.actual_points_outside == 1
+    assert metrics.actual_dwell_points == 1
+
+
+def test_visited_metrics_use_nearest_match():
+    """in visited mode each actual point is compared with the point it matched"""
+
+    expected = np.array([(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)])
+    actual = np.array([(3.0, 3.1), (1.0, 1.0), (2.1, 2.0), (9.0, 9.0)])
+
+    verifier = TracerSentinel(
+        WorkArea(RECTANGLE, expected), actual, atol=0.2, match_mode="visited"
+    )
+    verifier.run_verification()
+
+    assert verifier.metrics is not None
+    assert verifier.metrics.compared_points == 3
+    assert verifier.metrics.deviation_max == pytest.approx(0.1)
+
+
+def test_empty_metrics():
+    """no compared points give NaN deviations and zero lengths"""
+
+    metrics = compute_path_metrics(
+        np.empty((0, 2)), np.empty((0, 2)), np.empty(0, dtype=bool)
+    )
+
+    assert metrics.compared_points == 0
+    assert math.isnan(metrics.deviation_max)
+    assert metrics.expected_path_length == 0.0
+    assert metrics.actual_dwell_points == 0
+
+
+def test_metrics_reported_and_cached(tmp_path: Path, scenario_data_path: Path):
+    """the runner writes the metrics to the report and keeps them in the cache"""
+
+    cache = ResultCache(tmp_path / "cache")
+    options = RunOptions(plot_policy="never")
+    first = run_scenario(scenario_data_path, options, cache)
+    second = run_scenario(scenario_data_path, options, cache)
+    bucket = cache.load_bucket(scenario_data_path)
+
+    assert second.cached
+    assert bucket is not None
+    # repr, as NaN deviations never compare equal
+    assert repr(second.metrics) == repr(first.metrics) == repr(bucket.metrics)
+    assert first.report_file is not None
+    report = first.report_file.read_text()
+    if first.metrics is None:
+        assert "PATH METRICS:" not in report
+    else:
+        assert f"  {'Compared points':<24} {first.metrics.compared_points}\n" in report
+
+
+def test_metrics_section_format(tmp_path: Path):
+    """metrics are written with six significant digits"""
+
+    expected = np.array([(1.0, 1.0), (2.0, 1.0)])
+    actual = np.array([(1.0, 1.0), (2.0, 1.0 + 1 / 3)])
+    verifier = TracerSentinel(WorkArea(RECTANGLE, expected), actual)
+    failures = verifier.run_verification()
+    writer = ResultsWriter(tmp_path, RECTANGLE)
+    writer.write_results(
+        ResultsBucket(
+            expected, actual, [], [], [], failures, "FAIL", metrics=verifier.metrics
+        )
+    )
+
+    report = writer.output_file.read_text()
+    assert "PATH METRICS:\n" in report
+    assert f"  {'Deviation max':<24} 0.333333\n" in report
+    assert f"  {'Actual path length':<24} 1.05409\n" in report
@@ -0,0 +1,161 @@
+"""Plot policy and background rendering tests for Sentinel"""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.helpers import PlotRenderQueue, ResultsWriter
+from src.runner import (
+    DEFAULT_SCENARIOS_DIR,
+    RunOptions,
+    main,
+    render_scenario_plot,
+    run_scenario,
+)
+
+RECTANGLE = [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)]
+
+
+def _copy_scenario(tmp_path: Path, name: str) -> Path:
+    """copies one scenario so plots are not written into data/scenarios"""
+
+    scenario_path = tmp_path / name
+    shutil.copytree(
+        DEFAULT_SCENARIOS_DIR / name,
+        scenario_path,
+        ignore=shutil.ignore_patterns("test_results*"),
+    )
+    return scenario_path
+
+
+@pytest.mark.parametrize(
+    "plot_policy, name, plotted",
+    [
+        ("always", "pass_points_match_inside_workarea", True),
+        ("failures", "pass_points_match_inside_workarea", False),
+        ("failures", "fail_points_mismatch_actual_inside_workarea", True),
+        ("never", "fail_points_mismatch_actual_inside_workarea", False),
+        ("on-demand", "fail_points_mismatch_actual_inside_workarea", False),
+    ],
+)
+def test_plot_policy(tmp_path: Path, plot_policy: str, name: str, plotted: bool):
+    """only the scenarios selected by the plot policy get a png during the run"""
+
+    scenario_path = _copy_scenario(tmp_path, name)
+    result = run_scenario(scenario_path, RunOptions(plot_policy=plot_policy))
+
+    assert (result.plot_file is not None) == plotted
+    assert bool(list(scenario_path.glob("*.png"))) == plotted
+
+
+def test_unknown_plot_policy(tmp_path: Path):
+    """a misspelled plot policy is rejected instead of silently never plotting"""
+
+    scenario_path = _copy_scenario(tmp_path, "pass_points_match_inside_workarea")
+    with pytest.raises(ValueError):
+        run_scenario(scenario_path, RunOptions(plot_policy="sometimes"))
+
+
+def test_render_on_demand(tmp_path: Path):
+    """--render draws the deferred plot of a scenario, from the cache if present"""
+
+    scenario_path = _copy_scenario(
+        tmp_path, "fail_points_mismatch_actual_inside_workarea"
+    )
+    assert main(["--scenarios", str(tmp_path), "--plot", "on-demand"]) == 0
+    assert not list(scenario_path.glob("*.png"))
+
+    assert main(["--scenarios", str(tmp_path), "--render"]) == 0
+    assert len(list(scenario_path.glob("*.png"))) == 1
+
+    invalid_path = _copy_scenario(tmp_path, "fail_invalid_coordinates_actual")
+    assert render_scenario_plot(invalid_path) is None
+
+
+def test_render_queue_writes_plot(tmp_path: Path):
+    """plots submitted to the queue are all written once it is closed"""
+
+    points = np.array([(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)])
+    scenario_paths = [tmp_path / str(i) for i in range(3)]
+    for scenario_path in scenario_paths:
+        scenario_path.mkdir()
+    writers = [ResultsWriter(p, RECTANGLE) for p in scenario_paths]
+
+    with PlotRenderQueue(workers=2) as render_queue:
+        futures = [render_queue.submit(w, points, points) for w in writers]
+
+    assert [f.result() for f in futures] == [w.plot_file for w in writers]
+    assert all(w.plot_file.exists() for w in writers)
+    assert not render_queue.render_failures
+
+
+def test_large_plots_are_downsampled():
+    """scatter plots of large point arrays draw only every n-th point"""
+
+    max_points = ResultsWriter._MAX_SCATTER_POINTS  # pylint: disable=protected-access
+    downsample = ResultsWriter._downsample  # pylint: disable=protected-access
+    points = np.zeros((max_points * 5 + 1, 2))
+    shown, step = downsample(points)
+
+    assert step == 6
+    assert len(shown) <= max_points
+    assert downsample(points[:10])[1] == 1
+
+
+def test_downsampled_legend_label(tmp_path: Path):
+    """the legend names the share of drawn points"""
+
+    from matplotlib.figure import (  # pylint: disable=import-outside-toplevel
+        Figure,
+    )
+
+    max_points = ResultsWriter._MAX_SCATTER_POINTS  # pylint: disable=protected-access
+    points = np.zeros((max_points * 2 + 1, 2))
+    ax = Figure().add_subplot()
+    writer = ResultsWriter(tmp_path, RECTANGLE)
+    assess = writer._plot_points_and_assess  # pylint: disable=protected-access
+    assess(ax, points, points[:3], "FAIL")
+
+    assert ax.get_legend_handles_labels()[1] == [
+        "Expected Points (1 of every 3)",
+        "Actual Points",
+    ]
+
+
+@pytest.mark.parametrize(
+    "match_mode, assessment", [("sequence", "FAIL"), ("visited", "PASS")]
+)
+def test_plot_assessment_follows_match_mode(
+    tmp_path: Path, match_mode: str, assessment: str
+):
+    """without a given assessment, the plot assesses points like the verifier"""
+
+    from matplotlib.figure import (  # pylint: disable=import-outside-toplevel
+        Figure,
+    )
+
+    expected = np.array([(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)])
+    writer = ResultsWriter(tmp_path, RECTANGLE, match_mode=match_mode)
+    ax = Figure().add_subplot()
+
+    assess = writer._plot_points_and_assess  # pylint: disable=protected-access
+    assert assess(ax, expected, expected[[2, 0, 1]]) == assessment
+    assert assess(ax, expected, expected[[2, 0]]) == "FAIL"
+    assert assess(ax, expected, expected, "UNKNOWN") == "UNKNOWN"
+
+
+def test_runner_plot_matches_report_status(tmp_path: Path, monkeypatch):
+    """the runner passes the report's overall status on to the plot"""
+
+    scenario_path = _copy_scenario(tmp_path, "pass_points_match_inside_workarea")
+    assessments = []
+    monkeypatch.setattr(
+        ResultsWriter,
+        "_configure_plot_appearance",
+        lambda self, ax, assessment: assessments.append(assessment),
+    )
+    result = run_scenario(scenario_path, RunOptions(match_mode="visited"))
+
+    assert assessments == [result.overall_status] == ["PASS"]
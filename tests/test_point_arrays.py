@@ -0,0 +1,85 @@
+"""Point array tests for Sentinel"""
+
+from pathlib import Path
+
+import numpy as np
+
+from src.helpers import (
+    CoordinateParser,
+    ResultsBucket,
+    ResultsWriter,
+    TracerSentinel,
+    WorkArea,
+    as_point_array,
+)
+
+
+def test_array_pipeline_matches_list_pipeline(  # pylint: disable=too-many-locals
+    scenario_data_path: Path, tmp_path: Path
+):
+    """parsed arrays must verify and report exactly like parsed lists"""
+
+    input_file = scenario_data_path / "system_input_file.txt"
+    output_file = scenario_data_path / "system_output_file.txt"
+
+    list_parser = CoordinateParser(input_file, output_file)
+    list_data = list_parser.get_parsed_data()
+    array_parser = CoordinateParser(input_file, output_file)
+    array_data = array_parser.get_parsed_arrays()
+
+    assert array_parser.get_failures() == list_parser.get_failures()
+    for points, array in zip(list_data, array_data):
+        assert array.shape == (len(points), 2)
+        assert array.dtype == np.float64
+        np.testing.assert_array_equal(array, as_point_array(points))
+
+    failures = list_parser.get_failures()
+    parsing_successful = not any(failures)
+    reports = []
+    for rectangle_coords, expected_points, actual_points in (list_data, array_data):
+        verifier_failures = (
+            TracerSentinel(
+                WorkArea(rectangle_coords, expected_points), actual_points
+            ).run_verification()
+            if parsing_successful
+            else []
+        )
+        writer = ResultsWriter(tmp_path, rectangle_coords)
+        writer.write_results(
+            ResultsBucket(
+                expected_points, actual_points, *failures, verifier_failures, "FAIL"
+            )
+        )
+        reports.append(writer.output_file.read_text())
+
+    assert reports[0] == reports[1]
+
+
+def test_vectorized_verification_matches_lockstep():
+    """whole-array checks must report the same failures as the lockstep walk"""
+
+    rectangle = [(0.0, 0.0), (4.0, 0.0), (4.0, 3.0), (0.0, 3.0)]
+    expected = [(1.0, 1.0), (5.0, 1.0), (4.0, 3.0), (2.0, -1.0)]
+    cases = [expected, expected[:2], expected + [(1.0, 1.0)], [(1.0, 1.0)] * 4]
+
+    for actual in cases:
+        vectorized = TracerSentinel(
+            WorkArea(as_point_array(rectangle), as_point_array(expected)),
+            as_point_array(actual),
+        )
+        lockstep = TracerSentinel(WorkArea(rectangle, iter(expected)), iter(actual))
+        list(lockstep.iter_verification())
+
+        assert vectorized.run_verification() == lockstep.failures
+        assert vectorized.first_divergence_index == lockstep.first_divergence_index
+
+
+def test_points_in_bounds_mask():
+    """the mask must agree with point_in_bounds, NaN rows are out of bounds"""
+
+    work_area = WorkArea([(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)], [])
+    points = [(0.0, 0.0), (2.0, 2.0), (1.0, 3.0), (-0.1, 1.0), (float("nan"),) * 2]
+
+    mask = work_area.points_in_bounds(as_point_array(points))
+
+    assert mask.tolist() == [work_area.point_in_bounds(p) for p in points]
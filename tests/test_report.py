@@ -0,0 +1,129 @@
+"""Report writer tests for Sentinel"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.helpers import ResultsBucket, ResultsWriter
+
+RECTANGLE = [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)]
+NAN = float("nan")
+EXPECTED = [(1.0, 1.0), (2.0, 2.0), (3.0, 3.0), (4.0, 4.0), (5.0, 5.0)]
+ACTUAL = [(1.0, 1.0), (2.5, 2.0), (3.0, 3.0), (NAN, NAN)]
+
+
+def _bucket(expected=None, actual=None) -> ResultsBucket:
+    """results bucket with no parsing/verification failures"""
+
+    return ResultsBucket(
+        expected_points=np.array(EXPECTED if expected is None else expected),
+        actual_points=np.array(ACTUAL if actual is None else actual),
+        rectangle_failures=[],
+        expected_points_failures=[],
+        actual_points_failures=[],
+        verifier_failures=[],
+        overall_status="FAIL",
+    )
+
+
+def test_batched_rows_match_single_batch(tmp_path: Path, monkeypatch):
+    """rows split over many write batches give the same table as one batch"""
+
+    points = np.random.default_rng(0).uniform(0, 10, size=(1000, 2)).round(2)
+    writer = ResultsWriter(tmp_path, RECTANGLE)
+    writer.write_results(_bucket(points, points[:-3]))
+    single_batch = writer.output_file.read_text()
+
+    monkeypatch.setattr(ResultsWriter, "_WRITE_BATCH_ROWS", 7)
+    writer.write_results(_bucket(points, points[:-3]))
+
+    assert writer.output_file.read_text() == single_batch
+    assert single_batch.endswith(f"{'-':<20} {'FAIL':<10}\n")
+
+
+def test_truncated_table_lists_first_divergences(tmp_path: Path):
+    """only the first K failing rows are listed, with their row and counts"""
+
+    writer = ResultsWriter(tmp_path, RECTANGLE, max_divergences=2)
+    writer.write_results(_bucket())
+    report = writer.output_file.read_text()
+
+    assert "POINT-BY-POINT COMPARISON (first 2 divergences):" in report
+    assert f"{1:<10} {'(2.0, 2.0)':<20} {'(2.5, 2.0)':<20} {'FAIL':<10}\n" in report
+    assert f"{3:<10} {'(4.0, 4.0)':<20} {'INVALID':<20} {'FAIL':<10}\n" in report
+    assert "(5.0, 5.0)" not in report
+    assert report.endswith(
+        "Showing 2 of 3 divergent rows. 5 rows compared: 2 PASS, 3 FAIL.\n"
+    )
+
+
+def test_csv_point_table(tmp_path: Path):
+    """the csv table has every row, empty fields for missing points"""
+
+    writer = ResultsWriter(tmp_path, RECTANGLE, report_format="csv")
+    writer.write_results(_bucket())
+
+    assert writer.table_file == tmp_path / "test_results.csv"
+    assert writer.table_file.read_text().splitlines() == [
+        "row,expected_x,expected_y,actual_x,actual_y,assessment",
+        "0,1.0,1.0,1.0,1.0,PASS",
+        "1,2.0,2.0,2.5,2.0,FAIL",
+        "2,3.0,3.0,3.0,3.0,PASS",
+        "3,4.0,4.0,nan,nan,FAIL",
+        "4,5.0,5.0,,,FAIL",
+    ]
+
+
+def test_jsonl_point_table(tmp_path: Path):
+    """every jsonl line is a JSON object, invalid and missing points are marked"""
+
+    writer = ResultsWriter(tmp_path, RECTANGLE, report_format="jsonl")
+    writer.write_results(_bucket())
+
+    assert writer.table_file is not None
+    rows = [json.loads(line) for line in writer.table_file.read_text().splitlines()]
+    assert rows[1] == {
+        "row": 1,
+        "expected": [2.0, 2.0],
+        "actual": [2.5, 2.0],
+        "assessment": "FAIL",
+    }
+    assert [r["actual"] for r in rows[3:]] == ["INVALID", None]
+    assert [r["assessment"] for r in rows] == ["PASS", "FAIL", "PASS", "FAIL", "FAIL"]
+
+
+def test_visited_mode_rows_per_expected_point(tmp_path: Path):
+    """in visited mode each expected point passes if visited, in any order"""
+
+    expected = [(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)]
+    writer = ResultsWriter(tmp_path, RECTANGLE, match_mode="visited")
+    writer.write_results(_bucket(expected, [(3.0, 3.0), (1.0, 1.0), (2.0, 2.0)]))
+    table = writer.output_file.read_text().split("POINT-BY-POINT COMPARISON:")[1]
+
+    assert "FAIL" not in table
+    assert f"{'(2.0, 2.0)':<20} {'(2.0, 2.0)':<20} {'PASS':<10}\n" in table
+
+    writer = ResultsWriter(
+        tmp_path, RECTANGLE, report_format="csv", match_mode="visited"
+    )
+    writer.write_results(_bucket(expected, [(3.0, 3.0), (NAN, NAN), (1.0, 1.1)]))
+
+    assert writer.table_file is not None
+    assert writer.table_file.read_text().splitlines()[1:] == [
+        "0,1.0,1.0,,,FAIL",
+        "1,2.0,2.0,,,FAIL",
+        "2,3.0,3.0,3.0,3.0,PASS",
+    ]
+
+
+def test_invalid_report_settings(tmp_path: Path):
+    """unknown formats and negative limits are rejected up front"""
+
+    with pytest.raises(ValueError):
+        ResultsWriter(tmp_path, RECTANGLE, report_format="xml")
+    with pytest.raises(ValueError):
+        ResultsWriter(tmp_path, RECTANGLE, max_divergences=-1)
+    with pytest.raises(ValueError):
+        ResultsWriter(tmp_path, RECTANGLE, match_mode="nearest")
@@ -0,0 +1,75 @@
+"""Parallel runner tests for Sentinel"""
+
+import shutil
+from pathlib import Path
+
+from src.manifest import discover_scenarios
+from src.runner import (
+    DEFAULT_SCENARIOS_DIR,
+    SUMMARY_FILE_NAME,
+    RunOptions,
+    main,
+    run_scenario,
+    run_scenarios,
+)
+
+
+def _copy_scenarios(tmp_path: Path) -> Path:
+    """copies the scenario corpus so runs do not write into data/scenarios"""
+
+    scenarios_dir = tmp_path / "scenarios"
+    shutil.copytree(
+        DEFAULT_SCENARIOS_DIR,
+        scenarios_dir,
+        ignore=shutil.ignore_patterns("test_results*"),
+    )
+    return scenarios_dir
+
+
+def _without_timings(report: str) -> str:
+    """drops the STAGE TIMINGS section, which differs from run to run"""
+
+    head, found, tail = report.partition("STAGE TIMINGS:\n")
+    return head + tail.partition("\n\n")[2] if found else report
+
+
+def test_parallel_run_matches_serial_run(tmp_path: Path):
+    """the process pool must produce the same outcomes and reports as a serial run"""
+
+    scenarios_dir = _copy_scenarios(tmp_path)
+    scenario_paths = discover_scenarios(scenarios_dir)
+
+    options = RunOptions(plot_policy="never")
+    parallel = {
+        r.scenario: r for r in run_scenarios(scenario_paths, workers=2, options=options)
+    }
+    parallel_reports = {
+        name: r.report_file.read_text() for name, r in parallel.items() if r.report_file
+    }
+    serial = {p.name: run_scenario(p, options) for p in scenario_paths}
+
+    assert sorted(parallel) == sorted(serial)
+    for name, result in serial.items():
+        assert result.report_file is not None
+        assert parallel[name].overall_status == result.overall_status
+        assert parallel[name].as_expected
+        assert _without_timings(parallel_reports[name]) == _without_timings(
+            result.report_file.read_text()
+        )
+
+
+def test_cli_writes_summary(tmp_path: Path):
+    """the CLI runs filtered scenarios and writes one aggregate summary"""
+
+    scenarios_dir = _copy_scenarios(tmp_path)
+
+    exit_code = main(
+        ["--scenarios", str(scenarios_dir), "--workers", "2", "--no-plot", "-k", "pass"]
+    )
+
+    summary = (scenarios_dir / SUMMARY_FILE_NAME).read_text()
+    assert exit_code == 0
+    assert "RUN SUMMARY: PASS" in summary
+    assert "pass_points_match_inside_workarea" in summary
+    assert "fail_" not in summary
+    assert not list(scenarios_dir.glob("*/test_results_*.png"))
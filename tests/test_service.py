@@ -0,0 +1,219 @@
+"""Verification service tests for Sentinel"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src import service as service_module
+from src.core import CoordinateParser
+from src.manifest import discover_scenarios
+from src.runner import RunOptions, run_scenario
+from src.service import VerificationClient, VerificationService, main
+
+SCENARIOS_DIR = Path(__file__).parent.parent / "data" / "scenarios"
+
+
+def test_service_matches_runner():
+    """concurrent jobs of one connection give the same verdicts as the runner"""
+
+    scenario_paths = discover_scenarios(SCENARIOS_DIR)
+
+    async def verify_all():
+        service = VerificationService(workers=2)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            client = await VerificationClient.connect(port=port)
+            buckets = await asyncio.gather(
+                *(client.verify_scenario(path) for path in scenario_paths)
+            )
+            await client.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+        return buckets, service.jobs_completed
+
+    buckets, jobs_completed = asyncio.run(verify_all())
+
+    assert jobs_completed == len(scenario_paths)
+    for path, bucket in zip(scenario_paths, buckets):
+        result = run_scenario(path, RunOptions(plot_policy="never"))
+        assert bucket.overall_status == result.overall_status
+        assert (
+            bucket.rectangle_failures
+            + bucket.expected_points_failures
+            + bucket.actual_points_failures
+            + bucket.verifier_failures
+        ) == result.failures
+
+        _, expected_points, actual_points = CoordinateParser(
+            path / "system_input_file.txt", path / "system_output_file.txt"
+        ).get_parsed_arrays()
+        np.testing.assert_array_equal(bucket.expected_points, expected_points)
+        np.testing.assert_array_equal(bucket.actual_points, actual_points)
+
+
+def test_service_unix_socket_and_errors(tmp_path: Path):
+    """protocol errors are answered without dropping the connection"""
+
+    socket_path = tmp_path / "sentinel.sock"
+    scenario_path = SCENARIOS_DIR / "pass_points_match_inside_workarea"
+
+    async def exchange():
+        service = VerificationService(executor=ThreadPoolExecutor(1))
+        server = await service.start(unix_path=socket_path)
+        replies = []
+        try:
+            reader, writer = await asyncio.open_unix_connection(str(socket_path))
+            for message in (
+                b"not json\n",
+                b'{"op": "input", "job": "arm-1", "data": "(1, 2)"}\n',
+                b'{"op": "launch", "job": "arm-1"}\n',
+            ):
+                writer.write(message)
+                replies.append(json.loads(await reader.readline()))
+            writer.close()
+            await writer.wait_closed()
+
+            client = await VerificationClient.connect(unix_path=socket_path)
+            with pytest.raises(ValueError, match="Unknown match mode"):
+                await client.verify_scenario(scenario_path, match_mode="nearest")
+            bucket = await client.verify_scenario(
+                scenario_path, include_points=False, atol=0.1
+            )
+            await client.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+        return replies, bucket
+
+    replies, bucket = asyncio.run(exchange())
+
+    assert [reply["error"] for reply in replies] == [
+        "Messages must be JSON objects",
+        "Job 'arm-1' is not open",
+        "Unknown op 'launch'",
+    ]
+    assert bucket.overall_status == "PASS"
+    assert bucket.expected_points.shape == (0, 2)
+
+
+def test_service_answers_worker_failures(monkeypatch):
+    """a job whose worker fails in any way is answered with an error"""
+
+    def failing_job(*_):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(service_module, "_verify_job", failing_job)
+    scenario_path = SCENARIOS_DIR / "pass_points_match_inside_workarea"
+
+    async def exchange():
+        service = VerificationService(executor=ThreadPoolExecutor(1))
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            client = await VerificationClient.connect(port=port)
+            with pytest.raises(ValueError, match="OSError: No space left"):
+                await asyncio.wait_for(client.verify_scenario(scenario_path), 10)
+            await client.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+        return service.jobs_completed
+
+    assert asyncio.run(exchange()) == 0
+
+
+def test_service_accepts_non_ascii_chunks():
+    """chunks of multi-byte and escaped characters fit the server's line limit"""
+
+    scenario_path = SCENARIOS_DIR / "pass_points_match_inside_workarea"
+    input_content = (scenario_path / "system_input_file.txt").read_text()
+    chunk_chars = service_module._CHUNK_CHARS  # pylint: disable=protected-access
+    output_content = (
+        "(1.0, 2.0)\n"
+        + "# café 😀" * (chunk_chars // 8)
+        + "\n"
+        + "\x01" * chunk_chars
+        + "\n(3.0, 4.0)\n"
+    )
+
+    async def exchange():
+        service = VerificationService(executor=ThreadPoolExecutor(1))
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            client = await VerificationClient.connect(port=port)
+            bucket = await asyncio.wait_for(
+                client.verify("arm-1", input_content, output_content), 60
+            )
+            await client.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+        return bucket
+
+    bucket = asyncio.run(exchange())
+    direct = service_module.verify_contents(input_content, output_content)
+
+    assert bucket.overall_status == direct.overall_status == "FAIL"
+    assert bucket.actual_points_failures == direct.actual_points_failures
+    np.testing.assert_array_equal(bucket.actual_points, direct.actual_points)
+
+
+def test_service_limits_job_size():
+    """a job over the byte limit is answered with an error, others still run"""
+
+    scenario_path = SCENARIOS_DIR / "pass_points_match_inside_workarea"
+    input_content = (scenario_path / "system_input_file.txt").read_text()
+    output_content = (scenario_path / "system_output_file.txt").read_text()
+
+    async def exchange():
+        service = VerificationService(
+            executor=ThreadPoolExecutor(1), max_job_bytes=1024
+        )
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            client = await VerificationClient.connect(port=port)
+            with pytest.raises(ValueError, match="exceeds the limit of 1024 bytes"):
+                await asyncio.wait_for(
+                    client.verify("arm-1", input_content, output_content * 20), 10
+                )
+            # the rejected job is closed, its id can be used again
+            bucket = await asyncio.wait_for(
+                client.verify("arm-1", input_content, output_content), 10
+            )
+            await client.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+        return bucket, service.jobs_completed
+
+    bucket, jobs_completed = asyncio.run(exchange())
+
+    assert bucket.overall_status == "PASS"
+    assert jobs_completed == 1
+
+
+def test_service_cli_verify_needs_a_service(tmp_path: Path):
+    """the stand-in client fails clearly when no service is listening"""
+
+    with pytest.raises(OSError):
+        main(
+            [
+                "verify",
+                str(SCENARIOS_DIR / "pass_points_match_inside_workarea"),
+                "--unix",
+                str(tmp_path / "missing.sock"),
+            ]
+        )
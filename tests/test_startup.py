@@ -0,0 +1,12 @@
+"""Startup tests: verification must not pull in the plotting stack"""
+
+import pytest
+
+from benchmarks.startup import VERIFICATION_MODULES, measure_import
+
+
+@pytest.mark.parametrize("module", VERIFICATION_MODULES)
+def test_verification_imports_without_matplotlib(module: str):
+    """importing a verification entry point in a fresh process skips matplotlib"""
+
+    assert not measure_import(module, repeat=1)["loads_matplotlib"]
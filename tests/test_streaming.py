@@ -0,0 +1,234 @@
+"""Streaming parser tests for Sentinel"""
+
+import random
+import re
+from pathlib import Path
+
+import numpy as np
+
+from src.core import _is_regular_point_block
+from src.helpers import (
+    CoordinateParser,
+    FailureLog,
+    ResultsBucket,
+    ResultsWriter,
+    TracerSentinel,
+    WorkArea,
+    as_point_array,
+    iter_point_verdicts,
+)
+
+
+def test_streaming_parse_matches_full_parse(scenario_data_path: Path):
+    """streamed points and failures must match the in-memory parser"""
+
+    input_file = scenario_data_path / "system_input_file.txt"
+    output_file = scenario_data_path / "system_output_file.txt"
+
+    full_parser = CoordinateParser(input_file, output_file)
+    full_data = full_parser.get_parsed_data()
+
+    stream_parser = CoordinateParser(input_file, output_file)
+    rectangle_coords, expected_iter, actual_iter = stream_parser.stream_parsed_data()
+    stream_data = (rectangle_coords, list(expected_iter), list(actual_iter))
+
+    assert repr(stream_data) == repr(full_data)
+    assert stream_parser.get_failures() == full_parser.get_failures()
+
+
+def test_streaming_parse_missing_files(tmp_path: Path):
+    """missing files are reported in the same failure lists"""
+
+    parser = CoordinateParser(tmp_path / "missing_in.txt", tmp_path / "missing_out.txt")
+    rectangle_coords, expected_iter, actual_iter = parser.stream_parsed_data()
+
+    assert not rectangle_coords
+    assert not list(expected_iter)
+    assert not list(actual_iter)
+    rectangle_failures, expected_failures, actual_failures = parser.get_failures()
+    assert rectangle_failures[0].startswith("File not found:")
+    assert not expected_failures
+    assert actual_failures[0].startswith("File not found:")
+
+
+def test_lockstep_pipeline_matches_list_pipeline(  # pylint: disable=too-many-locals
+    scenario_data_path: Path, tmp_path: Path
+):
+    """a single streaming pass must write the same report as the list pipeline"""
+
+    input_file = scenario_data_path / "system_input_file.txt"
+    output_file = scenario_data_path / "system_output_file.txt"
+
+    # list pipeline, as in test_tracer
+    parser = CoordinateParser(input_file, output_file)
+    rectangle_coords, expected_points, actual_points = parser.get_parsed_data()
+    failures = parser.get_failures()
+    verifier_failures = []
+    if not any(failures):
+        verifier = TracerSentinel(
+            WorkArea(rectangle_coords, expected_points), actual_points
+        )
+        verifier_failures = verifier.run_verification()
+    overall_status = "FAIL" if any(failures) or verifier_failures else "PASS"
+    list_writer = ResultsWriter(tmp_path, rectangle_coords)
+    list_writer.output_file = tmp_path / "list_results.txt"
+    list_writer.write_results(
+        ResultsBucket(
+            expected_points, actual_points, *failures, verifier_failures, overall_status
+        )
+    )
+
+    # streaming pipeline: parse, verify and tabulate in one lockstep walk
+    stream_parser = CoordinateParser(input_file, output_file)
+    rectangle_coords, expected_iter, actual_iter = stream_parser.stream_parsed_data()
+    stream_verifier = None
+    if rectangle_coords:
+        stream_verifier = TracerSentinel(
+            WorkArea(rectangle_coords, expected_iter), actual_iter
+        )
+        verdicts = stream_verifier.iter_verification()
+    else:
+        verdicts = iter_point_verdicts(expected_iter, actual_iter)
+
+    stream_writer = ResultsWriter(tmp_path, rectangle_coords)
+    stream_writer.output_file = tmp_path / "stream_results.txt"
+    with ResultsWriter.spool_comparison(verdicts) as comparison:
+        failures = stream_parser.get_failures()
+        verifier_failures = []
+        if stream_verifier is not None and not any(failures):
+            verifier_failures = stream_verifier.failures
+        overall_status = "FAIL" if any(failures) or verifier_failures else "PASS"
+        stream_writer.write_results(
+            ResultsBucket([], [], *failures, verifier_failures, overall_status),
+            comparison=comparison,
+        )
+
+    assert stream_writer.output_file.read_text() == list_writer.output_file.read_text()
+
+
+# lines of every kind the block fast path must accept or hand to the per-line parser
+_LINE_VARIANTS = [
+    "(1.41, 6.38)",
+    "\t( +2 ,-3.5 )  ",
+    "",
+    "   ",
+    "(1.41, 6.38)(2.49, 9.08)",
+    "(1., 2.0)",
+    "(1.41; 6.38)",
+    "(1.41, 6.38",
+    "1.41, 6.38",
+    "(١.5, 2.0)",
+    "(1.41, 6.38)",
+    "(" + "9" * 400 + ", 1.0)",
+    "Points:",
+]
+
+
+def test_block_parser_matches_line_parser(  # pylint: disable=too-many-locals
+    tmp_path: Path, monkeypatch
+):
+    """bulk parsed blocks give the same points and failures as line by line"""
+
+    rng = random.Random(12)
+    input_file = tmp_path / "system_input_file.txt"
+    output_file = tmp_path / "system_output_file.txt"
+    # small blocks, so a file has clean blocks as well as irregular ones
+    monkeypatch.setattr(CoordinateParser, "_BLOCK_SIZE", 64)
+
+    for _ in range(50):
+        lines = [
+            (
+                rng.choice(_LINE_VARIANTS[:2])
+                if rng.random() < 0.8
+                else rng.choice(_LINE_VARIANTS)
+            )
+            for _ in range(rng.randrange(0, 40))
+        ]
+        newline = rng.choice(["\n", "\r\n"])
+        points_text = newline.join(lines) + rng.choice(["", newline])
+        input_file.write_bytes(
+            b"Rectangle:\n(0, 0), (10, 0), (10, 10), (0, 10)\nPoints:"
+            + points_text.encode("utf-8")
+        )
+        output_file.write_bytes(points_text.encode("utf-8"))
+
+        stream_parser = CoordinateParser(input_file, output_file)
+        rectangle_coords, expected_iter, actual_iter = (
+            stream_parser.stream_parsed_data()
+        )
+        stream_data = (rectangle_coords, list(expected_iter), list(actual_iter))
+        array_parser = CoordinateParser(input_file, output_file)
+        array_data = array_parser.get_parsed_arrays()
+        full_parser = CoordinateParser(input_file, output_file)
+        full_data = full_parser.get_parsed_data()
+
+        assert array_parser.get_failures() == stream_parser.get_failures()
+        assert full_parser.get_failures() == stream_parser.get_failures()
+        assert repr(full_data) == repr(stream_data)
+        for points, array in zip(stream_data, array_data):
+            np.testing.assert_array_equal(array, as_point_array(points))
+
+
+def test_failure_log_is_compact_and_capped(tmp_path: Path):
+    """every bad line is recorded with its line number, only a few are rendered"""
+
+    lines = ["(1, 2)"] * 3 + ["(1, y)"] * 250 + ["(1, 2)(3, 4)"] * 50
+    input_file = tmp_path / "system_input_file.txt"
+    output_file = tmp_path / "system_output_file.txt"
+    input_file.write_text(
+        "Rectangle:\n(0, 0), (10, 0), (10, 10), (0, 10)\nPoints:\n" + "\n".join(lines)
+    )
+    output_file.write_text("\n".join(lines))
+
+    def parse_streamed(parser):
+        for points in parser.stream_parsed_data()[1:]:
+            list(points)
+
+    for parse in (
+        CoordinateParser.get_parsed_arrays,
+        CoordinateParser.get_parsed_data,
+        parse_streamed,
+    ):
+        parser = CoordinateParser(input_file, output_file)
+        parse(parser)
+        for failures, first_line in (
+            (parser.expected_points_failures, 4),
+            (parser.actual_points_failures, 1),
+        ):
+            assert len(failures) == 300
+            assert [line for line, _ in failures.records()] == list(
+                range(first_line + 3, first_line + 303)
+            )
+            messages = list(failures)
+            assert len(messages) == FailureLog.DEFAULT_LIMIT + 1
+            assert messages[0] == (
+                f"Invalid coordinate format at line {first_line + 3}: '(1, y)'"
+            )
+            assert messages[-1] == (
+                "200 more failures not shown "
+                "(50 multiple coordinates, 150 invalid format)."
+            )
+
+
+def test_block_scanner_matches_line_regex():
+    """the bulk scanner accepts exactly the blank or plain ASCII (x, y) lines"""
+
+    number = r"[+\-]?[0-9]+(?:\.[0-9]+)?"
+    line_regex = re.compile(
+        rf"[ \t]*(?:\([ \t]*{number}[ \t]*,[ \t]*{number}[ \t]*\)[ \t]*)?"
+    )
+    rng = random.Random(3)
+    alphabet = "0123456789.+-(), \t" + "()1, .-" * 3
+
+    for _ in range(3000):
+        if rng.random() < 0.5:
+            line = "".join(rng.choice(alphabet) for _ in range(rng.randrange(12)))
+        else:
+            # mutate a regular line at one position
+            line = list(rng.choice(["(1.5, -2)", " ( +10 ,3.25 ) ", "(0,0)"]))
+            line.insert(rng.randrange(len(line) + 1), rng.choice(alphabet + "x"))
+            line = "".join(line)
+
+        block = f"(1, 2)\n{line}\n(3, 4)".encode("ascii")
+        raw = np.frombuffer(block, dtype=np.uint8)
+        assert _is_regular_point_block(raw) == bool(line_regex.fullmatch(line)), line
@@ -0,0 +1,161 @@
+"""Binary trace file tests for Sentinel"""
+
+import mmap
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src import tracefile
+from src.core import CoordinateParser
+from src.manifest import DEFAULT_SCENARIOS_DIR, discover_scenarios
+from src.runner import RunOptions
+from src.runner import main as run_main
+from src.runner import run_scenario
+from src.tracefile import (
+    TRACE_FILE_NAME,
+    TraceFileParser,
+    convert_scenario,
+    load_trace,
+    main,
+    write_trace,
+)
+
+NAN = float("nan")
+
+
+def test_trace_round_trip(tmp_path: Path, scenario_data_path: Path):
+    """a converted scenario loads the same points and verifies the same way"""
+
+    archive_path = tmp_path / scenario_data_path.name
+    archive_path.mkdir()
+    convert_scenario(scenario_data_path, archive_path / TRACE_FILE_NAME)
+
+    text_parser = CoordinateParser(
+        scenario_data_path / "system_input_file.txt",
+        scenario_data_path / "system_output_file.txt",
+    )
+    trace_parser = TraceFileParser(archive_path / TRACE_FILE_NAME)
+    for text_array, trace_array in zip(
+        text_parser.get_parsed_arrays(), trace_parser.get_parsed_arrays()
+    ):
+        np.testing.assert_array_equal(trace_array, text_array)
+    assert trace_parser.get_failures() == tuple(
+        list(log) for log in text_parser.get_failures()
+    )
+
+    options = RunOptions(plot_policy="never")
+    archived = run_scenario(archive_path, options)
+    original = run_scenario(scenario_data_path, options)
+    assert archived.overall_status == original.overall_status
+    assert archived.failures == original.failures
+
+
+def test_trace_keeps_invalid_points_and_capped_failures(tmp_path: Path):
+    """NaN points and more failures than the log limit survive the round trip"""
+
+    failures = [f"Invalid coordinate format at line {i}: 'x'" for i in range(150)]
+    trace_file = write_trace(
+        tmp_path / TRACE_FILE_NAME,
+        [],
+        np.array([(1.0, 2.0), (NAN, NAN)]),
+        np.empty((0, 2)),
+        [["No 'Rectangle:' keyword found."], failures, []],
+    )
+
+    trace = load_trace(trace_file)
+
+    assert trace.rectangle.shape == (0, 2)
+    np.testing.assert_array_equal(trace.expected_points, [(1.0, 2.0), (NAN, NAN)])
+    assert trace.actual_points.shape == (0, 2)
+    assert not trace.expected_points.flags.writeable
+
+    parser = TraceFileParser(trace_file)
+    parser.get_parsed_arrays()
+    assert parser.expected_points_failures == failures
+
+
+@pytest.mark.parametrize(
+    "corrupt, message",
+    [
+        (lambda data: data[:-1], "truncated"),
+        (lambda data: b"NOTATRACE" + data[9:], "Not a Sentinel trace file"),
+        (lambda data: data[:-2] + bytes([data[-2] ^ 1]) + data[-1:], "checksum"),
+        (lambda data: b"", "empty"),
+    ],
+)
+def test_corrupted_trace_is_a_failure(tmp_path: Path, corrupt, message: str):
+    """unreadable trace files are reported as failures, not raised"""
+
+    trace_file = write_trace(
+        tmp_path / TRACE_FILE_NAME,
+        [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)],
+        np.array([(0.5, 0.5)]),
+        np.array([(0.5, 0.5)]),
+    )
+    trace_file.write_bytes(corrupt(trace_file.read_bytes()))
+
+    parser = TraceFileParser(trace_file)
+    rectangle, expected_points, actual_points = parser.get_parsed_arrays()
+
+    assert len(rectangle) == len(expected_points) == len(actual_points) == 0
+    assert len(parser.rectangle_failures) == 1
+    assert message in parser.rectangle_failures[0]
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda data: data[:-1],
+        lambda data: data[:-2] + bytes([data[-2] ^ 1]) + data[-1:],
+    ],
+    ids=["truncated", "checksum"],
+)
+def test_invalid_trace_is_unmapped(tmp_path: Path, monkeypatch, corrupt):
+    """the map of a trace file is closed again when the file is rejected"""
+
+    trace_file = write_trace(
+        tmp_path / TRACE_FILE_NAME, [], np.array([(0.5, 0.5)]), np.empty((0, 2))
+    )
+    trace_file.write_bytes(corrupt(trace_file.read_bytes()))
+
+    buffers = []
+    open_mmap = mmap.mmap
+
+    def recording_mmap(*args, **kwargs):
+        buffers.append(open_mmap(*args, **kwargs))
+        return buffers[-1]
+
+    monkeypatch.setattr(tracefile.mmap, "mmap", recording_mmap)
+    with pytest.raises(ValueError):
+        load_trace(trace_file)
+
+    assert len(buffers) == 1 and buffers[0].closed
+
+
+def test_checksum_can_be_skipped(tmp_path: Path):
+    """without checksum verification a flipped point byte goes unnoticed"""
+
+    trace_file = write_trace(
+        tmp_path / TRACE_FILE_NAME, [], np.array([(0.5, 0.5)]), np.empty((0, 2))
+    )
+    data = bytearray(trace_file.read_bytes())
+    data[data.index(np.array([0.5, 0.5]).tobytes())] ^= 1
+    trace_file.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="checksum"):
+        load_trace(trace_file)
+    assert len(load_trace(trace_file, verify_checksum=False).expected_points) == 1
+
+
+def test_cli_archive_is_verified_by_the_runner(tmp_path: Path):
+    """converted folders hold only the trace file and run like the originals"""
+
+    archive_dir = tmp_path / "archive"
+    scenario_paths = discover_scenarios(DEFAULT_SCENARIOS_DIR, "pass")
+
+    assert main([*map(str, scenario_paths), "--output-dir", str(archive_dir)]) == 0
+    assert sorted(p.name for p in archive_dir.glob("*/*")) == [TRACE_FILE_NAME] * len(
+        scenario_paths
+    )
+    assert run_main(["--scenarios", str(archive_dir), "--no-plot"]) == 0
@@ -0,0 +1,53 @@
+"""Work area containment tests for Sentinel"""
+
+import numpy as np
+import pytest
+
+from src.helpers import WorkArea, as_point_array, order_convex_quadrilateral
+
+ROTATED_RECTANGLE = [(2.0, 1.0), (8.0, 3.0), (7.0, 6.0), (1.0, 4.0)]
+
+
+def test_corner_order_does_not_matter():
+    """corners listed in any order describe the same work area"""
+
+    shuffled = [ROTATED_RECTANGLE[i] for i in (2, 0, 3, 1)]
+
+    ordered = order_convex_quadrilateral(as_point_array(shuffled))
+
+    assert ordered is not None
+    assert sorted(map(tuple, ordered.tolist())) == sorted(ROTATED_RECTANGLE)
+    assert WorkArea(shuffled, []).point_in_bounds((1.5, 2.5))
+
+
+@pytest.mark.parametrize(
+    "corners",
+    [
+        [(0.0, 0.0), (4.0, 0.0), (1.0, 1.0), (0.0, 4.0)],  # concave
+        [(0.0, 0.0), (2.0, 0.0), (4.0, 0.0), (0.0, 4.0)],  # collinear corners
+        [(1.0, 1.0), (1.0, 1.0), (3.0, 1.0), (3.0, 3.0)],  # repeated corner
+    ],
+)
+def test_non_convex_work_area_rejected(corners):
+    """only strictly convex quadrilaterals are valid work areas"""
+
+    assert order_convex_quadrilateral(as_point_array(corners)) is None
+    with pytest.raises(ValueError):
+        WorkArea(corners, [])
+
+
+def test_rotated_containment_mask_matches_single_point_test():
+    """batched containment must agree with point_in_bounds, boundary included"""
+
+    work_area = WorkArea(ROTATED_RECTANGLE, [])
+    rng = np.random.default_rng(7)
+    points = np.vstack(
+        [rng.uniform(0.0, 9.0, size=(500, 2)), as_point_array(ROTATED_RECTANGLE)]
+    )
+
+    mask = work_area.points_in_bounds(points)
+
+    assert not work_area.axis_aligned
+    assert mask.tolist() == [work_area.point_in_bounds(p) for p in points.tolist()]
+    assert mask[-4:].all()
+    assert not work_area.point_in_bounds((1.2, 1.3))  # inside the bounding box only